@@ -6,7 +6,14 @@ from datetime import datetime, timedelta
 
 from app.core.auth import get_current_active_user, get_current_admin_user
 from app.core.database import get_db
+from app.core.http_cache import validator_cache
+from app.core.lifecycle import tasks
+from app.core.redis import redis_health
+from app.db.session import SessionLocal
+from app.api.v1.endpoints.compliance import TEMPLATES_RESOURCE, template_resource
+from app.api.v1.endpoints.translations import translation_service
 from app.models.user import User
+from app.models.models import User as UserModel
 from app.models.subscription import Subscription
 from app.models.translation import Translation
 from app.models.compliance import ComplianceTemplate
@@ -15,9 +22,12 @@ from app.schemas.admin import (
     SubscriptionUpdate,
     ComplianceTemplateCreate,
     ComplianceTemplateUpdate,
+    UserTenantUpdate,
 )
+from app.services.cache_warmup import CacheWarmer
 
 router = APIRouter()
+cache_warmer = CacheWarmer.from_settings(translation_service)
 
 @router.get("/dashboard/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
@@ -136,6 +146,7 @@ async def create_compliance_template(
     db.add(db_template)
     db.commit()
     db.refresh(db_template)
+    await validator_cache.invalidate(TEMPLATES_RESOURCE)
     return db_template
 
 @router.put("/compliance/templates/{template_id}")
@@ -155,6 +166,7 @@ async def update_compliance_template(
 
     db.commit()
     db.refresh(db_template)
+    await validator_cache.invalidate(TEMPLATES_RESOURCE, template_resource(template_id))
     return db_template
 
 @router.patch("/compliance/templates/{template_id}")
@@ -172,4 +184,67 @@ async def toggle_compliance_template(
     db_template.is_active = is_active
     db.commit()
     db.refresh(db_template)
-    return db_template 
\ No newline at end of file
+    await validator_cache.invalidate(TEMPLATES_RESOURCE, template_resource(template_id))
+    return db_template 
+
+async def _warm_cache(limit: int, days: Optional[int]) -> None:
+    db = SessionLocal()
+    try:
+        await cache_warmer.run(db, limit=limit, days=days)
+    finally:
+        db.close()
+
+@router.post("/cache/warmup", status_code=status.HTTP_202_ACCEPTED)
+async def start_cache_warmup(
+    current_user: User = Depends(get_current_admin_user),
+    limit: int = 10000,
+    days: Optional[int] = None
+):
+    """Rebuild translation cache entries from history in the background, without calling upstream."""
+    if cache_warmer.running:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Cache warm-up is already running")
+    if redis_health.degraded:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis is unavailable")
+    tasks.spawn(_warm_cache(limit, days))
+    return {**cache_warmer.snapshot(), "running": True}
+
+@router.get("/cache/warmup")
+async def get_cache_warmup(current_user: User = Depends(get_current_admin_user)):
+    """Progress of the current or last cache warm-up."""
+    return cache_warmer.snapshot()
+
+@router.get("/cache/analytics")
+async def get_cache_analytics(current_user: User = Depends(get_current_admin_user), top: int = 100):
+    """
+    Cache analytics. `cluster` has the service-wide hit ratios by tenant and language pair;
+    everything else (hot keys, value sizes, entry lifetimes, policy) is for the worker answering.
+    """
+    analytics = translation_service.analytics
+    return {
+        **analytics.snapshot(top=top),
+        "policy": translation_service.cache_policy.snapshot(),
+        "cluster": await analytics.cluster_snapshot(await translation_service._get_redis()),
+    }
+
+@router.put("/users/{user_id}/tenant")
+async def assign_user_tenant(
+    user_id: int,
+    update_data: UserTenantUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Assign the tenant whose shared translation memory and cache settings the user gets."""
+    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    user.tenant = update_data.tenant
+    db.commit()
+    return {"id": user.id, "email": user.email, "tenant": user.tenant}
+
+@router.get("/tenants/{tenant}/memory")
+async def get_tenant_memory(tenant: str, current_user: User = Depends(get_current_admin_user)):
+    """Entries, quota and hit rate of one tenant's shared translation memory."""
+    stats = await translation_service.tenant_memory.tenant_stats(tenant)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis is unavailable")
+    return stats
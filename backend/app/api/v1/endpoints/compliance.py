@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from app.api import deps
+from app.core.http_cache import PreparedResponse, validator_cache
 from app.core.security import SecurityScopes
 from app.schemas.schemas import (
     ComplianceTemplate,
@@ -83,28 +85,57 @@ KVKK_TEMPLATE = {
     ]
 }
 
+# Presets never change at runtime: serialize them and compute their ETags once
+GDPR_PRESET = PreparedResponse(GDPR_TEMPLATE)
+KVKK_PRESET = PreparedResponse(KVKK_TEMPLATE)
+
+TEMPLATES_CACHE_CONTROL = "private, no-cache"
+TEMPLATES_RESOURCE = "compliance_templates"
+template_list_adapter = TypeAdapter(List[ComplianceTemplate])
+
+def template_resource(template_id: Any) -> str:
+    return f"compliance_template:{template_id}"
+
 @router.get("/templates", response_model=List[ComplianceTemplate])
 async def list_compliance_templates(
+    request: Request,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
-) -> List[ComplianceTemplate]:
+) -> Response:
     """
     List all available compliance templates
     """
+    not_modified = await validator_cache.check(request, TEMPLATES_RESOURCE, TEMPLATES_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     templates = db.query(ComplianceTemplateModel).filter(
         ComplianceTemplateModel.is_active == True
     ).all()
-    return templates
+    last_modified = max((t.updated_at for t in templates if t.updated_at), default=None)
+    return await validator_cache.respond(
+        request,
+        TEMPLATES_RESOURCE,
+        template_list_adapter.dump_json(templates),
+        last_modified,
+        TEMPLATES_CACHE_CONTROL
+    )
 
 @router.get("/templates/{template_id}", response_model=ComplianceTemplate)
 async def get_compliance_template(
     template_id: int,
+    request: Request,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user)
-) -> ComplianceTemplate:
+) -> Response:
     """
     Get a specific compliance template
     """
+    resource = template_resource(template_id)
+    not_modified = await validator_cache.check(request, resource, TEMPLATES_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     template = db.query(ComplianceTemplateModel).filter(
         ComplianceTemplateModel.id == template_id,
         ComplianceTemplateModel.is_active == True
@@ -113,7 +144,10 @@ async def get_compliance_template(
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
     
-    return template
+    body = ComplianceTemplate.model_validate(template).model_dump_json().encode()
+    return await validator_cache.respond(
+        request, resource, body, template.updated_at, TEMPLATES_CACHE_CONTROL
+    )
 
 @router.post("/templates", response_model=ComplianceTemplate)
 async def create_compliance_template(
@@ -135,6 +169,7 @@ async def create_compliance_template(
     db.add(db_template)
     db.commit()
     db.refresh(db_template)
+    await validator_cache.invalidate(TEMPLATES_RESOURCE)
     return db_template
 
 @router.post("/check", response_model=ComplianceCheckResult)
@@ -168,15 +203,15 @@ async def check_compliance(
     )
 
 @router.get("/presets/gdpr", response_model=Dict[str, Any])
-async def get_gdpr_preset() -> Dict[str, Any]:
+async def get_gdpr_preset(request: Request) -> Response:
     """
     Get GDPR preset compliance template
     """
-    return GDPR_TEMPLATE
+    return GDPR_PRESET.respond(request)
 
 @router.get("/presets/kvkk", response_model=Dict[str, Any])
-async def get_kvkk_preset() -> Dict[str, Any]:
+async def get_kvkk_preset(request: Request) -> Response:
     """
     Get KVKK preset compliance template
     """
-    return KVKK_TEMPLATE 
\ No newline at end of file
+    return KVKK_PRESET.respond(request) 
\ No newline at end of file
@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import Dict, Any
-import stripe
-from app.paddle.paddle import PaddleClient
 from app.api import deps
 from app.core.config import settings
+from app.core.providers import providers
 from app.schemas.schemas import (
     Subscription,
     SubscriptionCreate,
@@ -18,13 +17,8 @@ class PaddleError(Exception):
     """Base exception for Paddle API errors"""
     pass
 
-# Configure payment providers
-stripe.api_key = settings.STRIPE_API_KEY
-paddle_client = PaddleClient(
-    api_key=settings.PADDLE_API_KEY,
-    vendor_id=settings.PADDLE_VENDOR_ID,
-    sandbox=True  # Enable sandbox mode for testing
-)
+# Payment provider clients (Stripe, Paddle) are created on first use by the
+# provider registry, so importing this module does not load their SDKs.
 
 # Subscription tier configurations
 TIER_CONFIGS = {
@@ -68,6 +62,7 @@ async def create_checkout_session(
         )
 
     tier_config = TIER_CONFIGS[tier]
+    stripe = providers.get("stripe")
     
     try:
         if payment_provider == "stripe":
@@ -89,7 +84,7 @@ async def create_checkout_session(
             return {"checkout_url": session.url, "session_id": session.id}
             
         elif payment_provider == "paddle":
-            transaction = paddle_client.create_transaction(
+            transaction = providers.get("paddle").create_transaction(
                 customer_id=current_user.subscription.paddle_customer_id,
                 items=[{
                     "price_id": tier_config["paddle_plan_id"],
@@ -110,7 +105,7 @@ async def create_checkout_session(
                 detail="Invalid payment provider"
             )
             
-    except (stripe.error.StripeError, paddle.PaddleError) as e:
+    except (stripe.error.StripeError, PaddleError) as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 # Webhook handlers are commented out for MVP focus. TODO: Implement for production.
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.api import deps
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError, ServiceOverloadedError, UpstreamCapacityError
+from app.core.http_cache import validator_cache
+from app.core.lifecycle import tasks
+from app.core.metrics import metrics
 from app.core.security import RateLimiter
 from app.schemas.schemas import (
     TranslationCreate,
@@ -15,6 +21,33 @@ from fastapi import status
 
 router = APIRouter()
 translation_service = TranslationService()
+metrics.register("translation_backends", lambda: translation_service.router.snapshot())
+metrics.register("upstream_retries", lambda: translation_service.router.retry.snapshot())
+metrics.register("circuit_breakers", lambda: {
+    name: breaker.snapshot() for name, breaker in translation_service.router.breakers.items()
+})
+metrics.register(
+    "upstream_hedging",
+    lambda: translation_service.router.hedger.snapshot() if translation_service.router.hedger else {}
+)
+metrics.register("translation_profiles", lambda: translation_service.profile_stats.snapshot())
+metrics.register("translation_cache", translation_service.cache_policy.snapshot)
+metrics.register("cache_analytics", translation_service.analytics.snapshot)
+metrics.register("cache_namespaces", translation_service.namespaces.snapshot)
+metrics.register("translation_memory", translation_service.memory.snapshot)
+metrics.register("tenant_memory", translation_service.tenant_memory.snapshot)
+if translation_service.batcher is not None:
+    metrics.register("translation_batching", translation_service.batcher.stats.snapshot)
+
+admission.register_signal(
+    "in_flight_translations", lambda: translation_service.in_flight, settings.ADMISSION_MAX_IN_FLIGHT
+)
+admission.register_signal(
+    "upstream_queue", lambda: translation_service.upstream_pending, settings.ADMISSION_MAX_UPSTREAM_QUEUE
+)
+
+# Translations are per-user: clients may keep a copy but must revalidate it
+PRIVATE_CACHE_CONTROL = "private, no-cache"
 
 @router.post("/", response_model=TranslationResponse)
 async def create_translation(
@@ -35,6 +68,25 @@ async def create_translation(
             detail="No active subscription found. Please subscribe to use the translation service."
         )
 
+    # Shed new upstream work under load; a cached answer can still be served
+    tier = current_user.subscription.tier
+    decision = admission.check(
+        high_priority=tier.value in settings.ADMISSION_HIGH_PRIORITY_TIERS,
+        priority_name=tier.value
+    )
+    cached_result = None
+    if not decision.admitted:
+        cached_result = await translation_service.get_cached(
+            text=translation_in.source_text,
+            source_lang=translation_in.source_lang,
+            target_lang=translation_in.target_lang,
+            context=translation_in.context,
+            tenant=current_user.tenant
+        )
+        if cached_result is None:
+            raise ServiceOverloadedError(retry_after=decision.retry_after)
+        admission.served_from_cache += 1
+
     # Check rate limit
     monthly_limit = current_user.subscription.monthly_requests_limit or 100  # Default to 100 if not set
     if not await rate_limiter.check_rate_limit(current_user.id, monthly_limit):
@@ -43,17 +95,26 @@ async def create_translation(
             detail="Rate limit exceeded. Please upgrade your subscription."
         )
 
-    # Perform translation
+    # Perform translation (tracked so shutdown waits for it)
     try:
-        translation_result = await translation_service.translate(
-            text=translation_in.source_text,
-            source_lang=translation_in.source_lang,
-            target_lang=translation_in.target_lang,
-            context=translation_in.context
-        )
+        async with tasks.track():
+            translation_result = cached_result or await translation_service.translate(
+                text=translation_in.source_text,
+                source_lang=translation_in.source_lang,
+                target_lang=translation_in.target_lang,
+                context=translation_in.context,
+                tenant=current_user.tenant
+            )
+    except (UpstreamCapacityError, DeadlineExceededError):
+        # 503 with Retry-After or 504, so clients can tell overload from failure
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # Derived (reverse-pair) and tenant-memory answers belong to one tenant, so they stay out of
+    # the translation memory, which answers every tenant
+    tenant_scoped = translation_result.get("derived") or translation_result.get("tenant_memory")
+
     # Create translation record
     db_translation = TranslationModel(
         user_id=current_user.id,
@@ -62,7 +123,23 @@ async def create_translation(
         source_lang=translation_in.source_lang,
         target_lang=translation_in.target_lang,
         context=translation_in.context,
-        metadata={"gpt_model": "gpt-4-turbo-preview"}
+        content_hash=None if tenant_scoped else translation_service.content_hash(
+            translation_in.source_text,
+            translation_in.source_lang,
+            translation_in.target_lang,
+            translation_in.context
+        ),
+        meta_data={
+            "gpt_model": translation_result.get("model", settings.OPENAI_MODEL),
+            "backend": translation_result.get("backend"),
+            "profile": translation_result.get("profile"),
+            "latency_ms": translation_result.get("latency_ms"),
+            "cache_namespace": translation_result.get("namespace"),
+            "cached": translation_result.get("cached", False),
+            "stale": translation_result.get("stale", False),
+            "derived": translation_result.get("derived", False),
+            "tenant_memory": translation_result.get("tenant_memory", False)
+        }
     )
     db.add(db_translation)
     
@@ -70,7 +147,7 @@ async def create_translation(
     compliance_result = None
     if translation_in.context and "compliance_rules" in translation_in.context:
         background_tasks.add_task(
-            translation_service.validate_cultural_compliance,
+            tasks.wrap(translation_service.validate_cultural_compliance),
             text=translation_result["translated_text"],
             lang=translation_in.target_lang,
             compliance_rules=translation_in.context["compliance_rules"]
@@ -87,15 +164,38 @@ async def create_translation(
         compliance_check=compliance_result
     )
 
+@router.get("/memory/stats")
+async def get_tenant_memory_stats(
+    current_user: UserModel = Depends(deps.get_current_user)
+) -> dict:
+    """
+    Usage of the translation memory shared within the current user's tenant.
+    """
+    if not current_user.tenant:
+        raise HTTPException(status_code=404, detail="No tenant translation memory")
+    stats = await translation_service.tenant_memory.tenant_stats(current_user.tenant)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis is unavailable")
+    return stats
+
 @router.get("/{translation_id}", response_model=TranslationResponse)
 async def get_translation(
     translation_id: int,
+    request: Request,
     db: Session = Depends(deps.get_db),
     current_user: UserModel = Depends(deps.get_current_user)
-) -> TranslationResponse:
+) -> Response:
     """
     Get a specific translation by ID.
+
+    Supports conditional GET: a matching If-None-Match returns 304 from the
+    cached validators without loading the translation.
     """
+    resource = f"translation:{current_user.id}:{translation_id}"
+    not_modified = await validator_cache.check(request, resource, PRIVATE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     translation = db.query(TranslationModel).filter(
         TranslationModel.id == translation_id,
         TranslationModel.user_id == current_user.id
@@ -104,7 +204,10 @@ async def get_translation(
     if not translation:
         raise HTTPException(status_code=404, detail="Translation not found")
     
-    return TranslationResponse(translation=translation)
+    body = TranslationResponse(translation=translation).model_dump_json().encode()
+    return await validator_cache.respond(
+        request, resource, body, translation.updated_at, PRIVATE_CACHE_CONTROL
+    )
 
 @router.get("/", response_model=List[TranslationResponse])
 async def list_translations(
@@ -141,5 +244,6 @@ async def delete_translation(
     
     db.delete(translation)
     db.commit()
+    await validator_cache.invalidate(f"translation:{current_user.id}:{translation_id}")
     
     return {"status": "success", "message": "Translation deleted"} 
\ No newline at end of file
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import metrics
+
+class LoopLagMonitor:
+    """
+    Measure event-loop lag: how late a periodic timer fires.
+
+    A saturated loop runs callbacks late, so lag is an early sign that
+    accepted requests are queueing behind each other.
+    """
+
+    def __init__(self, interval: float = 0.1, alpha: float = 0.3):
+        self.interval = interval
+        self.alpha = alpha
+        self.lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, (time.perf_counter() - expected) * 1000)
+            self.lag_ms += self.alpha * (lag - self.lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag)
+
+@dataclass
+class Decision:
+    admitted: bool
+    reason: Optional[str] = None
+    pressure: float = 0.0
+    retry_after: float = 0.0
+
+class AdmissionController:
+    """
+    Decide whether to start new expensive work, from live load signals.
+
+    Each signal has a limit; pressure is the highest value/limit ratio. Low
+    priority work is rejected once pressure reaches 1.0, high priority work
+    only once it reaches `high_priority_headroom`, so paying tenants keep
+    being served while free traffic is shed first. Rejections are counted
+    by the signal that caused them.
+    """
+
+    def __init__(self, high_priority_headroom: float = 1.5, retry_after: float = 2.0, enabled: bool = True):
+        self.high_priority_headroom = high_priority_headroom
+        self.retry_after = retry_after
+        self.enabled = enabled
+        self._signals: List[Tuple[str, Callable[[], float], float]] = []
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}
+        self.rejected_by_priority: Dict[str, int] = {}
+        # Rejected requests that were still answered from cache
+        self.served_from_cache = 0
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionController":
+        return cls(
+            high_priority_headroom=settings.ADMISSION_HIGH_PRIORITY_HEADROOM,
+            retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+            enabled=settings.ADMISSION_ENABLED
+        )
+
+    def register_signal(self, name: str, value: Callable[[], float], limit: float) -> None:
+        """Add a load signal; a limit of 0 or less disables it."""
+        self._signals = [signal for signal in self._signals if signal[0] != name]
+        if limit > 0:
+            self._signals.append((name, value, limit))
+
+    def pressure(self) -> Tuple[float, Optional[str]]:
+        worst, reason = 0.0, None
+        for name, value, limit in self._signals:
+            ratio = value() / limit
+            if ratio > worst:
+                worst, reason = ratio, name
+        return worst, reason
+
+    def check(self, high_priority: bool = False, priority_name: str = "default") -> Decision:
+        if not self.enabled:
+            return Decision(admitted=True)
+        pressure, reason = self.pressure()
+        threshold = self.high_priority_headroom if high_priority else 1.0
+        if pressure < threshold:
+            self.admitted += 1
+            return Decision(admitted=True, pressure=pressure)
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        self.rejected_by_priority[priority_name] = self.rejected_by_priority.get(priority_name, 0) + 1
+        return Decision(admitted=False, reason=reason, pressure=pressure, retry_after=self.retry_after)
+
+    def snapshot(self) -> Dict[str, Any]:
+        pressure, reason = self.pressure()
+        return {
+            "enabled": self.enabled,
+            "pressure": round(pressure, 3),
+            "dominant_signal": reason,
+            "signals": {name: round(value(), 2) for name, value, _ in self._signals},
+            "admitted": self.admitted,
+            "rejected_by_reason": dict(self.rejected),
+            "rejected_by_priority": dict(self.rejected_by_priority),
+            "served_from_cache": self.served_from_cache,
+        }
+
+loop_lag = LoopLagMonitor()
+admission = AdmissionController.from_settings()
+admission.register_signal("event_loop_lag", lambda: loop_lag.lag_ms, settings.ADMISSION_MAX_LOOP_LAG_MS)
+metrics.register("admission", admission.snapshot)
@@ -1,4 +1,4 @@
-from typing import List, Union, Optional
+from typing import Dict, List, Union, Optional
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl, validator
 import json
@@ -35,6 +35,17 @@ class Settings(BaseSettings):
                 return [i.strip() for i in v.split(",")]
         return v
 
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_SUCCESS_SAMPLE_RATE: float = 0.1  # fraction of 2xx/3xx requests logged
+
+    # Worker lifecycle
+    WARMUP_DB_CONNECTIONS: int = 5
+    WARMUP_REDIS_CONNECTIONS: int = 5
+    WARMUP_UPSTREAM_CONNECTIONS: int = 2
+    WARMUP_TIMEOUT_SECONDS: float = 10.0
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = 20.0
+
     # Database
     POSTGRES_SERVER: str
     POSTGRES_USER: str
@@ -52,9 +63,148 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: Union[str, None] = None
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 1.0
+    # Degraded mode (Redis unreachable): per-worker cache size and rate-limit share
+    LOCAL_CACHE_MAX_ENTRIES: int = 10000
+    RATE_LIMIT_DEGRADED_DIVISOR: int = 4  # each worker allows limit / divisor
+    # Spread the translation cache over these nodes (comma-separated redis:// URLs) by
+    # consistent hashing; empty keeps it on the main Redis. Rate limits stay on the main Redis.
+    REDIS_CACHE_NODES: Union[str, List[str]] = []
+    REDIS_CACHE_VNODES: int = 160
+    REDIS_CACHE_NODE_RETRY_SECONDS: float = 5.0  # an unreachable node is skipped this long
+    # Cached translation values: "binary" (compact, versioned) or "json" (legacy)
+    CACHE_VALUE_FORMAT: str = "binary"
+    CACHE_COMPRESSION: str = "auto"  # auto (zstd if installed, else zlib), zstd, zlib or none
+    CACHE_COMPRESSION_MIN_BYTES: int = 256
+    # Translation cache expiry: keys seen once live MIN_TTL, repeated keys TTL doubling per
+    # further request up to MAX_TTL; entries are served stale for stale_ratio * fresh TTL
+    # while one refresh runs
+    CACHE_MIN_TTL_SECONDS: int = 21600
+    CACHE_TTL_SECONDS: int = 86400
+    CACHE_MAX_TTL_SECONDS: int = 604800
+    CACHE_STALE_RATIO: float = 1.0
+    CACHE_REFRESH_LOCK_SECONDS: int = 30
+    # Cache keys are namespaced by each profile's model and prompts; on a miss the previous
+    # PREVIOUS_NAMESPACES namespaces are read, and their hits re-translated in the background at
+    # up to REVALIDATE_PER_SECOND per worker. Change SALT to start a new namespace by hand.
+    CACHE_NAMESPACE_SALT: str = ""
+    CACHE_PREVIOUS_NAMESPACES: int = 1
+    CACHE_REVALIDATE_PER_SECOND: float = 2.0
+    # Admission: entries above ALWAYS_BYTES are cached from their MIN_HITS-th request
+    CACHE_ADMIT_MIN_HITS: int = 2
+    CACHE_ADMIT_ALWAYS_BYTES: int = 512
+    CACHE_MAX_ENTRY_BYTES: int = 65536
+    # Seed the reverse pair (tr->en from en->tr) as derived entries: for everyone, or only for
+    # the listed tenants (User.tenant); only those tenants are served derived entries
+    REVERSE_CACHE_ENABLED: bool = False
+    REVERSE_CACHE_TENANTS: Union[str, List[str]] = []
+    # Reuse earlier translations from Postgres when Redis has none (by translations.content_hash)
+    TRANSLATION_MEMORY_ENABLED: bool = True
+    # Translation memory shared by all users of a tenant (User.tenant, set by admins): matches on
+    # text, language pair and only the listed context keys; each tenant keeps at most
+    # MAX_ENTRIES (or its TENANT_MEMORY_QUOTAS entry, JSON; 0 disables) with LRU eviction
+    TENANT_MEMORY_ENABLED: bool = True
+    TENANT_MEMORY_MAX_ENTRIES: int = 10000
+    TENANT_MEMORY_QUOTAS: Dict[str, int] = {}
+    TENANT_MEMORY_TTL_SECONDS: int = 7776000
+    TENANT_MEMORY_CONTEXT_KEYS: Union[str, List[str]] = [
+        "compliance_rules", "complianceFramework", "domain", "tone", "formality", "audience", "glossary"
+    ]
+    # Cache analytics: hot keys tracked, share of written keys followed to measure lifetime,
+    # and tenants broken out in hit ratios before the rest count as "other"; hit/miss counts
+    # are added to service-wide totals in Redis every FLUSH_SECONDS
+    CACHE_ANALYTICS_TOP_K: int = 100
+    CACHE_ANALYTICS_LIFETIME_SAMPLE: float = 0.01
+    CACHE_ANALYTICS_MAX_TENANTS: int = 500
+    CACHE_ANALYTICS_FLUSH_SECONDS: float = 10.0
+    # Cache warm-up from translation history (admin endpoint and warm_cache.py)
+    CACHE_WARMUP_BATCH_SIZE: int = 500
+    CACHE_WARMUP_MAX_PER_SECOND: float = 2000.0
+    # Context keys that never change a translation and are left out of cache keys
+    CACHE_KEY_IGNORED_CONTEXT_KEYS: Union[str, List[str]] = [
+        "request_id", "trace_id", "session_id", "timestamp", "client", "user_agent"
+    ]
 
     # OpenAI
     OPENAI_API_KEY: str
+    OPENAI_BASE_URL: Optional[str] = None  # e.g. a local stand-in for benchmarks
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+
+    # Translation backends, in preference order: openai, openai_compatible, fake
+    TRANSLATION_BACKENDS: Union[str, List[str]] = ["openai"]
+    OPENAI_COMPATIBLE_BASE_URL: Optional[str] = None
+    OPENAI_COMPATIBLE_API_KEY: str = "not-needed"
+    OPENAI_COMPATIBLE_MODEL: Optional[str] = None
+    ROUTER_EWMA_ALPHA: float = 0.2
+    ROUTER_ERROR_COST_MS: float = 5000.0
+    ROUTER_ERROR_HALF_LIFE_SECONDS: float = 30.0
+
+    # Complexity-based profiles: which model and budget each request class gets
+    SHORT_TEXT_MAX_CHARS: int = 60
+    LONG_TEXT_MIN_CHARS: int = 1000
+    TRANSLATION_MODEL_SHORT: Optional[str] = None  # defaults to OPENAI_MODEL
+    TRANSLATION_MODEL_STANDARD: Optional[str] = None
+    TRANSLATION_MODEL_LONG: Optional[str] = None
+    TRANSLATION_MAX_TOKENS_SHORT: int = 120
+    TRANSLATION_MAX_TOKENS_STANDARD: int = 800
+    TRANSLATION_MAX_TOKENS_LONG: int = 1500
+
+    # Micro-batching of concurrent short translations into one upstream call
+    BATCH_ENABLED: bool = True
+    BATCH_WINDOW_MS: float = 5.0
+    BATCH_MAX_SIZE: int = 16
+
+    # Request deadlines; clients may shorten them with X-Request-Timeout
+    REQUEST_TIMEOUT_SECONDS: float = 10.0
+    HEALTH_TIMEOUT_SECONDS: float = 2.0
+    TRANSLATION_DEADLINE_SECONDS: float = 30.0
+
+    # Admission control: shed new translations when any signal passes its limit (0 disables)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_IN_FLIGHT: int = 200
+    ADMISSION_MAX_UPSTREAM_QUEUE: int = 100
+    ADMISSION_MAX_LOOP_LAG_MS: float = 200.0
+    # Tiers in this list are only shed at ADMISSION_HIGH_PRIORITY_HEADROOM times the limits
+    ADMISSION_HIGH_PRIORITY_TIERS: Union[str, List[str]] = ["professional", "enterprise"]
+    ADMISSION_HIGH_PRIORITY_HEADROOM: float = 1.5
+    ADMISSION_RETRY_AFTER_SECONDS: float = 2.0
+
+    # Upstream retries: full-jitter backoff, bounded by a per-process budget
+    RETRY_MAX_ATTEMPTS: int = 3
+    RETRY_BASE_DELAY_SECONDS: float = 0.25
+    RETRY_MAX_DELAY_SECONDS: float = 4.0
+    RETRY_BUDGET_RATIO: float = 0.1  # retries allowed per first attempt
+    RETRY_BUDGET_MIN_PER_SECOND: float = 1.0
+    RETRY_BUDGET_MAX_TOKENS: float = 10.0
+
+    # Client-side RPM/TPM governor, shared across workers through Redis.
+    # Set to the account's limits for the model in use; 0 disables.
+    OPENAI_RPM_LIMIT: int = 3500
+    OPENAI_TPM_LIMIT: int = 90000
+    GOVERNOR_HEADROOM: float = 0.9  # fraction of the provider limit we aim to use
+    GOVERNOR_MAX_WAIT_SECONDS: float = 5.0
+
+    # Per-backend circuit breaker over a sliding window of recent calls
+    BREAKER_WINDOW_SIZE: int = 20
+    BREAKER_MIN_CALLS: int = 10
+    BREAKER_FAILURE_RATE: float = 0.5
+    BREAKER_SLOW_CALL_MS: float = 10000.0
+    BREAKER_SLOW_CALL_RATE: float = 0.8
+    BREAKER_OPEN_SECONDS: float = 30.0
+    BREAKER_HALF_OPEN_CALLS: int = 3
+
+    # Hedged requests for short translations, sent after the recent p95 latency
+    HEDGE_ENABLED: bool = True
+    HEDGE_MIN_DELAY_MS: float = 100.0
+    HEDGE_MIN_SAMPLES: int = 20
+    HEDGE_MAX_RATIO: float = 0.1  # hedges allowed per hedgeable call
+
+    @validator("TRANSLATION_BACKENDS", "ADMISSION_HIGH_PRIORITY_TIERS", "CACHE_KEY_IGNORED_CONTEXT_KEYS",
+               "REVERSE_CACHE_TENANTS", "TENANT_MEMORY_CONTEXT_KEYS", "REDIS_CACHE_NODES", pre=True)
+    def assemble_name_lists(cls, v: Union[str, List[str]]) -> List[str]:
+        if isinstance(v, str):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        return v
 
     # AWS
     AWS_ACCESS_KEY_ID: str
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, Optional, TypeVar
+from app.core.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+# `time.monotonic()` timestamp by which the current request must be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+def get_deadline() -> Optional[float]:
+    return _deadline.get()
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, or None when there is no deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+def check() -> None:
+    """Raise DeadlineExceededError if the current request is out of time."""
+    if expired():
+        raise DeadlineExceededError()
+
+def earliest(seconds: float) -> float:
+    """The request deadline or `seconds` from now, whichever comes first."""
+    local = time.monotonic() + seconds
+    deadline = _deadline.get()
+    return local if deadline is None else min(deadline, local)
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Run the block with a deadline `seconds` from now; None clears it."""
+    token = _deadline.set(time.monotonic() + seconds if seconds is not None else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+async def bounded(awaitable: Awaitable[T]) -> T:
+    """
+    Await with the request's remaining time as the timeout.
+
+    Raises DeadlineExceededError instead of starting work that cannot finish
+    in time, or when the operation runs past the deadline.
+    """
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceededError()
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceededError()
+
+def statement_timeout_ms() -> Optional[int]:
+    """Remaining budget as a Postgres statement_timeout, at least 1 ms."""
+    left = remaining()
+    if left is None:
+        return None
+    if left <= 0:
+        raise DeadlineExceededError()
+    return max(1, int(left * 1000))
@@ -1,3 +1,4 @@
+import math
 from fastapi import HTTPException
 from typing import Any, Optional
 
@@ -30,6 +31,27 @@ class RateLimitError(CustomException):
     def __init__(self, detail: str = "Rate limit exceeded"):
         super().__init__(status_code=429, detail=detail)
 
+class UpstreamCapacityError(CustomException):
+    def __init__(self, detail: str = "Translation capacity exhausted, retry later", retry_after: float = 1.0):
+        super().__init__(
+            status_code=503,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+        self.retry_after = retry_after
+
+class ServiceOverloadedError(CustomException):
+    def __init__(self, detail: str = "Service overloaded, retry later", retry_after: float = 1.0):
+        super().__init__(
+            status_code=503,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+class DeadlineExceededError(CustomException):
+    def __init__(self, detail: str = "Request deadline exceeded"):
+        super().__init__(status_code=504, detail=detail)
+
 class PaymentError(CustomException):
     def __init__(self, detail: str = "Payment processing error"):
         super().__init__(status_code=402, detail=detail)
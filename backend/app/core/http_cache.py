@@ -0,0 +1,189 @@
+"""
+Conditional GET support: ETag/Last-Modified validators and 304 responses.
+
+Validators for DB-backed resources are cached in Redis under a version stamp
+key, so a matching `If-None-Match` can be answered without loading or
+serializing the resource. Writers call `invalidate` to bump the stamp.
+"""
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Optional, Set
+from fastapi import Request, Response
+from app.core.deadline import bounded
+from app.core.redis import REDIS_OUTAGE_ERRORS, get_redis_or_none, redis_health
+
+logger = logging.getLogger(__name__)
+
+VALIDATOR_KEY_PREFIX = "http_cache"
+VALIDATOR_TTL = 86400  # 24 hours
+
+@dataclass
+class Validators:
+    etag: str
+    last_modified: Optional[str] = None
+
+    def headers(self, cache_control: str) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": cache_control}
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        return headers
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Evaluate `If-None-Match` (weak comparison, as RFC 9110 requires for GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+def not_modified(validators: Validators, cache_control: str) -> Response:
+    return Response(status_code=304, headers=validators.headers(cache_control))
+
+def json_response(body: bytes, validators: Validators, cache_control: str) -> Response:
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers=validators.headers(cache_control),
+    )
+
+class PreparedResponse:
+    """A JSON body serialized once, with its validators computed up front."""
+
+    def __init__(self, content: Any, cache_control: str = "public, no-cache"):
+        self.body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+        self.validators = Validators(etag=make_etag(self.body), last_modified=http_date(datetime.now(timezone.utc)))
+        self.cache_control = cache_control
+
+    def respond(self, request: Request) -> Response:
+        if etag_matches(request, self.validators.etag):
+            return not_modified(self.validators, self.cache_control)
+        return json_response(self.body, self.validators, self.cache_control)
+
+class ValidatorCache:
+    """
+    Redis-backed store of validators keyed by resource.
+
+    Lookups are best effort: if Redis is unavailable the caller simply falls
+    back to loading the resource, it never fails the request. Invalidations
+    that cannot reach Redis are kept and replayed once it is back.
+    """
+
+    def __init__(self, prefix: str = VALIDATOR_KEY_PREFIX, ttl: int = VALIDATOR_TTL):
+        self.prefix = prefix
+        self.ttl = ttl
+        # Invalidations that could not reach Redis; replayed when it recovers
+        self._missed_invalidations: Set[str] = set()
+        redis_health.on_recover(self._replay_invalidations)
+
+    def _key(self, resource: str) -> str:
+        return f"{self.prefix}:{resource}"
+
+    def _failed(self, message: str, error: Exception, **extra: Any) -> None:
+        if isinstance(error, REDIS_OUTAGE_ERRORS):
+            redis_health.mark_down(error)
+        logger.warning(message, extra={**extra, "error": str(error)})
+
+    async def _client(self) -> Optional[Any]:
+        redis = await get_redis_or_none()
+        if redis is not None and self._missed_invalidations:
+            try:
+                await bounded(self._replay_invalidations(redis))
+            except Exception as e:
+                self._failed("Validator cache invalidation replay failed", e)
+        return redis
+
+    async def get(self, resource: str) -> Optional[Validators]:
+        redis = await self._client()
+        if redis is None or resource in self._missed_invalidations:
+            return None
+        try:
+            cached = await bounded(redis.get(self._key(resource)))
+        except Exception as e:
+            self._failed("Validator cache read failed", e, resource=resource)
+            return None
+        if not cached:
+            return None
+        data = json.loads(cached)
+        return Validators(etag=data["etag"], last_modified=data.get("last_modified"))
+
+    async def set(self, resource: str, validators: Validators) -> None:
+        redis = await self._client()
+        if redis is None or resource in self._missed_invalidations:
+            return
+        try:
+            await bounded(redis.setex(
+                self._key(resource),
+                self.ttl,
+                json.dumps({"etag": validators.etag, "last_modified": validators.last_modified}),
+            ))
+        except Exception as e:
+            self._failed("Validator cache write failed", e, resource=resource)
+
+    async def invalidate(self, *resources: str) -> None:
+        if not resources:
+            return
+        redis = await self._client()
+        if redis is not None:
+            try:
+                await bounded(redis.delete(*(self._key(resource) for resource in resources)))
+                return
+            except Exception as e:
+                self._failed("Validator cache invalidation failed", e, resources=resources)
+        # A stale stamp would answer 304 for changed data, so delete it once Redis is back
+        self._missed_invalidations.update(resources)
+
+    async def _replay_invalidations(self, redis: Any) -> None:
+        if not self._missed_invalidations:
+            return
+        resources = list(self._missed_invalidations)
+        await redis.delete(*(self._key(resource) for resource in resources))
+        self._missed_invalidations.difference_update(resources)
+
+    async def check(self, request: Request, resource: str, cache_control: str) -> Optional[Response]:
+        """Return a 304 if the client's `If-None-Match` matches the cached stamp."""
+        if not request.headers.get("if-none-match"):
+            return None
+        validators = await self.get(resource)
+        if validators and etag_matches(request, validators.etag):
+            return not_modified(validators, cache_control)
+        return None
+
+    async def respond(
+        self,
+        request: Request,
+        resource: str,
+        body: bytes,
+        last_modified: Optional[datetime],
+        cache_control: str,
+    ) -> Response:
+        """Build validators for a freshly serialized body, stamp them and respond."""
+        validators = Validators(etag=make_etag(body), last_modified=http_date(last_modified))
+        await self.set(resource, validators)
+        if etag_matches(request, validators.etag):
+            return not_modified(validators, cache_control)
+        return json_response(body, validators, cache_control)
+
+validator_cache = ValidatorCache()
@@ -0,0 +1,162 @@
+import asyncio
+import functools
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine, Set
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.deadline import deadline_scope
+from app.core.providers import providers
+from app.core.redis import close_redis_client, get_redis_client
+from app.core.redis_shards import close_sharded_cache, get_sharded_cache
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+class WorkerState:
+    """Readiness flags for this worker process."""
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+
+class TaskTracker:
+    """
+    Count in-flight work so shutdown can wait for it.
+
+    Request handlers wrap upstream work in `track()`, background tasks are
+    registered through `wrap()`, and fire-and-forget coroutines go through
+    `spawn()`.
+    """
+
+    def __init__(self):
+        self._active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        self._active += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._active -= 1
+            if self._active == 0:
+                self._idle.set()
+
+    def wrap(self, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """Wrap a coroutine function so each call counts as in-flight work."""
+        @functools.wraps(func)
+        async def tracked(*args: Any, **kwargs: Any) -> Any:
+            # Background work outlives the request, so it must not inherit its deadline
+            with deadline_scope(None):
+                async with self.track():
+                    return await func(*args, **kwargs)
+        return tracked
+
+    def spawn(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until it finishes."""
+        async def run() -> Any:
+            with deadline_scope(None):
+                async with self.track():
+                    return await coro
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def drain(self, timeout: float) -> int:
+        """Wait up to `timeout` seconds for in-flight work; cancel what is left."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        remaining = self._active
+        for task in list(self._tasks):
+            task.cancel()
+        return remaining
+
+worker_state = WorkerState()
+tasks = TaskTracker()
+
+async def _warm_database(connections: int) -> None:
+    def checkout() -> None:
+        # Hold all connections at once so the pool really opens `connections` of them
+        opened = []
+        try:
+            for _ in range(connections):
+                conn = engine.connect()
+                conn.execute(text("SELECT 1"))
+                opened.append(conn)
+        finally:
+            for conn in opened:
+                conn.close()
+
+    await asyncio.to_thread(checkout)
+
+async def _warm_redis(connections: int) -> None:
+    clients = [await get_redis_client()]
+    sharded = get_sharded_cache()
+    if sharded is not None:
+        clients.extend(sharded.clients.values())
+    # Concurrent PINGs make each pool open one connection per command
+    await asyncio.gather(*(client.ping() for client in clients for _ in range(connections)))
+
+async def _warm_upstream(connections: int) -> None:
+    # Backends with an SDK client are registered as providers under the same name
+    names = [name for name in settings.TRANSLATION_BACKENDS if providers.is_registered(name)]
+    clients = [providers.get(name).with_options(max_retries=0) for name in names]
+
+    async def handshake(client: Any) -> None:
+        try:
+            await client.models.list()
+        except Exception as e:
+            # Any HTTP response still leaves a live TLS connection in the pool
+            if not getattr(e, "status_code", None):
+                raise
+
+    await asyncio.gather(*(handshake(client) for client in clients for _ in range(connections)))
+
+async def warm_up() -> None:
+    """
+    Open DB, Redis and upstream connections before the worker reports ready.
+
+    Each step is bounded by WARMUP_TIMEOUT_SECONDS; a failing dependency is
+    logged and left to connect lazily on first use.
+    """
+    steps = {
+        "database": (_warm_database, settings.WARMUP_DB_CONNECTIONS),
+        "redis": (_warm_redis, settings.WARMUP_REDIS_CONNECTIONS),
+        "upstream": (_warm_upstream, settings.WARMUP_UPSTREAM_CONNECTIONS),
+    }
+
+    async def run(name: str, step: Callable[[int], Awaitable[None]], connections: int) -> None:
+        if connections <= 0:
+            return
+        try:
+            await asyncio.wait_for(step(connections), settings.WARMUP_TIMEOUT_SECONDS)
+            logger.info("Warm-up complete", extra={"dependency": name})
+        except Exception as e:
+            logger.warning("Warm-up failed", extra={"dependency": name, "error": repr(e)})
+
+    await asyncio.gather(*(run(name, *step) for name, step in steps.items()))
+
+async def shutdown() -> None:
+    """Stop taking traffic, drain in-flight work, then release connections."""
+    worker_state.ready = False
+    worker_state.draining = True
+    remaining = await tasks.drain(settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+    if remaining:
+        logger.warning("Shutdown deadline reached with work in flight", extra={"in_flight": remaining})
+
+    await providers.aclose()
+    await close_redis_client()
+    await close_sharded_cache()
+    engine.dispose()
@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class LocalCache:
+    """
+    In-process stand-in for the Redis commands the app relies on.
+
+    Used while Redis is unreachable, so caching and rate limiting keep
+    working per worker. Entries expire like Redis keys and the least
+    recently used ones are evicted beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._store: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def _live(self, key: str) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._store[key]
+            return None
+        self._store.move_to_end(key)
+        return value
+
+    def _put(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        self._store[key] = (value, time.monotonic() + ttl if ttl else None)
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._live(key)
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self._live(key) is not None:
+            return None
+        self._put(key, str(value) if isinstance(value, (int, float)) else value, ex)
+        return True
+
+    async def setex(self, key: str, ttl: int, value: Any) -> bool:
+        return await self.set(key, value, ex=ttl)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        _, expires_at = self._store.get(key, (None, None))
+        self._store[key] = (str(value), expires_at)
+        return value
+
+    async def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._store.pop(key, None) is not None)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._store), "max_entries": self.max_entries}
@@ -0,0 +1,60 @@
+import atexit
+import json
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from app.core.config import settings
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+class JsonFormatter(logging.Formatter):
+    """Render log records as single-line JSON, including `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+def setup_logging() -> QueueListener:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Handlers on the request path only enqueue the record; formatting and the
+    blocking write to stderr happen on the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
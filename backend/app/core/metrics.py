@@ -0,0 +1,20 @@
+from typing import Any, Callable, Dict
+
+class MetricsRegistry:
+    """
+    Named snapshot callables exported on the metrics endpoint.
+
+    Components register a function returning a JSON-serializable dict; it is
+    only evaluated when the endpoint is scraped.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, source: Callable[[], Dict[str, Any]]) -> None:
+        self._sources[name] = source
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: source() for name, source in self._sources.items()}
+
+metrics = MetricsRegistry()
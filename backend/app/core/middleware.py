@@ -3,13 +3,120 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
+import random
 import time
+from typing import Dict, Optional
 from app.core.config import settings
+from app.core.deadline import deadline_scope
 from app.core.exceptions import CustomException
 
 logger = logging.getLogger(__name__)
 
+class RequestLoggingMiddleware:
+    """
+    Log one structured record per HTTP request.
+
+    Implemented as plain ASGI so the response body is passed through untouched
+    (streaming keeps working). Errors are always logged; successful requests
+    are sampled at `success_sample_rate`.
+    """
+
+    def __init__(self, app: ASGIApp, success_sample_rate: float = 1.0):
+        self.app = app
+        self.success_sample_rate = success_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status_code >= 400 or random.random() < self.success_sample_rate:
+                client = scope.get("client")
+                logger.info("Request processed", extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "process_time_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                    "status_code": status_code,
+                    "client_host": client[0] if client else None,
+                })
+
+class DefaultCORSHeadersMiddleware:
+    """Add the primary CORS origin and credentials headers to every response."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.origin = settings.CORS_ORIGINS[0]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["Access-Control-Allow-Origin"] = self.origin
+                headers["Access-Control-Allow-Credentials"] = "true"
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+class DeadlineMiddleware:
+    """
+    Give every HTTP request a deadline, carried to handlers through a context variable.
+
+    The budget is the route default (longest matching path prefix in
+    `route_timeouts`, else `default_timeout`). Clients may ask for less with
+    the `X-Request-Timeout` header, in seconds, but never for more.
+    """
+
+    header = b"x-request-timeout"
+
+    def __init__(self, app: ASGIApp, default_timeout: float, route_timeouts: Optional[Dict[str, float]] = None):
+        self.app = app
+        self.default_timeout = default_timeout
+        # Longest prefix first, so the most specific route wins
+        self.route_timeouts = sorted((route_timeouts or {}).items(), key=lambda item: -len(item[0]))
+
+    def timeout_for(self, scope: Scope) -> float:
+        timeout = self.default_timeout
+        for prefix, route_timeout in self.route_timeouts:
+            if scope["path"].startswith(prefix):
+                timeout = route_timeout
+                break
+        for name, value in scope.get("headers", []):
+            if name == self.header:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if requested > 0:
+                    timeout = min(timeout, requested)
+                break
+        return timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with deadline_scope(self.timeout_for(scope)):
+            await self.app(scope, receive, send)
+
 def setup_middleware(app: FastAPI) -> None:
     """Configure all middleware for the application."""
     
@@ -28,25 +135,20 @@ def setup_middleware(app: FastAPI) -> None:
         max_age=3600,
     )
 
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = (time.time() - start_time) * 1000
-        
-        log_data = {
-            "method": request.method,
-            "path": request.url.path,
-            "process_time_ms": round(process_time, 2),
-            "status_code": response.status_code,
-            "client_host": request.client.host if request.client else None,
+    # Pure ASGI layers: added last so they wrap everything above, as before
+    app.add_middleware(
+        DeadlineMiddleware,
+        default_timeout=settings.REQUEST_TIMEOUT_SECONDS,
+        route_timeouts={
+            "/api/health": settings.HEALTH_TIMEOUT_SECONDS,
+            f"{settings.API_V1_STR}/translations": settings.TRANSLATION_DEADLINE_SECONDS,
         }
-        logger.info(f"Request processed", extra=log_data)
-        
-        # Add CORS headers to all responses
-        response.headers["Access-Control-Allow-Origin"] = settings.CORS_ORIGINS[0]
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        return response
+    )
+    app.add_middleware(DefaultCORSHeadersMiddleware)
+    app.add_middleware(
+        RequestLoggingMiddleware,
+        success_sample_rate=settings.LOG_SUCCESS_SAMPLE_RATE
+    )
 
     @app.exception_handler(CustomException)
     async def custom_exception_handler(request: Request, exc: CustomException):
@@ -59,6 +161,7 @@ def setup_middleware(app: FastAPI) -> None:
             status_code=exc.status_code,
             content={"detail": exc.detail},
             headers={
+                **(exc.headers or {}),
                 "Access-Control-Allow-Origin": settings.CORS_ORIGINS[0],
                 "Access-Control-Allow-Credentials": "true",
             }
@@ -0,0 +1,99 @@
+import inspect
+import logging
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ProviderRegistry:
+    """
+    Lazily constructed clients for external providers.
+
+    Heavy SDKs are imported inside the factories, so importing the app does
+    not pay for them; each client is built on first use and closed when the
+    application shuts down.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._closers: Dict[str, Optional[Callable[[Any], Any]]] = {}
+        self._instances: Dict[str, Any] = {}
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        closer: Optional[Callable[[Any], Any]] = None
+    ) -> None:
+        self._factories[name] = factory
+        self._closers[name] = closer
+
+    def get(self, name: str) -> Any:
+        if name not in self._instances:
+            if name not in self._factories:
+                raise KeyError(f"Unknown provider: {name}")
+            self._instances[name] = self._factories[name]()
+        return self._instances[name]
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._factories
+
+    def is_initialized(self, name: str) -> bool:
+        return name in self._instances
+
+    async def aclose(self) -> None:
+        """Close every client that was created, in reverse creation order."""
+        for name in reversed(list(self._instances)):
+            closer = self._closers.get(name)
+            instance = self._instances.pop(name)
+            if closer is None:
+                continue
+            try:
+                result = closer(instance)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning("Failed to close provider", extra={"provider": name, "error": str(e)})
+
+def _create_openai_client() -> Any:
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        max_retries=0  # retries are handled by RetryPolicy
+    )
+
+def _create_openai_compatible_client() -> Any:
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_COMPATIBLE_API_KEY,
+        base_url=settings.OPENAI_COMPATIBLE_BASE_URL,
+        max_retries=0
+    )
+
+def _create_stripe() -> Any:
+    import stripe
+
+    stripe.api_key = settings.STRIPE_API_KEY
+    return stripe
+
+def _create_paddle_client() -> Any:
+    from app.paddle.paddle import PaddleClient
+
+    return PaddleClient(
+        api_key=settings.PADDLE_API_KEY,
+        vendor_id=settings.PADDLE_VENDOR_ID,
+        sandbox=True  # Enable sandbox mode for testing
+    )
+
+providers = ProviderRegistry()
+providers.register("openai", _create_openai_client, closer=lambda client: client.close())
+providers.register(
+    "openai_compatible",
+    _create_openai_compatible_client,
+    closer=lambda client: client.close()
+)
+providers.register("stripe", _create_stripe)
+providers.register("paddle", _create_paddle_client)
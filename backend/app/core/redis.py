@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, List, Optional, TypeVar
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from app.core.config import settings
+from app.core.deadline import bounded
+from app.core.local_cache import LocalCache
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors that mean Redis is unreachable, as opposed to a bad command
+REDIS_OUTAGE_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError, asyncio.TimeoutError)
+
+_redis: Optional[Redis] = None
+
+async def get_redis_client() -> Redis:
+    """
+    Shared Redis client for this worker process.
+
+    The client owns a connection pool, so callers should reuse it instead of
+    opening a connection per request.
+    """
+    global _redis
+    if _redis is None:
+        # Build Redis URL with password only if it's set
+        redis_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
+        connection_kwargs = {
+            "decode_responses": True,
+            # Fail fast so an unreachable Redis switches us to degraded mode
+            "socket_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        }
+        if settings.REDIS_PASSWORD:
+            connection_kwargs["password"] = settings.REDIS_PASSWORD
+
+        client = Redis.from_url(redis_url, **connection_kwargs)
+        try:
+            await client.ping()
+        except Exception as e:
+            # If authentication fails, try without password
+            if "AUTH" not in str(e):
+                raise
+            connection_kwargs.pop("password")
+            client = Redis.from_url(redis_url, **connection_kwargs)
+            await client.ping()
+        _redis = client
+    return _redis
+
+async def _reset_client() -> None:
+    global _redis
+    client, _redis = _redis, None
+    if client is not None:
+        try:
+            await client.close()
+        except Exception:
+            pass
+
+async def _connect_main() -> Redis:
+    await _reset_client()
+    return await get_redis_client()
+
+class RedisHealth:
+    """
+    Degraded-mode flag for Redis, with a background reconnect loop.
+
+    While degraded, callers skip Redis entirely and use the per-worker
+    `local_cache`, so an outage costs hit ratio and limiter precision rather
+    than failed requests. The reconnect loop calls `connect` (by default a
+    fresh connection to the main Redis) with jittered exponential backoff and
+    clears the flag once it succeeds.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        name: str = "Redis",
+        connect: Optional[Callable[[], Awaitable[Any]]] = None
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.name = name
+        self._connect = connect or _connect_main
+        self.degraded = False
+        self.degraded_since: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.outages = 0
+        self.reconnect_attempts = 0
+        self._task: Optional[asyncio.Task] = None
+        self._recover_callbacks: List[Callable[[Redis], Awaitable[None]]] = []
+
+    def on_recover(self, callback: Callable[[Redis], Awaitable[None]]) -> None:
+        """Run `callback(client)` each time Redis comes back, e.g. to replay missed writes."""
+        self._recover_callbacks.append(callback)
+
+    def mark_down(self, error: BaseException) -> None:
+        self.last_error = repr(error)
+        if not self.degraded:
+            self.degraded = True
+            self.degraded_since = time.time()
+            self.outages += 1
+            logger.warning(f"{self.name} unavailable, switching to degraded mode", extra={"error": self.last_error})
+        self.ensure_reconnecting()
+
+    def ensure_reconnecting(self) -> None:
+        if self.degraded and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    def mark_up(self) -> None:
+        if self.degraded:
+            logger.info(f"{self.name} reachable again, leaving degraded mode", extra={
+                "degraded_seconds": round(time.time() - (self.degraded_since or time.time()), 1)
+            })
+        self.degraded = False
+        self.degraded_since = None
+
+    async def _reconnect(self) -> None:
+        attempt = 0
+        while self.degraded:
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            attempt += 1
+            self.reconnect_attempts += 1
+            try:
+                client = await asyncio.wait_for(self._connect(), settings.REDIS_SOCKET_TIMEOUT_SECONDS * 2)
+            except Exception as e:
+                self.last_error = repr(e)
+                continue
+            self.mark_up()
+            for callback in self._recover_callbacks:
+                try:
+                    await callback(client)
+                except Exception as e:
+                    logger.warning("Redis recovery callback failed", extra={"error": repr(e)})
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        return {
+            "status": "degraded" if self.degraded else "ok",
+            "degraded_since": self.degraded_since,
+            "last_error": self.last_error,
+            "outages": self.outages,
+            "reconnect_attempts": self.reconnect_attempts,
+            "local_cache": local_cache.stats(),
+        }
+
+redis_health = RedisHealth()
+local_cache = LocalCache(max_entries=settings.LOCAL_CACHE_MAX_ENTRIES)
+metrics.register("redis", redis_health.snapshot)
+
+async def get_redis_or_none() -> Optional[Redis]:
+    """The shared client, or None while Redis is degraded."""
+    if redis_health.degraded:
+        redis_health.ensure_reconnecting()
+        return None
+    try:
+        return await get_redis_client()
+    except REDIS_OUTAGE_ERRORS as e:
+        redis_health.mark_down(e)
+        return None
+
+def health_for(client: Any) -> RedisHealth:
+    """The health flag tracking `client`: its own if it has one (the cache shards), else the main one."""
+    health = getattr(client, "health", None)
+    return health if isinstance(health, RedisHealth) else redis_health
+
+async def with_fallback(client: Optional[Any], op: Callable[[Any], Awaitable[T]]) -> T:
+    """
+    Run `op` against `client`, or against `local_cache` if Redis is unavailable.
+
+    An outage error flips degraded mode on for that client (see `health_for`)
+    and the operation is repeated locally, so the caller still gets an answer.
+    """
+    if client is not None:
+        try:
+            return await bounded(op(client))
+        except REDIS_OUTAGE_ERRORS as e:
+            health_for(client).mark_down(e)
+    return await op(local_cache)
+
+async def get_bytes(client: Any, key: str) -> Optional[bytes]:
+    """
+    GET without decoding, for binary values.
+
+    The shared client decodes replies as UTF-8, which binary cache values are
+    not; stand-ins without `execute_command` (the local cache) return the
+    stored value as is.
+    """
+    if hasattr(client, "execute_command"):
+        return await client.execute_command("GET", key, NEVER_DECODE=[])
+    return await client.get(key)
+
+async def close_redis_client() -> None:
+    await redis_health.stop()
+    await _reset_client()
@@ -0,0 +1,271 @@
+"""
+Translation cache spread over several Redis nodes.
+
+Keys are placed on a consistent-hash ring with `vnodes` points per node, so
+adding a node moves only about 1/N of the keys and nodes get even shares.
+A `{tag}` in a key hashes only the tag, as in Redis Cluster, to keep related
+keys on one node. Pipelines are split per node and the node pipelines run
+concurrently.
+
+A node that stops answering is skipped for `retry_seconds`; its keys go to
+the next node on the ring (a cold miss rather than an error). Only when no
+node answers does the outage reach the caller. The shards then go degraded
+on their own `health` flag, whose reconnect loop pings the nodes; the main
+Redis (rate limits, the governor, HTTP validators) is unaffected.
+
+Set REDIS_CACHE_NODES to use it; otherwise the cache shares the main client.
+"""
+import asyncio
+import bisect
+import hashlib
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import REDIS_OUTAGE_ERRORS, RedisHealth, get_redis_or_none
+
+logger = logging.getLogger(__name__)
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+def hash_slot_key(key: str) -> str:
+    """The part of `key` that decides its node: the first non-empty `{tag}`, or the whole key."""
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1:end]
+    return key
+
+class HashRing:
+    def __init__(self, nodes: Sequence[str], vnodes: int = 160):
+        if not nodes:
+            raise ValueError("HashRing needs at least one node")
+        self.nodes = list(dict.fromkeys(nodes))
+        self.vnodes = vnodes
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str, exclude: Set[str] = frozenset()) -> Optional[str]:
+        """Owner of `key`: the first node clockwise from its hash that is not excluded."""
+        start = bisect.bisect(self._hashes, _hash(hash_slot_key(key)))
+        for offset in range(len(self._owners)):
+            node = self._owners[(start + offset) % len(self._owners)]
+            if node not in exclude:
+                return node
+        return None
+
+class ShardedRedis:
+    """The subset of redis.asyncio commands the cache uses, routed by key."""
+
+    def __init__(self, clients: Dict[str, Any], vnodes: int = 160, retry_seconds: float = 5.0):
+        self.clients = clients
+        self.ring = HashRing(list(clients), vnodes)
+        self.retry_seconds = retry_seconds
+        self._down_until: Dict[str, float] = {}
+        self.commands: Dict[str, int] = {node: 0 for node in clients}
+        self.failovers = 0
+        self.health = RedisHealth(name="Redis cache shards", connect=self._reachable)
+
+    @classmethod
+    def from_urls(cls, urls: Sequence[str], vnodes: int = 160, retry_seconds: float = 5.0) -> "ShardedRedis":
+        connection_kwargs = {
+            "decode_responses": True,
+            "socket_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        }
+        if settings.REDIS_PASSWORD:
+            connection_kwargs["password"] = settings.REDIS_PASSWORD
+        return cls({url: Redis.from_url(url, **connection_kwargs) for url in urls}, vnodes, retry_seconds)
+
+    def _down(self) -> Set[str]:
+        now = time.monotonic()
+        return {node for node, until in self._down_until.items() if until > now}
+
+    def _mark_down(self, node: str, error: BaseException) -> None:
+        if node not in self._down():
+            logger.warning("Redis cache node unavailable", extra={"node": node, "error": repr(error)})
+        self._down_until[node] = time.monotonic() + self.retry_seconds
+        self.failovers += 1
+
+    def _route(self, key: str, exclude: Set[str]) -> str:
+        node = self.ring.node_for(key, exclude)
+        if node is None:
+            raise RedisConnectionError("No Redis cache node available")
+        return node
+
+    async def _call(self, key: str, name: str, *args: Any, **kwargs: Any) -> Any:
+        exclude = self._down()
+        while True:
+            node = self._route(key, exclude)
+            self.commands[node] += 1
+            try:
+                return await getattr(self.clients[node], name)(key, *args, **kwargs)
+            except REDIS_OUTAGE_ERRORS as e:
+                self._mark_down(node, e)
+                exclude.add(node)
+
+    async def execute_command(self, command: str, key: str, *args: Any, **options: Any) -> Any:
+        exclude = self._down()
+        while True:
+            node = self._route(key, exclude)
+            self.commands[node] += 1
+            try:
+                return await self.clients[node].execute_command(command, key, *args, **options)
+            except REDIS_OUTAGE_ERRORS as e:
+                self._mark_down(node, e)
+                exclude.add(node)
+
+    async def get(self, key: str) -> Any:
+        return await self._call(key, "get")
+
+    async def set(self, key: str, value: Any, **kwargs: Any) -> Any:
+        return await self._call(key, "set", value, **kwargs)
+
+    async def setex(self, key: str, ttl: int, value: Any) -> Any:
+        return await self._call(key, "setex", ttl, value)
+
+    async def incr(self, key: str) -> int:
+        return await self._call(key, "incr")
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        return await self._call(key, "expire", ttl)
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        return await self._call(key, "hincrby", field, amount)
+
+    async def hgetall(self, key: str) -> Dict[str, Any]:
+        return await self._call(key, "hgetall")
+
+    async def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        return await self._call(key, "zadd", mapping)
+
+    async def zcard(self, key: str) -> int:
+        return await self._call(key, "zcard")
+
+    async def zpopmin(self, key: str, count: int = 1) -> list:
+        return await self._call(key, "zpopmin", count)
+
+    async def delete(self, *keys: str) -> int:
+        pipe = self.pipeline()
+        for key in keys:
+            pipe.delete(key)
+        return sum(await pipe.execute())
+
+    async def ping(self) -> bool:
+        """True if every node answers."""
+        return all(await asyncio.gather(*(client.ping() for client in self.clients.values())))
+
+    async def _reachable(self) -> "ShardedRedis":
+        """Reconnect check for `health`: succeeds once any node answers, clearing the ones that did."""
+        nodes = list(self.clients)
+        replies = await asyncio.gather(*(self.clients[node].ping() for node in nodes), return_exceptions=True)
+        answered = [node for node, reply in zip(nodes, replies) if reply is True]
+        if not answered:
+            raise RedisConnectionError("No Redis cache node available")
+        for node in answered:
+            self._down_until.pop(node, None)
+        return self
+
+    def pipeline(self, transaction: bool = False) -> "ShardedPipeline":
+        return ShardedPipeline(self)
+
+    async def close(self) -> None:
+        for client in self.clients.values():
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        down = self._down()
+        return {
+            "nodes": {node: {"up": node not in down, "commands": count} for node, count in self.commands.items()},
+            "vnodes": self.ring.vnodes,
+            "failovers": self.failovers,
+            "status": "degraded" if self.health.degraded else "ok",
+            "degraded_since": self.health.degraded_since,
+            "outages": self.health.outages,
+        }
+
+class ShardedPipeline:
+    """Queues single-key commands and runs one pipeline per node on execute()."""
+
+    def __init__(self, redis: ShardedRedis):
+        self.redis = redis
+        self.commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(key: str, *args: Any, **kwargs: Any) -> "ShardedPipeline":
+            self.commands.append((name, (key, *args), kwargs))
+            return self
+        return queue
+
+    async def _run(self, node: str, indexes: List[int]) -> List[Any]:
+        pipe = self.redis.clients[node].pipeline(transaction=False)
+        for index in indexes:
+            name, args, kwargs = self.commands[index]
+            getattr(pipe, name)(*args, **kwargs)
+        self.redis.commands[node] += len(indexes)
+        return await pipe.execute()
+
+    async def execute(self) -> List[Any]:
+        results: List[Any] = [None] * len(self.commands)
+        pending = list(range(len(self.commands)))
+        exclude = self.redis._down()
+        while pending:
+            groups: Dict[str, List[int]] = {}
+            for index in pending:
+                groups.setdefault(self.redis._route(self.commands[index][1][0], exclude), []).append(index)
+            nodes = list(groups)
+            replies = await asyncio.gather(*(self._run(node, groups[node]) for node in nodes), return_exceptions=True)
+            pending = []
+            for node, reply in zip(nodes, replies):
+                if isinstance(reply, REDIS_OUTAGE_ERRORS):
+                    # Replay this node's commands on the next nodes of the ring
+                    self.redis._mark_down(node, reply)
+                    exclude.add(node)
+                    pending.extend(groups[node])
+                elif isinstance(reply, BaseException):
+                    raise reply
+                else:
+                    for index, value in zip(groups[node], reply):
+                        results[index] = value
+        self.commands = []
+        return results
+
+_cache: Optional[ShardedRedis] = None
+
+def get_sharded_cache() -> Optional[ShardedRedis]:
+    """The sharded cache client, or None when REDIS_CACHE_NODES is not set."""
+    global _cache
+    if _cache is None and settings.REDIS_CACHE_NODES:
+        _cache = ShardedRedis.from_urls(
+            settings.REDIS_CACHE_NODES,
+            vnodes=settings.REDIS_CACHE_VNODES,
+            retry_seconds=settings.REDIS_CACHE_NODE_RETRY_SECONDS
+        )
+        metrics.register("redis_cache_shards", _cache.snapshot)
+    return _cache
+
+async def get_cache_redis_or_none() -> Optional[Any]:
+    """Client for the translation cache: the shards if configured, else the shared client; None while degraded."""
+    sharded = get_sharded_cache()
+    if sharded is None:
+        return await get_redis_or_none()
+    if sharded.health.degraded:
+        sharded.health.ensure_reconnecting()
+        return None
+    return sharded
+
+async def close_sharded_cache() -> None:
+    global _cache
+    cache, _cache = _cache, None
+    if cache is not None:
+        await cache.health.stop()
+        await cache.close()
@@ -3,7 +3,8 @@ from typing import Any, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
-import redis.asyncio as redis
+from app.core.deadline import bounded
+from app.core.redis import REDIS_OUTAGE_ERRORS, get_redis_or_none, local_cache, redis_health
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -31,51 +32,40 @@ class RateLimiter:
         self._redis = None
 
     async def _get_redis(self):
-        if self._redis is None:
-            # Build Redis URL with password only if it's set
-            redis_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
-            connection_kwargs = {
-                "decode_responses": True,
-            }
-            if settings.REDIS_PASSWORD:
-                connection_kwargs["password"] = settings.REDIS_PASSWORD
-            
-            try:
-                self._redis = redis.from_url(
-                    redis_url,
-                    **connection_kwargs
-                )
-                # Test the connection
-                await self._redis.ping()
-            except Exception as e:
-                # If authentication fails, try without password
-                if "AUTH" in str(e):
-                    self._redis = redis.from_url(
-                        redis_url,
-                        decode_responses=True
-                    )
-                    await self._redis.ping()
-                else:
-                    raise
-        return self._redis
+        """Redis client, or None while Redis is degraded."""
+        if self._redis is not None:
+            return self._redis
+        return await get_redis_or_none()
 
     async def check_rate_limit(self, user_id: int, limit: int) -> bool:
         """
         Check if user has exceeded their rate limit
+
+        While Redis is unavailable each worker enforces its own share of the
+        limit locally, erring on the side of rejecting.
         """
-        redis = await self._get_redis()
         key = f"rate_limit:{user_id}"
-        current = await redis.get(key)
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                return await bounded(self._check(redis, key, limit))
+            except REDIS_OUTAGE_ERRORS as e:
+                redis_health.mark_down(e)
+        local_limit = max(1, limit // settings.RATE_LIMIT_DEGRADED_DIVISOR)
+        return await self._check(local_cache, key, local_limit)
+
+    async def _check(self, store: Any, key: str, limit: int) -> bool:
+        current = await store.get(key)
         
         if not current:
-            await redis.set(key, 1, ex=86400)  # 24 hours
+            await store.set(key, 1, ex=86400)  # 24 hours
             return True
             
         current = int(current)
         if current >= limit:
             return False
             
-        await redis.incr(key)
+        await store.incr(key)
         return True
 
 class SecurityScopes:
@@ -0,0 +1,109 @@
+"""Add translations.content_hash for the translation memory
+
+Revision ID: b7e41c2d9a30
+Revises: 597b2bbad661
+Create Date: 2026-10-19 10:12:41.208113
+
+"""
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e41c2d9a30'
+down_revision: Union[str, None] = '597b2bbad661'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+# Frozen copy of app.services.canonical as of this revision, so the migration
+# hashes the same way however the application changes later. Deployments that
+# override CACHE_KEY_IGNORED_CONTEXT_KEYS get the default list here; their rows
+# only miss the translation memory until they are translated again.
+IGNORED_CONTEXT_KEYS = {"request_id", "trace_id", "session_id", "timestamp", "client", "user_agent"}
+_SPACES = re.compile(r"[^\S\n]+")
+_INDENT = re.compile(r"[^\S\n]*")
+
+
+def _canonical_line(line: str) -> str:
+    indent = _INDENT.match(line).group()
+    body = _SPACES.sub(" ", line[len(indent):]).rstrip()
+    return indent + body if body else ""
+
+
+def _content_hash(text: str, source_lang: str, target_lang: str, context) -> str:
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(_canonical_line(line) for line in text.split("\n")).strip()
+    context = {
+        key: unicodedata.normalize("NFC", value) if isinstance(value, str) else value
+        for key, value in (context or {}).items()
+        if key not in IGNORED_CONTEXT_KEYS and value not in (None, "", {}, [])
+    }
+    key_components = f"{text}:{source_lang}:{target_lang}:{json.dumps(context, sort_keys=True)}"
+    return hashlib.sha256(key_components.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('translations', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Hash existing rows in batches, each committed on its own so no long transaction holds locks
+    translations = sa.table(
+        'translations',
+        sa.column('id', sa.Integer),
+        sa.column('source_text', sa.Text),
+        sa.column('source_lang', sa.String),
+        sa.column('target_lang', sa.String),
+        sa.column('context', sa.JSON),
+        sa.column('content_hash', sa.String),
+    )
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.select(
+                    translations.c.id,
+                    translations.c.source_text,
+                    translations.c.source_lang,
+                    translations.c.target_lang,
+                    translations.c.context,
+                )
+                .where(translations.c.id > last_id)
+                .order_by(translations.c.id)
+                .limit(BACKFILL_BATCH)
+            ).fetchall()
+            if not rows:
+                break
+            bind.execute(
+                translations.update()
+                .where(translations.c.id == sa.bindparam('row_id'))
+                .values(content_hash=sa.bindparam('hash')),
+                [
+                    {
+                        'row_id': row.id,
+                        'hash': _content_hash(row.source_text, row.source_lang, row.target_lang, row.context),
+                    }
+                    for row in rows
+                ],
+            )
+            last_id = rows[-1].id
+
+    # Build the index without blocking writes to the table
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_translations_content_hash', 'translations', ['content_hash'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_translations_content_hash', table_name='translations', postgresql_concurrently=True)
+    op.drop_column('translations', 'content_hash')
@@ -0,0 +1,29 @@
+"""Add users.tenant, assigned by admins, for tenant-scoped caches
+
+Revision ID: d41a7c9e2f60
+Revises: b7e41c2d9a30
+Create Date: 2026-10-19 15:03:27.514206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a7c9e2f60'
+down_revision: Union[str, None] = 'b7e41c2d9a30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Not backfilled from company_name, which users choose themselves at registration
+    op.add_column('users', sa.Column('tenant', sa.String(length=255), nullable=True))
+    op.create_index('ix_users_tenant', 'users', ['tenant'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_tenant', table_name='users')
+    op.drop_column('users', 'tenant')
@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.deadline import get_deadline, statement_timeout_ms
+from app.core.exceptions import DeadlineExceededError
 
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
@@ -10,6 +12,19 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@event.listens_for(SessionLocal, "after_begin")
+def _apply_request_deadline(session, transaction, connection):
+    """Bound the transaction's statements by the time left for the request."""
+    timeout = statement_timeout_ms()
+    if timeout is not None and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout}")
+
+@event.listens_for(engine, "handle_error")
+def _deadline_cancellation(context):
+    # 57014 is query_canceled, which is how the statement_timeout above surfaces
+    if getattr(context.original_exception, "pgcode", None) == "57014" and get_deadline() is not None:
+        raise DeadlineExceededError() from context.original_exception
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -1,22 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 import logging
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.core.admission import loop_lag
 from app.core.middleware import setup_middleware
+from app.core.logging_config import setup_logging
+from app.core.lifecycle import shutdown, warm_up, worker_state
+from app.core.metrics import metrics
+from app.core.redis import redis_health
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure structured, queue-backed logging
+setup_logging()
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open connections up front so first requests don't pay for them
+    await warm_up()
+    loop_lag.start()
+    worker_state.ready = True
+    yield
+    await loop_lag.stop()
+    await shutdown()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="AI-powered Turkish-English localization platform",
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 # Setup middleware
@@ -25,7 +40,31 @@ setup_middleware(app)
 # Health check endpoint
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy"}
+    # Degraded still serves traffic: Redis-backed caching and limits run per worker
+    return {
+        "status": "degraded" if redis_health.degraded else "healthy",
+        "redis": "degraded" if redis_health.degraded else "ok",
+    }
+
+# Liveness: the process is up and its event loop is responsive
+@app.get("/api/health/live")
+async def liveness_check():
+    return {"status": "alive"}
+
+# Readiness: warmed up and not draining, so safe to route traffic here
+@app.get("/api/health/ready")
+async def readiness_check():
+    if not worker_state.ready or worker_state.draining:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "draining" if worker_state.draining else "starting"}
+        )
+    return {"status": "ready"}
+
+# Runtime metrics (routing, caching, upstream health) as JSON
+@app.get("/api/metrics")
+async def metrics_snapshot():
+    return metrics.snapshot()
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -24,6 +24,8 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.USER)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     company_name: Mapped[Optional[str]] = mapped_column(String(255))
+    # Organisation that scopes shared caches; assigned by an admin, never at registration
+    tenant: Mapped[Optional[str]] = mapped_column(String(255), index=True)
     
     # Relationships
     translations: Mapped[List["Translation"]] = relationship("Translation", back_populates="user")
@@ -40,6 +42,8 @@ class Translation(Base):
     target_lang: Mapped[str] = mapped_column(String(2), nullable=False)
     context: Mapped[Optional[dict]] = mapped_column(JSON)
     meta_data: Mapped[Optional[dict]] = mapped_column(JSON)
+    # SHA-256 of the canonical request (text, language pair, context); same as the cache key
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), index=True)
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="translations")
@@ -15,6 +15,9 @@ class SubscriptionUpdate(BaseModel):
     tier: Optional[SubscriptionTier] = None
     end_date: Optional[datetime] = None
 
+class UserTenantUpdate(BaseModel):
+    tenant: Optional[str] = Field(None, min_length=1, max_length=255)
+
 class ComplianceTemplateBase(BaseModel):
     name: str
     description: str
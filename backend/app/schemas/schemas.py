@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, validator, ConfigDict
+from pydantic import AliasChoices, BaseModel, EmailStr, Field, validator, ConfigDict
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from app.models.models import UserRole, SubscriptionTier
@@ -69,6 +69,8 @@ class UserUpdate(UserBase):
 
 class UserResponse(UserBase):
     id: int
+    # Assigned by an admin; not part of UserBase so users cannot set it themselves
+    tenant: Optional[str] = None
     subscription: Optional[Subscription] = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -95,7 +97,10 @@ class Translation(TranslationBase):
     translated_text: str
     created_at: datetime
     updated_at: datetime
-    metadata: Optional[Dict[str, Any]] = None
+    # ORM column is `meta_data`; `metadata` is reserved by SQLAlchemy models
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None, validation_alias=AliasChoices("meta_data", "metadata")
+    )
 
 # Compliance Schemas
 class ComplianceRuleBase(BaseSchema):
@@ -0,0 +1,369 @@
+import asyncio
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededError
+from app.core.providers import providers
+from app.services.circuit import CircuitBreaker
+from app.services.governor import TokenGovernor, governor_from_settings
+from app.services.hedging import Hedger
+from app.services.retry import RetryPolicy, is_retryable, never_sent
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CompletionRequest:
+    """
+    A provider-neutral chat completion request.
+
+    `deadline` is a `time.monotonic()` timestamp. `hedge` marks the request
+    as safe to send twice when the first copy is slow.
+    """
+    messages: List[Dict[str, str]]
+    model: str
+    temperature: float = 0.3
+    max_tokens: int = 1500
+    deadline: Optional[float] = None
+    hedge: bool = False
+
+@dataclass
+class CompletionResult:
+    content: str
+    model: str
+    backend: str
+    latency_ms: float
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    raw: Any = field(default=None, repr=False)
+
+class TranslationBackend(ABC):
+    """An upstream that can answer chat completion requests."""
+
+    name: str
+
+    @abstractmethod
+    async def complete(self, request: CompletionRequest) -> CompletionResult:
+        ...
+
+class OpenAIBackend(TranslationBackend):
+    """
+    Backend for the OpenAI API or any server speaking the same protocol.
+
+    `model` overrides the requested model, which is how an OpenAI-compatible
+    local endpoint serving a single model is configured. With a `governor`,
+    each call first reserves capacity under the provider's RPM/TPM limits.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client_factory: Callable[[], Any],
+        model: Optional[str] = None,
+        governor: Optional[TokenGovernor] = None
+    ):
+        self.name = name
+        self._client_factory = client_factory
+        self._client = None
+        self.model = model
+        self.governor = governor
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client
+
+    async def complete(self, request: CompletionRequest) -> CompletionResult:
+        model = self.model or request.model
+        options = {}
+        if request.deadline is not None:
+            options["timeout"] = max(0.001, request.deadline - time.monotonic())
+        reservation = None
+        if self.governor is not None:
+            reservation = await self.governor.acquire(request.messages, request.max_tokens, request.deadline)
+        start = time.perf_counter()
+        try:
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=request.messages,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+                **options
+            )
+        except Exception as e:
+            # Anything the provider received still counts against its limits
+            if reservation is not None and never_sent(e):
+                await self.governor.release(reservation)
+            raise
+        usage = getattr(response, "usage", None)
+        if reservation is not None and getattr(usage, "total_tokens", None) is not None:
+            await self.governor.reconcile(reservation, usage.total_tokens)
+        return CompletionResult(
+            content=response.choices[0].message.content,
+            model=getattr(response, "model", None) or model,
+            backend=self.name,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            raw=response
+        )
+
+_FAKE_SEGMENT = re.compile(r"^\[(\d+)\] (.*)$")
+
+def fake_translation(user_message: str) -> str:
+    """
+    Mark the text with its target language; numbered segments are answered per line.
+
+    Shared by `FakeBackend` and the stand-in server in benchmarks/fake_openai.py.
+    """
+    header, _, body = user_message.partition("\n\n")
+    text = body.split("\n\nConsider this context:", 1)[0] if body else header
+    target = "tr" if header.rstrip(":").endswith("to tr") else "en"
+    lines = text.split("\n")
+    segments = [_FAKE_SEGMENT.match(line) for line in lines]
+    if len(lines) > 1 and all(segments):
+        return "\n".join(f"[{m.group(1)}] [{target}] {m.group(2)}" for m in segments)
+    return f"[{target}] {text}"
+
+class FakeBackend(TranslationBackend):
+    """
+    Deterministic in-process backend for tests and local development.
+
+    Echoes the text to translate with a target-language marker. `latency`
+    (seconds) and `fail` let tests model slow or failing providers.
+    """
+
+    def __init__(self, name: str = "fake", latency: float = 0.0, fail: bool = False):
+        self.name = name
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+
+    async def complete(self, request: CompletionRequest) -> CompletionResult:
+        self.calls += 1
+        start = time.perf_counter()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError(f"{self.name} backend unavailable")
+        content = fake_translation(request.messages[-1]["content"])
+        return CompletionResult(
+            content=content,
+            model=request.model,
+            backend=self.name,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            prompt_tokens=sum(len(m["content"]) for m in request.messages) // 4,
+            completion_tokens=max(1, len(content) // 4)
+        )
+
+class BackendRegistry:
+    """Named backend factories; `TRANSLATION_BACKENDS` picks which are active."""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], TranslationBackend]] = {}
+
+    def register(self, name: str, factory: Callable[[], TranslationBackend]) -> None:
+        self._factories[name] = factory
+
+    def names(self) -> List[str]:
+        return list(self._factories)
+
+    def create(self, name: str) -> TranslationBackend:
+        if name not in self._factories:
+            raise KeyError(f"Unknown translation backend: {name}")
+        return self._factories[name]()
+
+backend_registry = BackendRegistry()
+backend_registry.register(
+    "openai",
+    lambda: OpenAIBackend(
+        "openai",
+        lambda: providers.get("openai"),
+        governor=governor_from_settings("openai", settings.OPENAI_RPM_LIMIT, settings.OPENAI_TPM_LIMIT)
+    )
+)
+backend_registry.register(
+    "openai_compatible",
+    lambda: OpenAIBackend(
+        "openai_compatible",
+        lambda: providers.get("openai_compatible"),
+        model=settings.OPENAI_COMPATIBLE_MODEL
+    )
+)
+backend_registry.register("fake", FakeBackend)
+
+class BackendStats:
+    """
+    Exponentially weighted latency and error rate for one backend.
+
+    The error rate also decays with a half-life while no new samples arrive,
+    so a backend that was failed over from is retried once it has been quiet
+    for a while.
+    """
+
+    def __init__(self, alpha: float, error_half_life: float):
+        self.alpha = alpha
+        self.error_half_life = error_half_life
+        self.latency_ms: Optional[float] = None
+        self._error_rate = 0.0
+        self._updated_at = time.monotonic()
+        self.requests = 0
+        self.failures = 0
+
+    def error_rate(self, now: Optional[float] = None) -> float:
+        elapsed = (now if now is not None else time.monotonic()) - self._updated_at
+        if self.error_half_life <= 0:
+            return self._error_rate
+        return self._error_rate * 0.5 ** (elapsed / self.error_half_life)
+
+    def _record(self, latency_ms: float, error: float) -> None:
+        now = time.monotonic()
+        self.requests += 1
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += self.alpha * (latency_ms - self.latency_ms)
+        current = self.error_rate(now)
+        self._error_rate = current + self.alpha * (error - current)
+        self._updated_at = now
+
+    def record_success(self, latency_ms: float) -> None:
+        self._record(latency_ms, 0.0)
+
+    def record_failure(self, latency_ms: float) -> None:
+        self.failures += 1
+        self._record(latency_ms, 1.0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_ewma_ms": round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            "error_rate_ewma": round(self.error_rate(), 4),
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+class BackendRouter:
+    """
+    Pick a backend per request from live latency and error EWMAs.
+
+    Backends are ranked by expected cost: latency EWMA plus the error rate
+    times `error_cost_ms`. A backend without samples ranks first so it gets
+    measured. Transient failures are retried on the same backend under
+    `retry`; when that gives up the next-ranked backend is tried, until
+    every backend has been attempted.
+
+    Each backend sits behind a circuit breaker, so a backend that is failing
+    or stalling is skipped without waiting on it. Requests marked `hedge`
+    go through `hedger` when one is configured.
+    """
+
+    def __init__(
+        self,
+        backends: List[TranslationBackend],
+        alpha: float = 0.2,
+        error_cost_ms: float = 5000.0,
+        error_half_life: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+        breakers: Optional[Dict[str, CircuitBreaker]] = None,
+        hedger: Optional[Hedger] = None
+    ):
+        if not backends:
+            raise ValueError("BackendRouter needs at least one backend")
+        self.backends = backends
+        self.error_cost_ms = error_cost_ms
+        self.retry = retry or RetryPolicy()
+        self.hedger = hedger
+        self.stats: Dict[str, BackendStats] = {
+            b.name: BackendStats(alpha, error_half_life) for b in backends
+        }
+        breakers = breakers or {}
+        self.breakers: Dict[str, CircuitBreaker] = {
+            b.name: breakers.get(b.name) or CircuitBreaker(b.name) for b in backends
+        }
+
+    @classmethod
+    def from_settings(cls) -> "BackendRouter":
+        return cls(
+            [backend_registry.create(name) for name in settings.TRANSLATION_BACKENDS],
+            alpha=settings.ROUTER_EWMA_ALPHA,
+            error_cost_ms=settings.ROUTER_ERROR_COST_MS,
+            error_half_life=settings.ROUTER_ERROR_HALF_LIFE_SECONDS,
+            retry=RetryPolicy.from_settings(),
+            breakers={name: CircuitBreaker.from_settings(name) for name in settings.TRANSLATION_BACKENDS},
+            hedger=Hedger.from_settings() if settings.HEDGE_ENABLED else None
+        )
+
+    def score(self, backend: TranslationBackend) -> float:
+        stats = self.stats[backend.name]
+        if stats.latency_ms is None:
+            return 0.0
+        return stats.latency_ms + self.error_cost_ms * stats.error_rate()
+
+    def ranked(self) -> List[TranslationBackend]:
+        # sorted() is stable, so configuration order breaks ties
+        return sorted(self.backends, key=self.score)
+
+    async def complete(self, request: CompletionRequest) -> CompletionResult:
+        if request.hedge and self.hedger is not None:
+            return await self.hedger.run(lambda: self._complete(request), request.deadline)
+        return await self._complete(request)
+
+    async def _complete(self, request: CompletionRequest) -> CompletionResult:
+        last_error: Optional[Exception] = None
+        for backend in self.ranked():
+            if request.deadline is not None and time.monotonic() >= request.deadline:
+                # Out of time: failing over would only start a call nobody waits for
+                raise DeadlineExceededError()
+            stats = self.stats[backend.name]
+            expected_attempt = (stats.latency_ms or 0.0) / 1000
+            try:
+                result = await self.retry.call(
+                    lambda: self._attempt(backend, request),
+                    deadline=request.deadline,
+                    expected_attempt=expected_attempt
+                )
+            except Exception as e:
+                logger.warning("Translation backend failed", extra={"backend": backend.name, "error": str(e)})
+                last_error = e
+                continue
+            stats.record_success(result.latency_ms)
+            return result
+        raise last_error
+
+    async def _attempt(self, backend: TranslationBackend, request: CompletionRequest) -> CompletionResult:
+        breaker = self.breakers[backend.name]
+        breaker.before_call()
+        start = time.perf_counter()
+        try:
+            if request.deadline is None:
+                result = await backend.complete(request)
+            else:
+                result = await asyncio.wait_for(
+                    backend.complete(request), max(0.0, request.deadline - time.monotonic())
+                )
+        except Exception as e:
+            # Every failed attempt counts against the backend, retried or not
+            self.stats[backend.name].record_failure((time.perf_counter() - start) * 1000)
+            if is_retryable(e):
+                breaker.record_failure()
+            else:
+                breaker.release()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success((time.perf_counter() - start) * 1000)
+        return result
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for backend in self.backends:
+            result[backend.name] = self.stats[backend.name].as_dict()
+            governor = getattr(backend, "governor", None)
+            if governor is not None:
+                result[backend.name]["governor"] = governor.stats.snapshot()
+        return result
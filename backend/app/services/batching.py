@@ -0,0 +1,217 @@
+import asyncio
+import json
+import logging
+import re
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.core.lifecycle import tasks
+from app.services.backends import CompletionRequest, CompletionResult
+from app.services.profiles import TranslationProfile, build_messages
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_PATTERN = re.compile(r"^\s*\[(\d+)\]\s?(.*?)\s*$")
+
+def build_batch_messages(
+    profile: TranslationProfile,
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    context: Optional[Dict[str, Any]]
+) -> List[Dict[str, str]]:
+    """One prompt carrying several numbered segments, answered line by line."""
+    direction = "Turkish to English" if source_lang == "tr" else "English to Turkish"
+    system_message = (
+        f"Translate each numbered segment from {direction}. "
+        "Reply with one line per segment in the form [n] translation, "
+        "keeping the numbers, and nothing else."
+    )
+    segments = "\n".join(f"[{i}] {text}" for i, text in enumerate(texts, 1))
+    user_message = f"Translate the following segments from {source_lang} to {target_lang}:\n\n{segments}"
+    if context:
+        user_message += f"\n\nConsider this context:\n{json.dumps(context, separators=(',', ':'))}"
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_message}
+    ]
+
+def parse_batch_response(content: str, count: int) -> Dict[int, str]:
+    """Map segment number to translation; numbers that are missing or repeated are dropped."""
+    found: Dict[int, str] = {}
+    repeated = set()
+    for line in (content or "").splitlines():
+        match = _SEGMENT_PATTERN.match(line)
+        if not match:
+            continue
+        number = int(match.group(1))
+        if number in found:
+            repeated.add(number)
+        found[number] = match.group(2)
+    return {n: text for n, text in found.items() if 1 <= n <= count and n not in repeated and text}
+
+@dataclass
+class _Batch:
+    profile: TranslationProfile
+    source_lang: str
+    target_lang: str
+    context: Optional[Dict[str, Any]]
+    items: List[Tuple[str, asyncio.Future]] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+    deadline: Optional[float] = None
+
+    def add(self, text: str, future: asyncio.Future, deadline: Optional[float]) -> None:
+        self.items.append((text, future))
+        # The shared call has to finish in time for the most urgent caller
+        if deadline is not None and (self.deadline is None or deadline < self.deadline):
+            self.deadline = deadline
+
+class BatchStats:
+    def __init__(self):
+        self.requests = 0
+        self.upstream_calls = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.fallback_items = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "fallback_items": self.fallback_items,
+            "avg_batch_size": round(self.batched_items / self.batches, 2) if self.batches else 0.0,
+            "requests_per_upstream_call": (
+                round(self.requests / self.upstream_calls, 3) if self.upstream_calls else 0.0
+            ),
+        }
+
+class MicroBatcher:
+    """
+    Coalesce concurrent short translations into a single upstream call.
+
+    Requests with the same profile, language pair and context are collected
+    for up to `window_ms` (or until `max_size` are waiting), sent as one
+    numbered-segment prompt and split back per caller. Segments that cannot
+    be parsed out of the reply are retried as individual calls.
+    """
+
+    def __init__(
+        self,
+        complete: Callable[[CompletionRequest], Awaitable[CompletionResult]],
+        window_ms: float,
+        max_size: int,
+        max_tokens_cap: int
+    ):
+        self._complete = complete
+        self.window = window_ms / 1000.0
+        self.max_size = max_size
+        self.max_tokens_cap = max_tokens_cap
+        self._pending: Dict[Tuple[str, ...], _Batch] = {}
+        self.stats = BatchStats()
+
+    async def submit(
+        self,
+        profile: TranslationProfile,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]],
+        deadline: Optional[float] = None
+    ) -> CompletionResult:
+        loop = asyncio.get_running_loop()
+        key = (
+            profile.name,
+            profile.model,
+            source_lang,
+            target_lang,
+            json.dumps(context, sort_keys=True) if context else "",
+        )
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _Batch(profile, source_lang, target_lang, context)
+            batch.timer = loop.call_later(self.window, self._flush, key)
+            self._pending[key] = batch
+
+        future: asyncio.Future = loop.create_future()
+        batch.add(text, future, deadline)
+        self.stats.requests += 1
+        if len(batch.items) >= self.max_size:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Tuple[str, ...]) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        tasks.spawn(self._run(batch))
+
+    async def _run(self, batch: _Batch) -> None:
+        try:
+            if len(batch.items) == 1:
+                await self._run_individual(batch, batch.items)
+            else:
+                await self._run_batch(batch)
+        except BaseException as e:
+            # Never leave a caller waiting, including when shutdown cancels us
+            error = e if isinstance(e, Exception) else asyncio.CancelledError()
+            for _, future in batch.items:
+                if not future.done():
+                    future.set_exception(error)
+            if not isinstance(e, Exception):
+                raise
+
+    async def _run_batch(self, batch: _Batch) -> None:
+        texts = [text for text, _ in batch.items]
+        profile = batch.profile
+        self.stats.upstream_calls += 1
+        completion = await self._complete(CompletionRequest(
+            model=profile.model,
+            messages=build_batch_messages(profile, texts, batch.source_lang, batch.target_lang, batch.context),
+            temperature=profile.temperature,
+            max_tokens=min(profile.max_tokens * len(texts), self.max_tokens_cap),
+            deadline=batch.deadline,
+            hedge=profile.hedge
+        ))
+        parsed = parse_batch_response(completion.content, len(texts))
+
+        missing = []
+        for number, (text, future) in enumerate(batch.items, 1):
+            if number in parsed:
+                self.stats.batched_items += 1
+                if not future.done():
+                    future.set_result(replace(completion, content=parsed[number]))
+            else:
+                missing.append((text, future))
+        if len(missing) < len(texts):
+            self.stats.batches += 1
+        if missing:
+            logger.warning("Batch response incomplete, falling back", extra={
+                "segments": len(texts),
+                "missing": len(missing)
+            })
+            self.stats.fallback_items += len(missing)
+            await self._run_individual(batch, missing)
+
+    async def _run_individual(self, batch: _Batch, items: List[Tuple[str, asyncio.Future]]) -> None:
+        async def run_one(text: str, future: asyncio.Future) -> None:
+            self.stats.upstream_calls += 1
+            try:
+                result = await self._complete(CompletionRequest(
+                    model=batch.profile.model,
+                    messages=build_messages(batch.profile, text, batch.source_lang, batch.target_lang, batch.context),
+                    temperature=batch.profile.temperature,
+                    max_tokens=batch.profile.max_tokens,
+                    deadline=batch.deadline,
+                    hedge=batch.profile.hedge
+                ))
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                return
+            if not future.done():
+                future.set_result(result)
+
+        await asyncio.gather(*(run_one(text, future) for text, future in items))
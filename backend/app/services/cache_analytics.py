@@ -0,0 +1,241 @@
+"""
+Instrumentation for the translation cache, for sizing Redis and tuning TTLs.
+
+Hit and miss counts by tenant and language pair are also added to hashes in
+Redis every `flush_seconds`, one pipelined HINCRBY batch per worker, so
+`cluster_snapshot` reports ratios for the whole service. Everything else is
+per worker, and snapshots say so (`scope`, `worker_pid`).
+
+Per worker, it tracks:
+- hit ratio by tenant and by language pair,
+- the hottest keys, with a Space-Saving top-K sketch (bounded memory, counts
+  overestimated by at most `error`),
+- a histogram of stored value sizes,
+- how long entries live. A sample of written keys remembers when it was
+  written and its hard TTL. A later miss on a sampled key measures its
+  lifetime: removed before its TTL means evicted (memory pressure), after it
+  means expired.
+"""
+import bisect
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stored value sizes in bytes
+SIZE_BOUNDS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536)
+# Entry lifetimes in seconds: 1m, 10m, 1h, 6h, 12h, 1d, 2d, 7d, 14d
+LIFETIME_BOUNDS = (60, 600, 3600, 21600, 43200, 86400, 172800, 604800, 1209600)
+OTHER = "other"
+# Service-wide hit/miss counts, fields "<name>:hits" and "<name>:misses"
+CLUSTER_KEYS = {"tenant": "cache:analytics:tenant", "pair": "cache:analytics:pair"}
+
+class Histogram:
+    """Counts per bucket; bucket i holds values up to `bounds[i]`, the last one everything above."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        count = sum(self.counts)
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": count,
+            "mean": round(self.total / count, 1) if count else None,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+class TopK:
+    """Space-Saving heavy hitters: at most `k` counters, the smallest is replaced by a new key."""
+
+    def __init__(self, k: int = 100):
+        self.k = k
+        # key -> [count, error, label]
+        self._counters: Dict[str, List[Any]] = {}
+
+    def record(self, key: str, label: str = "") -> None:
+        counter = self._counters.get(key)
+        if counter is not None:
+            counter[0] += 1
+        elif len(self._counters) < self.k:
+            self._counters[key] = [1, 0, label]
+        else:
+            # O(k) scan; k is small and this only runs for keys outside the top-K
+            victim = min(self._counters, key=lambda existing: self._counters[existing][0])
+            floor = self._counters.pop(victim)[0]
+            self._counters[key] = [floor + 1, floor, label]
+
+    def top(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        ranked = sorted(self._counters.items(), key=lambda item: item[1][0], reverse=True)
+        return [
+            {"key": key, "label": label, "count": count, "error": error}
+            for key, (count, error, label) in ranked[:n]
+        ]
+
+class CacheAnalytics:
+    def __init__(
+        self,
+        top_k: int = 100,
+        lifetime_sample: float = 0.01,
+        max_tenants: int = 500,
+        max_tracked: int = 10000,
+        flush_seconds: float = 10.0
+    ):
+        self.top_k = top_k
+        self.lifetime_sample = lifetime_sample
+        self.max_tenants = max_tenants
+        self.max_tracked = max_tracked
+        self.flush_seconds = flush_seconds
+        self.started_at = time.time()
+        self.by_tenant: Dict[str, List[int]] = {}
+        self.by_pair: Dict[str, List[int]] = {}
+        self.hot_keys = TopK(top_k)
+        self.value_sizes = Histogram(SIZE_BOUNDS)
+        self.lifetimes = Histogram(LIFETIME_BOUNDS)
+        self.evicted = 0
+        self.expired = 0
+        # Sampled key -> (written at, hard TTL)
+        self._written: Dict[str, Tuple[float, int]] = {}
+        # (table, field) -> count not yet added to the Redis totals
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._flushed_at = time.monotonic()
+        self.flush_errors = 0
+
+    @classmethod
+    def from_settings(cls) -> "CacheAnalytics":
+        return cls(
+            top_k=settings.CACHE_ANALYTICS_TOP_K,
+            lifetime_sample=settings.CACHE_ANALYTICS_LIFETIME_SAMPLE,
+            max_tenants=settings.CACHE_ANALYTICS_MAX_TENANTS,
+            flush_seconds=settings.CACHE_ANALYTICS_FLUSH_SECONDS
+        )
+
+    def _sampled(self, key: str) -> bool:
+        # Hash-based, so every worker samples the same keys on every write and lookup
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=4).digest(), "big")
+        return digest < self.lifetime_sample * 2 ** 32
+
+    def _count(
+        self,
+        table: Dict[str, List[int]],
+        cluster_table: str,
+        name: str,
+        hit: bool,
+        limit: Optional[int] = None
+    ) -> None:
+        if name not in table and limit is not None and len(table) >= limit:
+            name = OTHER
+        counts = table.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+        field = (cluster_table, f"{name}:{'hits' if hit else 'misses'}")
+        self._pending[field] = self._pending.get(field, 0) + 1
+
+    def record_lookup(self, key: str, hit: bool, tenant: Optional[str], source_lang: str, target_lang: str) -> None:
+        pair = f"{source_lang}->{target_lang}"
+        self._count(self.by_tenant, "tenant", tenant or "anonymous", hit, self.max_tenants)
+        self._count(self.by_pair, "pair", pair, hit)
+        self.hot_keys.record(key, pair)
+        if not hit and key in self._written:
+            written_at, ttl = self._written.pop(key)
+            lifetime = time.time() - written_at
+            self.lifetimes.record(lifetime)
+            if lifetime < ttl:
+                self.evicted += 1
+            else:
+                self.expired += 1
+
+    def record_write(self, key: str, size: int, ttl: int) -> None:
+        self.value_sizes.record(size)
+        if not self._sampled(key):
+            return
+        now = time.time()
+        self._written[key] = (now, ttl)
+        if len(self._written) > self.max_tracked:
+            # Keys past their TTL expired without being asked for again; then drop the oldest
+            self._written = {
+                tracked: (written_at, tracked_ttl) for tracked, (written_at, tracked_ttl) in self._written.items()
+                if written_at + tracked_ttl > now
+            }
+            if len(self._written) > self.max_tracked:
+                oldest = sorted(self._written, key=lambda tracked: self._written[tracked][0])
+                for tracked in oldest[:len(oldest) - self.max_tracked // 2]:
+                    del self._written[tracked]
+
+    def take_pending(self) -> Dict[Tuple[str, str], int]:
+        """Counts due to be added to the Redis totals, or {} if the last flush was too recent."""
+        if not self._pending or time.monotonic() - self._flushed_at < self.flush_seconds:
+            return {}
+        pending, self._pending = self._pending, {}
+        self._flushed_at = time.monotonic()
+        return pending
+
+    async def flush(self, client: Optional[Any], pending: Dict[Tuple[str, str], int]) -> None:
+        """Add `pending` to the Redis totals; kept for the next flush if Redis is unavailable."""
+        try:
+            if client is None:
+                raise ConnectionError("Redis is unavailable")
+            pipe = client.pipeline(transaction=False)
+            for (table, field), count in pending.items():
+                pipe.hincrby(CLUSTER_KEYS[table], field, count)
+            await pipe.execute()
+        except Exception as e:
+            self.flush_errors += 1
+            logger.warning("Cache analytics flush failed", extra={"error": repr(e)})
+            for field, count in pending.items():
+                self._pending[field] = self._pending.get(field, 0) + count
+
+    async def cluster_snapshot(self, client: Optional[Any]) -> Optional[Dict[str, Any]]:
+        """Service-wide hit ratios by tenant and pair, as of each worker's last flush; None without Redis."""
+        if client is None:
+            return None
+        pipe = client.pipeline(transaction=False)
+        for key in CLUSTER_KEYS.values():
+            pipe.hgetall(key)
+        try:
+            replies = await pipe.execute()
+        except Exception as e:
+            logger.warning("Cache analytics totals unavailable", extra={"error": repr(e)})
+            return None
+        snapshot = {}
+        for table, fields in zip(CLUSTER_KEYS, replies):
+            counts: Dict[str, List[int]] = {}
+            for field, count in fields.items():
+                name, kind = field.rsplit(":", 1)
+                counts.setdefault(name, [0, 0])[0 if kind == "hits" else 1] += int(count)
+            snapshot[f"hit_ratio_by_{table}"] = self._ratios(counts)
+        return snapshot
+
+    def _ratios(self, table: Dict[str, List[int]]) -> Dict[str, Dict[str, Any]]:
+        ranked = sorted(table.items(), key=lambda item: sum(item[1]), reverse=True)
+        return {
+            name: {"hits": hits, "misses": misses, "hit_ratio": round(hits / (hits + misses), 4)}
+            for name, (hits, misses) in ranked
+        }
+
+    def snapshot(self, top: Optional[int] = 20) -> Dict[str, Any]:
+        return {
+            "scope": "worker",
+            "worker_pid": os.getpid(),
+            "since": self.started_at,
+            "flush_errors": self.flush_errors,
+            "hit_ratio_by_tenant": self._ratios(self.by_tenant),
+            "hit_ratio_by_pair": self._ratios(self.by_pair),
+            "hot_keys": self.hot_keys.top(top),
+            "value_bytes": self.value_sizes.snapshot(),
+            "lifetime_seconds": {
+                **self.lifetimes.snapshot(),
+                "evicted": self.evicted,
+                "expired": self.expired,
+                "tracked_keys": len(self._written),
+            },
+        }
@@ -0,0 +1,140 @@
+"""
+Binary encoding for cached translation results.
+
+Layout: MAGIC, format version, compression id, then the body. The body is a
+UTF-8 JSON array of the known fields in a fixed order followed by a dict of
+any other fields, which drops the repeated key names and the \\u escapes
+plain JSON spends on Turkish characters. Bodies above a size threshold are
+compressed with zstd when the `zstandard` package is installed, else zlib.
+
+Entries written before this format are plain JSON; `decode` still reads them.
+Workers from before this format read only the unversioned `translation:<hash>`
+keys and cannot decode it, so values for those keys are still written as
+JSON (`binary=False`).
+"""
+import json
+import logging
+import zlib
+from typing import Any, Dict, Optional, Union
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 0xFF never occurs in UTF-8, so it cannot start a legacy JSON entry
+MAGIC = b"\xff"
+VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+FIELDS = (
+    "translated_text",
+    "source_lang",
+    "target_lang",
+    "context_applied",
+    "model",
+    "backend",
+    "profile",
+    "latency_ms",
+)
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+# What a corrupt or truncated value can raise while being decoded
+DECODE_ERRORS = (zlib.error, ValueError, TypeError, IndexError) + ((zstandard.ZstdError,) if zstandard else ())
+
+class CacheCodec:
+    def __init__(self, compression: str = "auto", min_compress_bytes: int = 256, level: int = 6):
+        if compression == "auto":
+            compression = "zstd" if zstandard is not None else "zlib"
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, using zlib for cache values")
+            compression = "zlib"
+        self.compression = compression
+        self.min_compress_bytes = min_compress_bytes
+        self.level = level
+        if compression == "zstd":
+            self._zstd_compressor = zstandard.ZstdCompressor(level=level)
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    @classmethod
+    def from_settings(cls) -> "CacheCodec":
+        return cls(
+            compression=settings.CACHE_COMPRESSION,
+            min_compress_bytes=settings.CACHE_COMPRESSION_MIN_BYTES
+        )
+
+    def _compress(self, body: bytes) -> tuple:
+        if self.compression == "none" or len(body) < self.min_compress_bytes:
+            return COMPRESSION_NONE, body
+        if self.compression == "zstd":
+            compressed, method = self._zstd_compressor.compress(body), COMPRESSION_ZSTD
+        else:
+            compressed, method = zlib.compress(body, self.level), COMPRESSION_ZLIB
+        # Short or already dense text can grow; keep whichever is smaller
+        if len(compressed) >= len(body):
+            return COMPRESSION_NONE, body
+        return method, compressed
+
+    def encode(self, value: Dict[str, Any], binary: bool = True) -> bytes:
+        if not binary:
+            return json.dumps(value).encode("utf-8")
+        extra = {k: v for k, v in value.items() if k not in FIELDS}
+        row = [value.get(field) for field in FIELDS]
+        row.append(extra)
+        body = json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        method, body = self._compress(body)
+        return MAGIC + bytes((VERSION, method)) + body
+
+    def decode(self, raw: Union[bytes, str, None]) -> Optional[Dict[str, Any]]:
+        """Decode a cached value in either format; None for a miss or an unreadable entry."""
+        if not raw:
+            return None
+        try:
+            value = self._decode(raw)
+        except DECODE_ERRORS as e:
+            # A corrupt entry is a miss; the next write replaces it
+            logger.warning("Unreadable cache value", extra={"error": repr(e)})
+            return None
+        if value is not None and not isinstance(value, dict):
+            logger.warning("Unreadable cache value", extra={"error": f"unexpected {type(value).__name__}"})
+            return None
+        return value
+
+    def _decode(self, raw: Union[bytes, str]) -> Optional[Any]:
+        if isinstance(raw, str) or not raw.startswith(MAGIC):
+            return json.loads(raw)
+        version, method = raw[1], raw[2]
+        if version != VERSION:
+            # Written by a newer release; treat as a miss rather than guess
+            logger.warning("Unknown cache value version", extra={"version": version})
+            return None
+        body = raw[3:]
+        if method == COMPRESSION_ZLIB:
+            body = zlib.decompress(body)
+        elif method == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                logger.warning("Cache value is zstd-compressed but zstandard is not installed")
+                return None
+            body = self._zstd_decompressor.decompress(body)
+        *values, extra = json.loads(body)
+        value = {field: v for field, v in zip(FIELDS, values) if v is not None}
+        value.update(extra)
+        return value
+
+class JsonCodec(CacheCodec):
+    """Writes the previous plain-JSON format, for rolling back; reads both."""
+
+    def encode(self, value: Dict[str, Any], binary: bool = True) -> str:
+        return json.dumps(value)
+
+def codec_from_settings() -> CacheCodec:
+    if settings.CACHE_VALUE_FORMAT == "json":
+        return JsonCodec(compression="none")
+    return CacheCodec.from_settings()
+
+codec = codec_from_settings()
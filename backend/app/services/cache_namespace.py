@@ -0,0 +1,142 @@
+"""
+Versioned translation cache keys.
+
+Cache keys carry a namespace derived from what produced the translation: the
+profile's model and sampling settings and its prompt templates, plus
+CACHE_NAMESPACE_SALT for changes the hash cannot see (a model alias moved
+to a new snapshot). Changing any of them starts a new namespace instead of
+serving the old version's output, without a flush.
+
+A small registry in Redis lists each profile's recent namespaces, newest
+first. On a miss in the current namespace, the previous ones are read; a hit
+there is served as stale and re-translated in the background, at no more
+than `revalidate_per_second` per worker, so the new version takes over
+gradually. Keys written before namespaces existed have the `LEGACY`
+namespace, which the first registration records as the previous one.
+
+Results carry their namespace (`namespace`, stored as `cache_namespace` in
+the translation's metadata), so hits in the tenant memory and the
+translation history, and warmed-up entries, from an earlier version are
+served stale and revalidated the same way rather than passed off as current.
+"""
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from app.core.config import settings
+from app.core.redis import with_fallback
+from app.services.batching import build_batch_messages
+from app.services.profiles import TranslationProfile, build_messages, get_profiles
+
+logger = logging.getLogger(__name__)
+
+# Unversioned keys (translation:<hash>), from before namespaces
+LEGACY = "legacy"
+REGISTRY_PREFIX = "translation:namespaces:"
+
+def namespace_for(profile: TranslationProfile, salt: str = "") -> str:
+    """Short hash of everything in `profile` that shapes its translations."""
+    sample_context = {"domain": "sample"}
+    fingerprint = {
+        "model": profile.model,
+        "temperature": profile.temperature,
+        "salt": salt,
+        "prompts": [
+            build_messages(profile, "{text}", source, target, context)
+            for source, target in (("en", "tr"), ("tr", "en"))
+            for context in (None, sample_context)
+        ],
+    }
+    if profile.name == "short":
+        # Concurrent short strings may be translated through the batch prompt
+        fingerprint["batch_prompt"] = build_batch_messages(profile, ["{text}"], "en", "tr", sample_context)
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:12]
+
+class CacheNamespaces:
+    def __init__(
+        self,
+        get_client: Callable[[], Awaitable[Any]],
+        previous: int = 1,
+        revalidate_per_second: float = 2.0,
+        salt: str = ""
+    ):
+        self.get_client = get_client
+        self.previous = previous
+        self.revalidate_per_second = revalidate_per_second
+        self.salt = salt
+        self._current: Dict[TranslationProfile, str] = {}
+        self._resolved: Dict[str, Tuple[str, ...]] = {}
+        self._tokens = max(1.0, revalidate_per_second)
+        self._refilled_at = time.monotonic()
+        self.fallback_hits = 0
+        self.revalidations = 0
+        self.revalidations_deferred = 0
+        self.registry_errors = 0
+
+    @classmethod
+    def from_settings(cls, get_client: Callable[[], Awaitable[Any]]) -> "CacheNamespaces":
+        return cls(
+            get_client,
+            previous=settings.CACHE_PREVIOUS_NAMESPACES,
+            revalidate_per_second=settings.CACHE_REVALIDATE_PER_SECOND,
+            salt=settings.CACHE_NAMESPACE_SALT
+        )
+
+    def current(self, profile: TranslationProfile) -> str:
+        namespace = self._current.get(profile)
+        if namespace is None:
+            namespace = self._current[profile] = namespace_for(profile, self.salt)
+        return namespace
+
+    async def previous_for(self, profile: TranslationProfile) -> Tuple[str, ...]:
+        """Older namespaces of the profile to fall back to, newest first."""
+        resolved = self._resolved.get(profile.name)
+        if resolved is None:
+            resolved = await self._register(profile)
+        return resolved
+
+    async def _register(self, profile: TranslationProfile) -> Tuple[str, ...]:
+        """Put the current namespace at the head of the profile's registry entry."""
+        current = self.current(profile)
+        key = REGISTRY_PREFIX + profile.name
+        client = await self.get_client()
+        try:
+            raw = await with_fallback(client, lambda cache: cache.get(key))
+            known = json.loads(raw) if raw else [LEGACY]
+            if known[0] != current:
+                known = [current] + [namespace for namespace in known if namespace != current]
+                known = known[:self.previous + 1]
+                await with_fallback(client, lambda cache: cache.set(key, json.dumps(known)))
+        except Exception as e:
+            self.registry_errors += 1
+            logger.warning("Cache namespace registry unavailable", extra={"error": repr(e)})
+            return (LEGACY,)
+        previous = tuple(namespace for namespace in known if namespace != current)
+        # While degraded the registry is only the local cache; read it again once Redis is back
+        if client is not None:
+            self._resolved[profile.name] = previous
+        return previous
+
+    def allow_revalidation(self) -> bool:
+        """Token bucket capping background re-translation of old-namespace hits."""
+        now = time.monotonic()
+        burst = max(1.0, self.revalidate_per_second)
+        self._tokens = min(burst, self._tokens + (now - self._refilled_at) * self.revalidate_per_second)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            self.revalidations += 1
+            return True
+        self.revalidations_deferred += 1
+        return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "current": {name: self.current(profile) for name, profile in get_profiles().items()},
+            "previous": {name: list(previous) for name, previous in self._resolved.items()},
+            "fallback_hits": self.fallback_hits,
+            "revalidations": self.revalidations,
+            "revalidations_deferred": self.revalidations_deferred,
+            "registry_errors": self.registry_errors,
+        }
@@ -0,0 +1,169 @@
+"""
+Expiry and admission rules for the translation cache.
+
+Entries carry a soft expiry (`fresh_until`) next to Redis' hard TTL. Past
+the soft expiry an entry is stale: it is still served, and one background
+refresh replaces it. A key seen once gets a short TTL; repeated keys get at
+least the base TTL, doubling with each further recent request, so hot
+strings stay fresh for days while one-off strings leave within hours.
+Large entries are only admitted once their key has been asked for again.
+The sketch counts requests per worker, so a large key it has seen once is
+also counted in Redis (`<key>:seen`); its second request on any worker
+admits it.
+"""
+import time
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+
+# Metadata stored alongside the cached result, stripped before it is returned
+FRESH_UNTIL = "fresh_until"
+# Set on entries seeded from the opposite direction rather than translated
+DERIVED = "derived"
+
+class FrequencySketch:
+    """
+    Approximate per-key request counts for this worker.
+
+    Counts are halved every `sample_size` records so the frequency reflects
+    recent traffic. When the table grows past `max_entries`, keys seen only
+    once are dropped first, then everything is halved.
+    """
+
+    def __init__(self, max_entries: int = 50000, sample_size: int = 500000):
+        self.max_entries = max_entries
+        self.sample_size = sample_size
+        self._counts: Dict[str, int] = {}
+        self._records = 0
+        self.resets = 0
+
+    def record(self, key: str) -> int:
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        self._records += 1
+        if self._records >= self.sample_size:
+            self._age()
+        elif len(self._counts) > self.max_entries:
+            self._counts = {key: count for key, count in self._counts.items() if count > 1}
+            if len(self._counts) > self.max_entries // 2:
+                self._age()
+        return count
+
+    def estimate(self, key: str) -> int:
+        return self._counts.get(key, 0)
+
+    def _age(self) -> None:
+        self._counts = {key: count // 2 for key, count in self._counts.items() if count > 1}
+        self._records = 0
+        self.resets += 1
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+class CachePolicy:
+    def __init__(
+        self,
+        min_ttl: int = 21600,
+        base_ttl: int = 86400,
+        max_ttl: int = 604800,
+        stale_ratio: float = 1.0,
+        admit_min_hits: int = 2,
+        admit_always_bytes: int = 512,
+        max_entry_bytes: int = 65536,
+        sketch: Optional[FrequencySketch] = None
+    ):
+        self.min_ttl = min_ttl
+        self.base_ttl = base_ttl
+        self.max_ttl = max_ttl
+        self.stale_ratio = stale_ratio
+        self.admit_min_hits = admit_min_hits
+        self.admit_always_bytes = admit_always_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.sketch = sketch or FrequencySketch()
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        # Reverse-pair entries, counted apart from real translations
+        self.derived_hits = 0
+        self.derived_ignored = 0
+        self.derived_written = 0
+
+    @classmethod
+    def from_settings(cls) -> "CachePolicy":
+        return cls(
+            min_ttl=settings.CACHE_MIN_TTL_SECONDS,
+            base_ttl=settings.CACHE_TTL_SECONDS,
+            max_ttl=settings.CACHE_MAX_TTL_SECONDS,
+            stale_ratio=settings.CACHE_STALE_RATIO,
+            admit_min_hits=settings.CACHE_ADMIT_MIN_HITS,
+            admit_always_bytes=settings.CACHE_ADMIT_ALWAYS_BYTES,
+            max_entry_bytes=settings.CACHE_MAX_ENTRY_BYTES
+        )
+
+    def record_access(self, key: str) -> int:
+        return self.sketch.record(key)
+
+    def ttl(self, key: str) -> Tuple[int, int]:
+        """(fresh, hard) TTL in seconds for the key, from its recent request count."""
+        return self.ttl_for(self.sketch.estimate(key))
+
+    def ttl_for(self, frequency: int) -> Tuple[int, int]:
+        if frequency <= 1:
+            fresh = self.min_ttl
+        else:
+            fresh = min(self.max_ttl, self.base_ttl * 2 ** min(frequency - 2, 32))
+        return fresh, int(fresh * (1 + self.stale_ratio))
+
+    def needs_shared_count(self, key: str, size: int) -> bool:
+        """Whether admitting the entry depends on requests this worker has not seen."""
+        return (
+            self.admit_always_bytes < size <= self.max_entry_bytes
+            and self.sketch.estimate(key) < self.admit_min_hits
+        )
+
+    def admit(self, key: str, size: int, shared_count: int = 0) -> bool:
+        """
+        Whether an entry of `size` bytes is worth caching.
+
+        `shared_count` is the key's request count across all workers, when known.
+        """
+        if size > self.max_entry_bytes:
+            reason = "oversized"
+        elif size > self.admit_always_bytes and max(self.sketch.estimate(key), shared_count) < self.admit_min_hits:
+            reason = "one_off"
+        else:
+            self.admitted += 1
+            return True
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return False
+
+    def stamp(self, value: Dict[str, Any], fresh_ttl: int) -> Dict[str, Any]:
+        return {**value, FRESH_UNTIL: int(time.time()) + fresh_ttl}
+
+    def is_stale(self, value: Dict[str, Any]) -> bool:
+        # Entries written before soft expiry existed have no stamp and count as fresh
+        fresh_until = value.get(FRESH_UNTIL)
+        return fresh_until is not None and fresh_until <= time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        hits = self.fresh_hits + self.stale_hits
+        lookups = hits + self.derived_hits + self.misses
+        return {
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "derived_hit_ratio": round(self.derived_hits / lookups, 4) if lookups else None,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "derived_hits": self.derived_hits,
+            "derived_ignored": self.derived_ignored,
+            "derived_written": self.derived_written,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "tracked_keys": len(self.sketch),
+            "sketch_resets": self.sketch.resets,
+        }
@@ -0,0 +1,187 @@
+"""
+Rebuild translation cache entries from the `translations` table.
+
+After a Redis flush, failover or cache-format change the cache starts cold.
+The warmer streams the most requested (text, language pair, context)
+combinations out of Postgres with a server-side cursor, builds the cache
+entry from the stored translation without calling upstream, and writes it
+with pipelined SET NX batches at no more than `max_per_second` entries.
+Entries already in Redis are left alone. A translation goes under the cache
+namespace of the model and prompt that produced it (`cache_namespace` in its
+metadata, legacy if unrecorded), so output of an earlier version is served
+stale and revalidated; rows from namespaces no longer registered are skipped.
+"""
+import asyncio
+import itertools
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import Text, cast, func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.models import Translation
+from app.services.cache_codec import codec
+from app.services.cache_namespace import LEGACY
+from app.services.profiles import get_profiles, select_profile
+from app.services.translation import TranslationService
+from app.services.translation_memory import history_result
+
+logger = logging.getLogger(__name__)
+
+def popular_translations(
+    db: Session,
+    limit: int,
+    days: Optional[int] = None,
+    batch_size: int = 500
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Yield (source_text, translated_text, source_lang, target_lang, context, meta_data, hits),
+    most requested first, using the latest stored translation of each combination.
+
+    Requests are grouped by `content_hash`, so texts that differ only in
+    formatting (and share a cache key) count as one. Rows from before the
+    hash existed fall back to the raw request columns.
+    """
+    hits = func.count(Translation.id).label("hits")
+    request = func.coalesce(
+        Translation.content_hash,
+        Translation.source_text + ":" + Translation.source_lang + ":" + Translation.target_lang
+        + ":" + func.coalesce(cast(Translation.context, Text), "")
+    )
+    groups = db.query(func.max(Translation.id).label("id"), hits)
+    if days:
+        groups = groups.filter(Translation.created_at >= datetime.utcnow() - timedelta(days=days))
+    latest = (
+        groups
+        .group_by(request)
+        .order_by(hits.desc())
+        .limit(limit)
+        .subquery()
+    )
+    return iter(
+        db.query(
+            Translation.source_text,
+            Translation.translated_text,
+            Translation.source_lang,
+            Translation.target_lang,
+            Translation.context,
+            Translation.meta_data,
+            latest.c.hits
+        )
+        .join(latest, Translation.id == latest.c.id)
+        .order_by(latest.c.hits.desc())
+        # Server-side cursor: rows arrive in batches instead of all at once
+        .yield_per(batch_size)
+    )
+
+class CacheWarmer:
+    def __init__(self, service: TranslationService, batch_size: int = 500, max_per_second: float = 2000.0):
+        self.service = service
+        self.batch_size = batch_size
+        self.max_per_second = max_per_second
+        self.running = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.scanned = 0
+        self.written = 0
+        self.already_cached = 0
+        self.skipped = 0
+        self.last_error: Optional[str] = None
+        # Profile name -> namespaces still registered besides the current one
+        self._previous: Dict[str, Tuple[str, ...]] = {}
+
+    @classmethod
+    def from_settings(cls, service: TranslationService) -> "CacheWarmer":
+        return cls(
+            service,
+            batch_size=settings.CACHE_WARMUP_BATCH_SIZE,
+            max_per_second=settings.CACHE_WARMUP_MAX_PER_SECOND
+        )
+
+    def entry(self, row: Tuple[Any, ...]) -> Optional[Tuple[str, bytes, int]]:
+        """(cache key, payload, hard TTL) for a history row, as `TranslationService` would write it."""
+        source_text, translated_text, source_lang, target_lang, context, meta_data, hits = row
+        meta_data = meta_data or {}
+        # Tenant-scoped answers never go into the shared cache
+        if not translated_text or meta_data.get("derived") or meta_data.get("tenant_memory"):
+            return None
+        text, context, _ = self.service._canonicalize(source_text, context)
+        result = history_result(translated_text, source_lang, target_lang, context, meta_data)
+        profile = select_profile(text, context)
+        namespace = result["namespace"] or LEGACY
+        if namespace != self.service.namespaces.current(profile) and namespace not in self._previous.get(profile.name, ()):
+            return None
+        policy = self.service.cache_policy
+        fresh_ttl, hard_ttl = policy.ttl_for(hits)
+        # Unversioned keys are also read by workers that predate the binary format
+        payload = codec.encode(policy.stamp(result, fresh_ttl), binary=namespace != LEGACY)
+        if len(payload) > policy.max_entry_bytes:
+            return None
+        key = self.service._generate_cache_key(text, source_lang, target_lang, context or {}, namespace)
+        return key, payload, hard_ttl
+
+    async def _write(self, client: Any, entries: List[Tuple[str, bytes, int]]) -> None:
+        pipe = client.pipeline(transaction=False)
+        for key, payload, ttl in entries:
+            pipe.set(key, payload, ex=ttl, nx=True)
+        for stored in await pipe.execute():
+            if stored:
+                self.written += 1
+            else:
+                self.already_cached += 1
+
+    async def run(self, db: Session, limit: int = 10000, days: Optional[int] = None) -> Dict[str, Any]:
+        """Warm the cache from the `limit` most requested translations; one run at a time."""
+        if self.running:
+            return self.snapshot()
+        self.running = True
+        self.started_at, self.finished_at = time.time(), None
+        self.scanned = self.written = self.already_cached = self.skipped = 0
+        self.last_error = None
+        try:
+            client = await self.service._get_redis()
+            if client is None:
+                raise ConnectionError("Redis is unavailable")
+            self._previous = {
+                name: await self.service.namespaces.previous_for(profile) for name, profile in get_profiles().items()
+            }
+            rows = popular_translations(db, limit, days=days, batch_size=self.batch_size)
+            started = time.monotonic()
+            while True:
+                # Fetching blocks on the database, so keep it off the event loop
+                batch = await asyncio.to_thread(lambda: list(itertools.islice(rows, self.batch_size)))
+                if not batch:
+                    break
+                self.scanned += len(batch)
+                entries = [entry for entry in map(self.entry, batch) if entry is not None]
+                self.skipped += len(batch) - len(entries)
+                if entries:
+                    await self._write(client, entries)
+                # Throughput cap: stay at or under max_per_second entries
+                ahead = self.scanned / self.max_per_second - (time.monotonic() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+        except Exception as e:
+            self.last_error = repr(e)
+            logger.warning("Cache warm-up failed", extra={"error": self.last_error})
+        finally:
+            self.running = False
+            self.finished_at = time.time()
+        logger.info("Cache warm-up finished", extra=self.snapshot())
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        return {
+            "running": self.running,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": round(end - self.started_at, 2) if self.started_at else None,
+            "scanned": self.scanned,
+            "written": self.written,
+            "already_cached": self.already_cached,
+            "skipped": self.skipped,
+            "max_per_second": self.max_per_second,
+            "last_error": self.last_error,
+        }
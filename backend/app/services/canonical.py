@@ -0,0 +1,86 @@
+"""
+Canonical form of translation requests, used for cache keys and upstream calls.
+
+Requests that differ only in Unicode normalization form, line-ending style,
+non-breaking or repeated spaces between words, trailing spaces, or surrounding
+whitespace translate the same, so they should share one cache entry. The
+canonical text is also what is sent upstream, so anything that shapes the
+output is kept: line breaks, blank lines and the indentation of each line
+(code, lists, verse). The leading and trailing whitespace and the line-ending
+style of the original are recorded in a `Layout` and put back on the
+translated text.
+"""
+import hashlib
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Horizontal whitespace, including NBSP, thin and ideographic spaces
+_SPACES = re.compile(r"[^\S\n]+")
+_INDENT = re.compile(r"[^\S\n]*")
+
+@dataclass(frozen=True)
+class Layout:
+    leading: str = ""
+    trailing: str = ""
+    newline: str = "\n"
+
+    def restore(self, text: str) -> str:
+        if self.newline != "\n":
+            text = text.replace("\n", self.newline)
+        return f"{self.leading}{text}{self.trailing}"
+
+def _canonicalize_line(line: str) -> str:
+    """Collapse the spaces between words; the indentation is kept as written."""
+    indent = _INDENT.match(line).group()
+    body = _SPACES.sub(" ", line[len(indent):]).rstrip()
+    return indent + body if body else ""
+
+def canonicalize_text(text: str) -> Tuple[str, Layout]:
+    """Return the canonical text and the layout needed to restore the original's edges."""
+    newline = "\r\n" if "\r\n" in text else "\n"
+    stripped = text.strip()
+    if not stripped:
+        return "", Layout(leading=text, newline=newline)
+    leading = text[:len(text) - len(text.lstrip())]
+    trailing = text[len(text.rstrip()):]
+
+    canonical = unicodedata.normalize("NFC", text)
+    canonical = canonical.replace("\r\n", "\n").replace("\r", "\n")
+    canonical = "\n".join(_canonicalize_line(line) for line in canonical.split("\n")).strip()
+    return canonical, Layout(leading=leading, trailing=trailing, newline=newline)
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == {} or value == []
+
+def canonicalize_context(
+    context: Optional[Dict[str, Any]],
+    ignored_keys: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """Drop empty values and keys that do not affect the translation, such as request ids."""
+    if not context:
+        return {}
+    ignored = set(ignored_keys)
+    return {
+        key: unicodedata.normalize("NFC", value) if isinstance(value, str) else value
+        for key, value in context.items()
+        if key not in ignored and not _is_empty(value)
+    }
+
+def request_hash(text: str, source_lang: str, target_lang: str, context: Dict[str, Any]) -> str:
+    """SHA-256 of an already canonical request; the cache key and the translations.content_hash."""
+    key_components = f"{text}:{source_lang}:{target_lang}:{json.dumps(context, sort_keys=True)}"
+    return hashlib.sha256(key_components.encode()).hexdigest()
+
+def content_hash(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    context: Optional[Dict[str, Any]],
+    ignored_keys: Iterable[str] = ()
+) -> str:
+    """Hash of the canonical form of a request as received."""
+    canonical, _ = canonicalize_text(text)
+    return request_hash(canonical, source_lang, target_lang, canonicalize_context(context, ignored_keys))
@@ -0,0 +1,151 @@
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose breaker is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit for {name} is open, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over the last `window_size` upstream calls.
+
+    The breaker opens when, with at least `min_calls` outcomes recorded,
+    the failure rate reaches `failure_rate` or the share of calls slower than
+    `slow_call_ms` reaches `slow_call_rate`. While open every call fails fast
+    with CircuitOpenError. After `open_seconds` up to `half_open_calls` probes
+    are let through: if all succeed quickly the breaker closes, otherwise it
+    opens again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_ms: float = 10000.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 3
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        # (failed, slow) per call
+        self._outcomes: deque = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @classmethod
+    def from_settings(cls, name: str) -> "CircuitBreaker":
+        return cls(
+            name,
+            window_size=settings.BREAKER_WINDOW_SIZE,
+            min_calls=settings.BREAKER_MIN_CALLS,
+            failure_rate=settings.BREAKER_FAILURE_RATE,
+            slow_call_ms=settings.BREAKER_SLOW_CALL_MS,
+            slow_call_rate=settings.BREAKER_SLOW_CALL_RATE,
+            open_seconds=settings.BREAKER_OPEN_SECONDS,
+            half_open_calls=settings.BREAKER_HALF_OPEN_CALLS
+        )
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("Circuit breaker state changed", extra={
+            "breaker": self.name,
+            "from_state": self.state,
+            "to_state": state
+        })
+        self.state = state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+        if state == CLOSED:
+            self._outcomes.clear()
+
+    def before_call(self) -> None:
+        """Admit a call or raise CircuitOpenError; pair with record_success/record_failure."""
+        if self.state == OPEN:
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed < self.open_seconds:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.open_seconds - elapsed)
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight + self._probe_successes >= self.half_open_calls:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self._probes_in_flight += 1
+
+    def record_success(self, latency_ms: float) -> None:
+        slow = latency_ms >= self.slow_call_ms
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if slow:
+                self._transition(OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._transition(CLOSED)
+            return
+        self._record(False, slow)
+
+    def record_failure(self) -> None:
+        if self.state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+        self._record(True, False)
+
+    def release(self) -> None:
+        """A call ended without an upstream verdict (cancelled, or a client error)."""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        self._outcomes.append((failed, slow))
+        if self.state != CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        count = len(self._outcomes)
+        failures = sum(1 for f, _ in self._outcomes if f)
+        slow_calls = sum(1 for _, s in self._outcomes if s)
+        if failures / count >= self.failure_rate or slow_calls / count >= self.slow_call_rate:
+            self._transition(OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        count = len(self._outcomes)
+        retry_in: Optional[float] = None
+        if self.state == OPEN:
+            retry_in = round(max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)), 1)
+        return {
+            "state": self.state,
+            "window_calls": count,
+            "failure_rate": round(sum(1 for f, _ in self._outcomes if f) / count, 3) if count else 0.0,
+            "slow_call_rate": round(sum(1 for _, s in self._outcomes if s) / count, 3) if count else 0.0,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+            "retry_in_seconds": retry_in,
+        }
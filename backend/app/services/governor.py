@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.core.config import settings
+from app.core.deadline import bounded
+from app.core.exceptions import DeadlineExceededError, UpstreamCapacityError
+from app.core.redis import REDIS_OUTAGE_ERRORS, get_redis_or_none, redis_health
+
+logger = logging.getLogger(__name__)
+
+# Words, numbers and single punctuation marks; BPE splits long words into ~4-char pieces
+_TOKEN_PIECE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# Chat format overhead per message and for priming the reply
+_TOKENS_PER_MESSAGE = 4
+_TOKENS_PER_REPLY = 3
+
+def estimate_text_tokens(text: str) -> int:
+    return sum((len(piece) + 3) // 4 for piece in _TOKEN_PIECE.findall(text))
+
+def estimate_prompt_tokens(messages: List[Dict[str, str]]) -> int:
+    """Approximate prompt tokens for a chat request without loading a tokenizer."""
+    return _TOKENS_PER_REPLY + sum(
+        _TOKENS_PER_MESSAGE + estimate_text_tokens(m.get("content") or "") for m in messages
+    )
+
+# KEYS: rpm bucket, tpm bucket
+# ARGV: rpm capacity, tpm capacity, requests to take, tokens to take
+# Returns 0 when both were taken, otherwise milliseconds until they would be.
+_TAKE_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local wait = 0
+local levels = {}
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[i])
+    local cost = tonumber(ARGV[i + 2])
+    local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now_ms
+    level = math.min(capacity, level + (now_ms - ts) * capacity / 60000)
+    levels[i] = level
+    if level < cost then
+        wait = math.max(wait, math.ceil((cost - level) * 60000 / capacity))
+    end
+end
+for i = 1, 2 do
+    local level = levels[i]
+    if wait == 0 then
+        level = level - tonumber(ARGV[i + 2])
+    end
+    redis.call('HSET', KEYS[i], 'level', level, 'ts', now_ms)
+    redis.call('PEXPIRE', KEYS[i], 120000)
+end
+return wait
+"""
+
+# KEYS: tpm bucket; ARGV: tpm capacity, tokens to return (negative to charge more)
+_ADJUST_SCRIPT = """
+local level = tonumber(redis.call('HGET', KEYS[1], 'level'))
+if level == nil then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'level', math.min(tonumber(ARGV[1]), level + tonumber(ARGV[2])))
+return 1
+"""
+
+class LocalBuckets:
+    """In-process RPM/TPM buckets, for a single worker or when Redis is unavailable."""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.capacity = (rpm, tpm)
+        self._levels = [rpm, tpm]
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        for i, capacity in enumerate(self.capacity):
+            self._levels[i] = min(capacity, self._levels[i] + elapsed * capacity / 60)
+
+    async def take(self, requests: float, tokens: float) -> float:
+        self._refill()
+        wait = 0.0
+        for level, capacity, cost in zip(self._levels, self.capacity, (requests, tokens)):
+            if level < cost:
+                wait = max(wait, (cost - level) * 60 / capacity)
+        if wait == 0:
+            self._levels[0] -= requests
+            self._levels[1] -= tokens
+        return wait
+
+    async def adjust(self, tokens: float) -> None:
+        self._refill()
+        self._levels[1] = min(self.capacity[1], self._levels[1] + tokens)
+
+class RedisBuckets:
+    """
+    RPM/TPM buckets shared by every worker and pod through Redis.
+
+    Refill and take happen in one Lua script using the Redis clock, so
+    concurrent callers cannot overdraw a bucket and pods need not agree on time.
+    """
+
+    def __init__(self, get_redis: Callable[[], Awaitable[Any]], scope: str, rpm: float, tpm: float):
+        self._get_redis = get_redis
+        self.keys = [f"governor:{scope}:rpm", f"governor:{scope}:tpm"]
+        self.capacity = (rpm, tpm)
+
+    async def _eval(self, script: str, keys: List[str], *args: Any) -> Any:
+        redis = await self._get_redis()
+        if redis is None:
+            raise ConnectionError("Redis is degraded")
+        try:
+            return await bounded(redis.eval(script, len(keys), *keys, *args))
+        except REDIS_OUTAGE_ERRORS as e:
+            redis_health.mark_down(e)
+            raise
+
+    async def take(self, requests: float, tokens: float) -> float:
+        wait_ms = await self._eval(_TAKE_SCRIPT, self.keys, *self.capacity, requests, tokens)
+        return int(wait_ms) / 1000
+
+    async def adjust(self, tokens: float) -> None:
+        await self._eval(_ADJUST_SCRIPT, self.keys[1:], self.capacity[1], tokens)
+
+@dataclass
+class Reservation:
+    estimated_tokens: int
+
+class GovernorStats:
+    def __init__(self):
+        self.admitted = 0
+        self.delayed = 0
+        self.shed = 0
+        self.wait_ms = 0.0
+        self.estimated_tokens = 0
+        self.actual_tokens = 0
+        self.store_errors = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "delayed": self.delayed,
+            "shed": self.shed,
+            "wait_ms_total": round(self.wait_ms, 1),
+            "estimated_tokens": self.estimated_tokens,
+            "actual_tokens": self.actual_tokens,
+            "estimate_ratio": (
+                round(self.estimated_tokens / self.actual_tokens, 3) if self.actual_tokens else None
+            ),
+            "store_errors": self.store_errors,
+        }
+
+class TokenGovernor:
+    """
+    Keep upstream traffic under the provider's requests- and tokens-per-minute limits.
+
+    Before a call, the prompt is estimated locally and prompt plus
+    `max_tokens` is taken from the buckets (the provider counts
+    `max_tokens` against TPM too). If the buckets are short the call waits,
+    or is shed with UpstreamCapacityError when the wait would exceed
+    `max_wait` or the request's deadline. After the call the reservation is
+    reconciled with the response's usage, so the buckets track what the
+    provider actually charged.
+
+    If the bucket store fails, `fallback` buckets (a per-worker share of
+    the limits) are used instead; without a fallback the governor fails
+    open. An unreachable Redis should not stop translations the provider
+    would still accept.
+    """
+
+    def __init__(self, buckets: Any, max_wait: float = 5.0, fallback: Optional[Any] = None):
+        self.buckets = buckets
+        self.max_wait = max_wait
+        self.fallback = fallback
+        self.stats = GovernorStats()
+
+    async def acquire(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        deadline: Optional[float] = None
+    ) -> Reservation:
+        # A request larger than the whole bucket could never be admitted
+        estimated = int(min(estimate_prompt_tokens(messages) + max_tokens, self.buckets.capacity[1]))
+        waited = 0.0
+        while True:
+            try:
+                wait = await self.buckets.take(1, estimated)
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                self.stats.store_errors += 1
+                logger.warning("Token governor store unavailable", extra={"error": str(e)})
+                wait = await self.fallback.take(1, estimated) if self.fallback is not None else 0.0
+            if wait <= 0:
+                break
+            remaining = self.max_wait - waited
+            if deadline is not None:
+                remaining = min(remaining, deadline - time.monotonic())
+            if wait > remaining:
+                self.stats.shed += 1
+                raise UpstreamCapacityError(retry_after=wait)
+            if waited == 0:
+                self.stats.delayed += 1
+            await asyncio.sleep(wait)
+            waited += wait
+
+        self.stats.admitted += 1
+        self.stats.wait_ms += waited * 1000
+        self.stats.estimated_tokens += estimated
+        return Reservation(estimated_tokens=estimated)
+
+    async def reconcile(self, reservation: Reservation, actual_tokens: int) -> None:
+        """Return unused tokens to the bucket, or charge the shortfall."""
+        self.stats.actual_tokens += actual_tokens
+        await self._adjust(reservation.estimated_tokens - actual_tokens)
+
+    async def release(self, reservation: Reservation) -> None:
+        """Refund the tokens of a call that never reached the provider."""
+        await self._adjust(reservation.estimated_tokens)
+
+    async def _adjust(self, tokens: int) -> None:
+        if tokens == 0:
+            return
+        try:
+            await self.buckets.adjust(tokens)
+        except Exception as e:
+            self.stats.store_errors += 1
+            logger.warning("Token governor store unavailable", extra={"error": str(e)})
+            if self.fallback is not None:
+                await self.fallback.adjust(tokens)
+
+def governor_from_settings(scope: str, rpm: int, tpm: int) -> Optional[TokenGovernor]:
+    """A Redis-backed governor for `scope`, or None when either limit is disabled."""
+    if rpm <= 0 or tpm <= 0:
+        return None
+    headroom = settings.GOVERNOR_HEADROOM
+    share = headroom / settings.RATE_LIMIT_DEGRADED_DIVISOR
+    return TokenGovernor(
+        RedisBuckets(get_redis_or_none, scope, rpm * headroom, tpm * headroom),
+        max_wait=settings.GOVERNOR_MAX_WAIT_SECONDS,
+        fallback=LocalBuckets(rpm * share, tpm * share)
+    )
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from app.core.config import settings
+from app.services.retry import RetryBudget
+
+T = TypeVar("T")
+
+class Hedger:
+    """
+    Send a duplicate of a slow idempotent call and keep whichever answers first.
+
+    The hedge goes out once the primary has run longer than the recent p95
+    latency (never sooner than `min_delay_ms`), so only the slowest ~5% of
+    calls are duplicated. Hedges also draw from a budget so they stay a
+    bounded share of upstream traffic. The losing call is cancelled.
+    """
+
+    def __init__(
+        self,
+        min_delay_ms: float = 100.0,
+        min_samples: int = 20,
+        window: int = 200,
+        budget: Optional[RetryBudget] = None
+    ):
+        self.min_delay_ms = min_delay_ms
+        self.min_samples = min_samples
+        self._latencies: deque = deque(maxlen=window)
+        self.budget = budget or RetryBudget(ratio=0.1, min_per_second=0.0, max_tokens=5.0)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.skipped_budget = 0
+
+    @classmethod
+    def from_settings(cls) -> "Hedger":
+        return cls(
+            min_delay_ms=settings.HEDGE_MIN_DELAY_MS,
+            min_samples=settings.HEDGE_MIN_SAMPLES,
+            budget=RetryBudget(ratio=settings.HEDGE_MAX_RATIO, min_per_second=0.0, max_tokens=5.0)
+        )
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little history."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(p95, self.min_delay_ms) / 1000
+
+    async def run(self, call: Callable[[], Awaitable[T]], deadline: Optional[float] = None) -> T:
+        self.calls += 1
+        self.budget.deposit()
+        start = time.perf_counter()
+        delay = self.delay()
+        primary = asyncio.ensure_future(call())
+        pending = {primary}
+        try:
+            if delay is not None and (deadline is None or time.monotonic() + delay < deadline):
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    if self.budget.try_withdraw():
+                        self.hedged += 1
+                        pending.add(asyncio.ensure_future(call()))
+                    else:
+                        self.skipped_budget += 1
+
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        self._latencies.append((time.perf_counter() - start) * 1000)
+                        return task.result()
+                    if first_error is None or task is primary:
+                        first_error = task.exception()
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        delay = self.delay()
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "skipped_budget": self.skipped_budget,
+            "hedge_delay_ms": round(delay * 1000, 1) if delay is not None else None,
+        }
@@ -0,0 +1,128 @@
+import json
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+
+# Markup, placeholders or multiple paragraphs need the full prompt to survive translation
+_STRUCTURE_PATTERN = re.compile(r"<[a-zA-Z/][^>]*>|\{\{?\s*\w+\s*\}?\}|%\(?\w*\)?[sd]|\n\s*\n|^\s*[-*#]\s", re.MULTILINE)
+
+@dataclass(frozen=True)
+class TranslationProfile:
+    """Model and parameters used for one class of translation request."""
+    name: str
+    model: str
+    max_tokens: int
+    temperature: float
+    concise_prompt: bool
+    hedge: bool = False
+
+def _direction(source_lang: str) -> str:
+    return "Turkish to English" if source_lang == "tr" else "English to Turkish"
+
+def get_profiles() -> Dict[str, TranslationProfile]:
+    return {
+        "short": TranslationProfile(
+            name="short",
+            model=settings.TRANSLATION_MODEL_SHORT or settings.OPENAI_MODEL,
+            max_tokens=settings.TRANSLATION_MAX_TOKENS_SHORT,
+            temperature=0.2,
+            concise_prompt=True,
+            hedge=True  # cheap and idempotent, so a duplicate call is affordable
+        ),
+        "standard": TranslationProfile(
+            name="standard",
+            model=settings.TRANSLATION_MODEL_STANDARD or settings.OPENAI_MODEL,
+            max_tokens=settings.TRANSLATION_MAX_TOKENS_STANDARD,
+            temperature=0.3,
+            concise_prompt=False
+        ),
+        "long": TranslationProfile(
+            name="long",
+            model=settings.TRANSLATION_MODEL_LONG or settings.OPENAI_MODEL,
+            max_tokens=settings.TRANSLATION_MAX_TOKENS_LONG,
+            temperature=0.3,
+            concise_prompt=False
+        ),
+    }
+
+def classify(text: str, context: Optional[Dict[str, Any]]) -> str:
+    """
+    Classify a request as 'short', 'standard' or 'long'.
+
+    Short means a single-line string under SHORT_TEXT_MAX_CHARS with no
+    markup and no compliance rules in its context; that is the bulk of our
+    UI-string traffic. Structured text is never short.
+    """
+    stripped = text.strip()
+    structured = bool(_STRUCTURE_PATTERN.search(stripped))
+    needs_compliance = bool(context and "compliance_rules" in context)
+    if len(stripped) >= settings.LONG_TEXT_MIN_CHARS:
+        return "long"
+    if (
+        len(stripped) <= settings.SHORT_TEXT_MAX_CHARS
+        and "\n" not in stripped
+        and not structured
+        and not needs_compliance
+    ):
+        return "short"
+    return "standard"
+
+def select_profile(text: str, context: Optional[Dict[str, Any]]) -> TranslationProfile:
+    return get_profiles()[classify(text, context)]
+
+def build_messages(
+    profile: TranslationProfile,
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    context: Optional[Dict[str, Any]]
+) -> List[Dict[str, str]]:
+    """Build the chat messages for a translation under the given profile."""
+    if profile.concise_prompt:
+        system_message = (
+            f"Translate short UI text from {_direction(source_lang)}. "
+            "Reply with the translation only."
+        )
+    else:
+        system_message = (
+            "You are an expert translator and cultural adaptation specialist for "
+            f"{_direction(source_lang)} content. "
+            "Consider cultural nuances, idioms, and compliance requirements in your translations."
+        )
+
+    user_message = f"Translate the following text from {source_lang} to {target_lang}:\n\n{text}"
+    if context:
+        if profile.concise_prompt:
+            user_message += f"\n\nConsider this context:\n{json.dumps(context, separators=(',', ':'))}"
+        else:
+            user_message += f"\n\nConsider this context:\n{json.dumps(context, indent=2)}"
+
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_message}
+    ]
+
+class ProfileStats:
+    """Request counts and recent upstream latency per profile."""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, profile: str, latency_ms: float) -> None:
+        self._counts[profile] = self._counts.get(profile, 0) + 1
+        self._samples.setdefault(profile, deque(maxlen=self.window)).append(latency_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for profile, samples in self._samples.items():
+            ordered = sorted(samples)
+            result[profile] = {
+                "requests": self._counts[profile],
+                "p50_ms": round(ordered[len(ordered) // 2], 2),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            }
+        return result
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import random
+import sys
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from app.core.config import settings
+from app.core.exceptions import CustomException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient upstream failures: throttling, 5xx, timeouts and dropped connections."""
+    if isinstance(error, CustomException):
+        # Our own decisions (e.g. the token governor shedding load), not upstream failures
+        return False
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    # Only check SDK errors if the SDK is loaded; otherwise none can have been raised
+    openai = sys.modules.get("openai")
+    return openai is not None and isinstance(error, openai.APIConnectionError)
+
+def never_sent(error: BaseException) -> bool:
+    """
+    Whether the call failed before the request reached the provider.
+
+    Only failures to connect qualify. A 429, a 5xx or a read timeout means the
+    provider received the request and has counted it.
+    """
+    httpx = sys.modules.get("httpx")
+    connect_errors = (ConnectionRefusedError,) + ((httpx.ConnectError, httpx.ConnectTimeout) if httpx else ())
+    # SDK errors wrap the transport error that caused them
+    seen = 0
+    while error is not None and seen < 5:
+        if isinstance(error, connect_errors):
+            return True
+        error = error.__cause__ or error.__context__
+        seen += 1
+    return False
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the upstream asked us to wait, from Retry-After or retry-after-ms."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RetryBudget:
+    """
+    Cap retries at a fraction of first attempts, so retries can't amplify an outage.
+
+    Every first attempt deposits `ratio` tokens and every retry withdraws one.
+    `min_per_second` tokens trickle in regardless, so a quiet process can
+    still retry the occasional failure. The balance is capped at `max_tokens`.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, max_tokens: float):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated_at) * self.min_per_second)
+        self._updated_at = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def deposit(self) -> None:
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+class RetryPolicy:
+    """
+    Retry transient upstream failures with full-jitter exponential backoff.
+
+    The wait is the larger of the jittered backoff and the upstream's
+    Retry-After. A retry is only started if the retry budget allows it and
+    the wait plus an expected attempt still fits before the deadline.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.25,
+        max_delay: float = 4.0,
+        budget: Optional[RetryBudget] = None,
+        rng: Optional[random.Random] = None
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget(ratio=0.1, min_per_second=1.0, max_tokens=10.0)
+        self._rng = rng or random.Random()
+        self.calls = 0
+        self.retries = 0
+        self.recovered = 0
+        self.skipped: Dict[str, int] = {"budget": 0, "deadline": 0, "attempts": 0}
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        return cls(
+            max_attempts=settings.RETRY_MAX_ATTEMPTS,
+            base_delay=settings.RETRY_BASE_DELAY_SECONDS,
+            max_delay=settings.RETRY_MAX_DELAY_SECONDS,
+            budget=RetryBudget(
+                ratio=settings.RETRY_BUDGET_RATIO,
+                min_per_second=settings.RETRY_BUDGET_MIN_PER_SECOND,
+                max_tokens=settings.RETRY_BUDGET_MAX_TOKENS
+            )
+        )
+
+    def backoff(self, retry_number: int) -> float:
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry_number))
+
+    def _skip_reason(
+        self,
+        attempt: int,
+        delay: float,
+        deadline: Optional[float],
+        expected_attempt: float
+    ) -> Optional[str]:
+        if attempt >= self.max_attempts:
+            return "attempts"
+        if deadline is not None and time.monotonic() + delay + expected_attempt > deadline:
+            return "deadline"
+        if not self.budget.try_withdraw():
+            return "budget"
+        return None
+
+    async def call(
+        self,
+        func: Callable[[], Awaitable[T]],
+        deadline: Optional[float] = None,
+        expected_attempt: float = 0.0
+    ) -> T:
+        """
+        Await `func()`, retrying transient failures.
+
+        `deadline` is a `time.monotonic()` timestamp; `expected_attempt` is
+        how long one attempt usually takes, in seconds.
+        """
+        self.calls += 1
+        self.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                result = await func()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                delay = max(self.backoff(attempt - 1), retry_after(e) or 0.0)
+                reason = self._skip_reason(attempt, delay, deadline, expected_attempt)
+                if reason is not None:
+                    self.skipped[reason] += 1
+                    raise
+                logger.info("Retrying upstream call", extra={
+                    "attempt": attempt,
+                    "delay_ms": round(delay * 1000, 1),
+                    "error": str(e)
+                })
+                self.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            if attempt > 1:
+                self.recovered += 1
+            return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "recovered": self.recovered,
+            "skipped": dict(self.skipped),
+            "budget_tokens": round(self.budget.tokens, 2),
+            "budget_max_tokens": self.budget.max_tokens,
+        }
@@ -0,0 +1,184 @@
+"""
+Translation memory shared by the users of one organisation.
+
+Colleagues often translate the same strings with slightly different request
+context (a request id, a UI flag), which the exact cache treats as separate
+requests. Per tenant (`User.tenant`, assigned by an admin rather than taken
+from the self-declared company name) this memory matches on canonical text,
+language pair and only the context keys that change a translation.
+
+Each tenant has its own key space, a quota of entries with least-recently-
+used eviction (a sorted set of last access times), and hit/miss counters in
+Redis so hit rate and savings can be reported across all workers.
+"""
+import hashlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.core.config import settings
+from app.core.deadline import bounded
+from app.core.exceptions import DeadlineExceededError
+from app.core.redis import REDIS_OUTAGE_ERRORS, get_bytes, health_for
+from app.services.cache_codec import codec
+from app.services.canonical import request_hash
+
+logger = logging.getLogger(__name__)
+
+def tenant_id(tenant: str) -> str:
+    """Stable key-safe id for a tenant."""
+    return hashlib.sha256(tenant.strip().lower().encode()).hexdigest()[:16]
+
+class TenantMemory:
+    def __init__(
+        self,
+        get_client: Callable[[], Awaitable[Any]],
+        max_entries: int = 10000,
+        quotas: Optional[Dict[str, int]] = None,
+        ttl: int = 7776000,
+        context_keys: tuple = (),
+        enabled: bool = True
+    ):
+        self.get_client = get_client
+        self.max_entries = max_entries
+        self.quotas = quotas or {}
+        self.ttl = ttl
+        self.context_keys = tuple(context_keys)
+        self.enabled = enabled
+        # Per-worker counters; the cluster-wide ones live in Redis (see `tenant_stats`)
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.evicted = 0
+        self.errors = 0
+
+    @classmethod
+    def from_settings(cls, get_client: Callable[[], Awaitable[Any]]) -> "TenantMemory":
+        return cls(
+            get_client,
+            max_entries=settings.TENANT_MEMORY_MAX_ENTRIES,
+            quotas=settings.TENANT_MEMORY_QUOTAS,
+            ttl=settings.TENANT_MEMORY_TTL_SECONDS,
+            context_keys=settings.TENANT_MEMORY_CONTEXT_KEYS,
+            enabled=settings.TENANT_MEMORY_ENABLED
+        )
+
+    def quota(self, tenant: str) -> int:
+        return self.quotas.get(tenant, self.max_entries)
+
+    def _keys(self, tenant: str, text: str, source_lang: str, target_lang: str, context: Optional[Dict[str, Any]]):
+        relevant = {key: value for key, value in (context or {}).items() if key in self.context_keys}
+        prefix = f"tm:{tenant_id(tenant)}"
+        digest = request_hash(text, source_lang, target_lang, relevant)
+        return f"{prefix}:{digest}", f"{prefix}:lru", f"{prefix}:stats", digest
+
+    async def _client(self, tenant: Optional[str]) -> Optional[Any]:
+        # Sorted sets and hashes have no local fallback, so the memory is off while Redis is down
+        if not self.enabled or not tenant or self.quota(tenant) <= 0:
+            return None
+        return await self.get_client()
+
+    def _failed(self, error: BaseException, client: Optional[Any]) -> None:
+        self.errors += 1
+        if client is not None and isinstance(error, REDIS_OUTAGE_ERRORS):
+            health_for(client).mark_down(error)
+        logger.warning("Tenant memory unavailable", extra={"error": repr(error)})
+
+    async def lookup(
+        self,
+        tenant: Optional[str],
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Canonical `text` translated earlier by anyone in the tenant, or None."""
+        client = None
+        try:
+            client = await self._client(tenant)
+            if client is None:
+                return None
+            key, lru_key, stats_key, digest = self._keys(tenant, text, source_lang, target_lang, context)
+            entry = codec.decode(await bounded(get_bytes(client, key)))
+            pipe = client.pipeline(transaction=False)
+            if entry:
+                pipe.zadd(lru_key, {digest: time.time()})
+            pipe.hincrby(stats_key, "hits" if entry else "misses", 1)
+            await bounded(pipe.execute())
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            self._failed(e, client)
+            return None
+        counters = self.hits if entry else self.misses
+        counters[tenant] = counters.get(tenant, 0) + 1
+        return entry
+
+    async def store(
+        self,
+        tenant: Optional[str],
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]],
+        result: Dict[str, Any]
+    ) -> None:
+        """Remember a translation for the tenant, evicting its least recently used entries over quota."""
+        client = None
+        try:
+            client = await self._client(tenant)
+            if client is None:
+                return
+            key, lru_key, stats_key, digest = self._keys(tenant, text, source_lang, target_lang, context)
+            pipe = client.pipeline(transaction=False)
+            pipe.set(key, codec.encode(result), ex=self.ttl)
+            pipe.zadd(lru_key, {digest: time.time()})
+            pipe.expire(lru_key, self.ttl)
+            pipe.zcard(lru_key)
+            *_, size = await bounded(pipe.execute())
+            excess = size - self.quota(tenant)
+            if excess > 0:
+                evicted = [member for member, _ in await bounded(client.zpopmin(lru_key, excess))]
+                prefix = key.rsplit(":", 1)[0]
+                pipe = client.pipeline(transaction=False)
+                for member in evicted:
+                    pipe.delete(f"{prefix}:{member}")
+                pipe.hincrby(stats_key, "evicted", len(evicted))
+                await bounded(pipe.execute())
+                self.evicted += len(evicted)
+        except Exception as e:
+            self._failed(e, client)
+
+    async def tenant_stats(self, tenant: str) -> Optional[Dict[str, Any]]:
+        """Cluster-wide usage for one tenant (entries, quota, hits, hit rate), or None while Redis is down."""
+        client = await self.get_client()
+        if client is None:
+            return None
+        prefix = f"tm:{tenant_id(tenant)}"
+        pipe = client.pipeline(transaction=False)
+        pipe.hgetall(f"{prefix}:stats")
+        pipe.zcard(f"{prefix}:lru")
+        stats, entries = await bounded(pipe.execute())
+        hits, misses = int(stats.get("hits", 0)), int(stats.get("misses", 0))
+        return {
+            "tenant": tenant,
+            "entries": entries,
+            "quota": self.quota(tenant),
+            "hits": hits,
+            "misses": misses,
+            "evicted": int(stats.get("evicted", 0)),
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            # Each hit is an upstream translation the tenant did not pay for
+            "upstream_calls_saved": hits,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        tenants = set(self.hits) | set(self.misses)
+        per_tenant = {}
+        for tenant in sorted(tenants):
+            hits, misses = self.hits.get(tenant, 0), self.misses.get(tenant, 0)
+            per_tenant[tenant] = {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 4)}
+        return {
+            "enabled": self.enabled,
+            "tenants": per_tenant,
+            "evicted": self.evicted,
+            "errors": self.errors,
+        }
@@ -1,58 +1,122 @@
-from typing import Optional, Dict, Any
-import openai
-from openai import AsyncOpenAI
+from typing import Optional, Dict, Any, List, Set, Tuple
 from app.core.config import settings
-from app.core.exceptions import TranslationError
+from app.core.deadline import earliest, expired
+from app.core.exceptions import CustomException, DeadlineExceededError, TranslationError
+from app.core.lifecycle import tasks
+from app.core.metrics import metrics
+from app.core.redis import get_bytes, with_fallback
+from app.core.redis_shards import get_cache_redis_or_none
+from app.services.backends import BackendRouter, CompletionRequest
+from app.services.batching import MicroBatcher
+from app.services.cache_analytics import CacheAnalytics
+from app.services.canonical import Layout, canonicalize_context, canonicalize_text, content_hash, request_hash
+from app.services.cache_codec import codec
+from app.services.cache_namespace import LEGACY, CacheNamespaces
+from app.services.cache_policy import DERIVED, FRESH_UNTIL, CachePolicy
+from app.services.profiles import ProfileStats, build_messages, select_profile
+from app.services.tenant_memory import TenantMemory
+from app.services.translation_memory import TranslationMemory
 import json
-from redis.asyncio import Redis
-import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "translation:"
 
 class TranslationService:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, router: Optional[BackendRouter] = None, memory: Optional[TranslationMemory] = None):
         self._redis = None
-        self.cache_ttl = 86400  # 24 hours
+        self._router = router
+        self.memory = memory or TranslationMemory.from_settings()
+        self.tenant_memory = TenantMemory.from_settings(self._get_redis)
+        self.cache_policy = CachePolicy.from_settings()
+        self.analytics = CacheAnalytics.from_settings()
+        self.namespaces = CacheNamespaces.from_settings(self._get_redis)
+        self._refreshing: Set[str] = set()
+        self.profile_stats = ProfileStats()
+        # Load signals for admission control
+        self.in_flight = 0
+        self.upstream_pending = 0
+        self.batcher: Optional[MicroBatcher] = None
+        if settings.BATCH_ENABLED:
+            self.batcher = MicroBatcher(
+                lambda request: self.router.complete(request),
+                window_ms=settings.BATCH_WINDOW_MS,
+                max_size=settings.BATCH_MAX_SIZE,
+                max_tokens_cap=settings.TRANSLATION_MAX_TOKENS_LONG
+            )
+
+    @property
+    def router(self) -> BackendRouter:
+        """Backend router, built from settings on first use."""
+        if self._router is None:
+            self._router = BackendRouter.from_settings()
+        return self._router
 
     async def _get_redis(self):
-        if self._redis is None:
-            # Build Redis URL with password only if it's set
-            redis_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
-            connection_kwargs = {
-                "decode_responses": True,
-            }
-            if settings.REDIS_PASSWORD:
-                connection_kwargs["password"] = settings.REDIS_PASSWORD
-            
-            try:
-                self._redis = Redis.from_url(
-                    redis_url,
-                    **connection_kwargs
-                )
-                # Test the connection
-                await self._redis.ping()
-            except Exception as e:
-                # If authentication fails, try without password
-                if "AUTH" in str(e):
-                    self._redis = Redis.from_url(
-                        redis_url,
-                        decode_responses=True
-                    )
-                    await self._redis.ping()
-                else:
-                    raise e
-        return self._redis
+        """Redis client, or None while Redis is degraded (the local cache is used instead)."""
+        if self._redis is not None:
+            return self._redis
+        return await get_cache_redis_or_none()
 
-    def _generate_cache_key(self, text: str, source_lang: str, target_lang: str, context: Dict[str, Any]) -> str:
+    def _generate_cache_key(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Dict[str, Any],
+        namespace: str = LEGACY
+    ) -> str:
         """Generate a unique cache key for the translation request."""
-        key_components = f"{text}:{source_lang}:{target_lang}:{json.dumps(context, sort_keys=True)}"
-        return f"translation:{hashlib.sha256(key_components.encode()).hexdigest()}"
+        digest = request_hash(text, source_lang, target_lang, context)
+        if namespace == LEGACY:
+            return CACHE_KEY_PREFIX + digest
+        return f"{CACHE_KEY_PREFIX}{namespace}:{digest}"
 
-    async def translate(
+    def _current_key(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]]
+    ) -> str:
+        """Cache key in the namespace of the model and prompt that would translate the request now."""
+        namespace = self.namespaces.current(select_profile(text, context))
+        return self._generate_cache_key(text, source_lang, target_lang, context or {}, namespace)
+
+    def _is_current(self, result: Dict[str, Any], text: str, context: Optional[Dict[str, Any]]) -> bool:
+        """Whether `result` came from the model and prompt that would translate the request now."""
+        namespace = result.get("namespace") or LEGACY
+        return namespace == self.namespaces.current(select_profile(text, context))
+
+    async def _previous_keys(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]]
+    ) -> List[str]:
+        """Keys the request had under earlier models or prompts, newest first."""
+        previous = await self.namespaces.previous_for(select_profile(text, context))
+        return [self._generate_cache_key(text, source_lang, target_lang, context or {}, ns) for ns in previous]
+
+    def content_hash(
         self,
         text: str,
         source_lang: str,
         target_lang: str,
         context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Hash identifying the request in the cache and in `translations.content_hash`."""
+        return content_hash(text, source_lang, target_lang, context, settings.CACHE_KEY_IGNORED_CONTEXT_KEYS)
+
+    async def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]] = None,
+        tenant: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Translate text between Turkish and English with cultural context adaptation.
@@ -62,6 +126,7 @@ class TranslationService:
             source_lang: Source language code ('tr' or 'en')
             target_lang: Target language code ('tr' or 'en')
             context: Optional dictionary containing cultural context and compliance rules
+            tenant: Company of the requesting user, for per-tenant cache settings
         
         Returns:
             Dictionary containing translated text and cultural adaptations
@@ -69,53 +134,309 @@ class TranslationService:
         if source_lang not in ['tr', 'en'] or target_lang not in ['tr', 'en']:
             raise TranslationError("Only Turkish (tr) and English (en) languages are supported")
 
-        # Check cache first
-        redis = await self._get_redis()
-        cache_key = self._generate_cache_key(text, source_lang, target_lang, context or {})
-        cached_result = await redis.get(cache_key)
-        if cached_result:
-            return json.loads(cached_result)
+        text, context, layout = self._canonicalize(text, context)
+        self.in_flight += 1
+        try:
+            result = await self._translate(text, source_lang, target_lang, context, tenant)
+        finally:
+            self.in_flight -= 1
+        return self._restore(result, layout)
+
+    def _canonicalize(
+        self,
+        text: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Tuple[str, Optional[Dict[str, Any]], Layout]:
+        """Canonical text and context, so trivially different requests share a cache entry."""
+        text, layout = canonicalize_text(text)
+        context = canonicalize_context(context, settings.CACHE_KEY_IGNORED_CONTEXT_KEYS)
+        return text, context or None, layout
+
+    def _restore(self, result: Dict[str, Any], layout: Layout) -> Dict[str, Any]:
+        """Put the original's surrounding whitespace and line endings back on the translation."""
+        if layout == Layout():
+            return result
+        return {**result, "translated_text": layout.restore(result["translated_text"])}
+
+    async def get_cached(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]] = None,
+        tenant: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached translation, stale or not, or None without calling upstream."""
+        text, context, layout = self._canonicalize(text, context)
+        cache_key = self._current_key(text, source_lang, target_lang, context)
+        cached_result = await self._lookup(cache_key, source_lang, target_lang, tenant)
+        if not cached_result:
+            previous_keys = await self._previous_keys(text, source_lang, target_lang, context)
+            cached_result = await self._lookup_previous(previous_keys)
+        return self._restore(cached_result, layout) if cached_result else None
+
+    async def _lookup(
+        self,
+        cache_key: str,
+        source_lang: str,
+        target_lang: str,
+        tenant: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Cached result for the key, with `stale` set when it is past its soft expiry."""
+        self.cache_policy.record_access(cache_key)
+        raw = await with_fallback(await self._get_redis(), lambda cache: get_bytes(cache, cache_key))
+        entry = codec.decode(raw)
+        if entry and entry.get(DERIVED) and not self._reverse_enabled(tenant):
+            # Reverse-pair entries are only served to tenants that opted in
+            self.cache_policy.derived_ignored += 1
+            entry = None
+        self.analytics.record_lookup(cache_key, bool(entry), tenant, source_lang, target_lang)
+        pending = self.analytics.take_pending()
+        if pending:
+            tasks.spawn(self._flush_analytics(pending))
+        if not entry:
+            self.cache_policy.misses += 1
+            return None
+        stale = self.cache_policy.is_stale(entry)
+        if entry.get(DERIVED):
+            self.cache_policy.derived_hits += 1
+        elif stale:
+            self.cache_policy.stale_hits += 1
+        else:
+            self.cache_policy.fresh_hits += 1
+        entry.pop(FRESH_UNTIL, None)
+        return {**entry, "cached": True, "stale": stale}
+
+    async def _flush_analytics(self, pending: Dict[Tuple[str, str], int]) -> None:
+        await self.analytics.flush(await self._get_redis(), pending)
+
+    async def _lookup_previous(self, keys: List[str]) -> Optional[Dict[str, Any]]:
+        """First real translation under an older namespace, as a stale result."""
+        client = await self._get_redis()
+        for key in keys:
+            entry = codec.decode(await with_fallback(client, lambda cache: get_bytes(cache, key)))
+            if entry and not entry.get(DERIVED):
+                self.namespaces.fallback_hits += 1
+                entry.pop(FRESH_UNTIL, None)
+                return {**entry, "cached": True, "stale": True}
+        return None
 
+    async def _store(self, cache_key: str, result: Dict[str, Any], namespace: Optional[str] = None) -> None:
+        """Cache `result`; pass its `namespace` when it is not the current one."""
+        fresh_ttl, hard_ttl = self.cache_policy.ttl(cache_key)
+        # Unversioned keys are also read by workers that predate the binary format
+        payload = codec.encode(self.cache_policy.stamp(result, fresh_ttl), binary=namespace != LEGACY)
+        if not await self._admit(cache_key, len(payload)):
+            return
+        await with_fallback(
+            await self._get_redis(),
+            lambda cache: cache.setex(cache_key, hard_ttl, payload)
+        )
+        self.analytics.record_write(cache_key, len(payload), hard_ttl)
+
+    async def _admit(self, cache_key: str, size: int) -> bool:
+        """Admission check, counting the request in Redis when this worker's count is not enough."""
+        if not self.cache_policy.needs_shared_count(cache_key, size):
+            return self.cache_policy.admit(cache_key, size)
+        seen_key = f"{cache_key}:seen"
+        ttl = self.cache_policy.min_ttl
+
+        async def count(cache) -> int:
+            if await cache.set(seen_key, 1, ex=ttl, nx=True):
+                return 1
+            return await cache.incr(seen_key)
+
+        client = await self._get_redis()
+        # While degraded there is nothing shared to count in
+        shared_count = await with_fallback(client, count) if client is not None else 0
+        return self.cache_policy.admit(cache_key, size, shared_count)
+
+    def _reverse_enabled(self, tenant: Optional[str]) -> bool:
+        return settings.REVERSE_CACHE_ENABLED or (tenant is not None and tenant in settings.REVERSE_CACHE_TENANTS)
+
+    async def _store_reverse(self, text: str, context: Optional[Dict[str, Any]], result: Dict[str, Any]) -> None:
+        """
+        Seed the opposite direction from a completed translation, marked as derived.
+
+        Review round-trips often ask for the output translated back. The entry
+        gets the short TTL of a key seen once and never replaces an existing one.
+        """
+        reverse_text, _ = canonicalize_text(result["translated_text"])
+        if not reverse_text:
+            return
+        reverse_key = self._current_key(reverse_text, result["target_lang"], result["source_lang"], context)
+        derived = {
+            **result,
+            "translated_text": text,
+            "source_lang": result["target_lang"],
+            "target_lang": result["source_lang"],
+            DERIVED: True,
+        }
+        fresh_ttl, hard_ttl = self.cache_policy.ttl_for(1)
+        payload = codec.encode(self.cache_policy.stamp(derived, fresh_ttl))
+        if not await self._admit(reverse_key, len(payload)):
+            return
+        stored = await with_fallback(
+            await self._get_redis(),
+            lambda cache: cache.set(reverse_key, payload, ex=hard_ttl, nx=True)
+        )
+        if stored:
+            self.cache_policy.derived_written += 1
+            self.analytics.record_write(reverse_key, len(payload), hard_ttl)
+
+    def _schedule_refresh(
+        self,
+        cache_key: str,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]],
+        tenant: Optional[str]
+    ) -> None:
+        if cache_key in self._refreshing:
+            return
+        self._refreshing.add(cache_key)
+        tasks.spawn(self._refresh(cache_key, text, source_lang, target_lang, context, tenant))
+
+    async def _refresh(
+        self,
+        cache_key: str,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]],
+        tenant: Optional[str]
+    ) -> None:
+        """Replace a stale entry; the lock keeps other workers from refreshing it too."""
+        lock_key = f"{cache_key}:refresh"
         try:
-            # Prepare the system message based on the translation direction
-            system_message = (
-                "You are an expert translator and cultural adaptation specialist for "
-                f"{'Turkish to English' if source_lang == 'tr' else 'English to Turkish'} content. "
-                "Consider cultural nuances, idioms, and compliance requirements in your translations."
+            locked = await with_fallback(
+                await self._get_redis(),
+                lambda cache: cache.set(lock_key, "1", ex=settings.CACHE_REFRESH_LOCK_SECONDS, nx=True)
             )
+            if not locked:
+                return
+            await self._fetch(cache_key, text, source_lang, target_lang, context, tenant)
+            self.cache_policy.refreshes += 1
+        except Exception as e:
+            self.cache_policy.refresh_failures += 1
+            logger.warning("Stale cache refresh failed", extra={"error": repr(e)})
+        finally:
+            self._refreshing.discard(cache_key)
 
-            # Prepare the user message with context
-            user_message = f"Translate the following text from {source_lang} to {target_lang}:\n\n{text}"
-            if context:
-                user_message += f"\n\nConsider this context:\n{json.dumps(context, indent=2)}"
+    async def _translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]],
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
+        # Check cache first
+        cache_key = self._current_key(text, source_lang, target_lang, context)
+        cached_result = await self._lookup(cache_key, source_lang, target_lang, tenant)
+        if cached_result:
+            if cached_result["stale"]:
+                # Serve it now; one background call replaces it
+                self._schedule_refresh(cache_key, text, source_lang, target_lang, context, tenant)
+            return cached_result
 
-            response = await self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.3,
-                max_tokens=1500
-            )
+        # Translated by the previous model or prompt: serve it while re-translating at a capped rate
+        previous_keys = await self._previous_keys(text, source_lang, target_lang, context)
+        previous_result = await self._lookup_previous(previous_keys)
+        if previous_result:
+            if self.namespaces.allow_revalidation():
+                self._schedule_refresh(cache_key, text, source_lang, target_lang, context, tenant)
+            return previous_result
+
+        # A colleague may have translated the same text under a different request context
+        shared = await self.tenant_memory.lookup(tenant, text, source_lang, target_lang, context)
+        if shared:
+            if self._is_current(shared, text, context):
+                return {**shared, "cached": True, "stale": False, "tenant_memory": True}
+            # From an earlier model or prompt: stale, like a previous-namespace hit
+            if self.namespaces.allow_revalidation():
+                self._schedule_refresh(cache_key, text, source_lang, target_lang, context, tenant)
+            return {**shared, "cached": True, "stale": True, "tenant_memory": True}
+
+        # Expired from Redis: reuse an earlier identical translation if there is one
+        digest = request_hash(text, source_lang, target_lang, context or {})
+        remembered = await self.memory.lookup(digest, source_lang, target_lang, context)
+        if remembered:
+            if self._is_current(remembered, text, context):
+                await self._store(cache_key, remembered)
+                self.memory.promoted += 1
+                return {**remembered, "cached": True, "stale": False}
+            # From an earlier model or prompt: cache it under its own namespace, where it is served stale
+            namespace = remembered.get("namespace") or LEGACY
+            if namespace in await self.namespaces.previous_for(select_profile(text, context)):
+                await self._store(
+                    self._generate_cache_key(text, source_lang, target_lang, context or {}, namespace),
+                    remembered,
+                    namespace
+                )
+            if self.namespaces.allow_revalidation():
+                self._schedule_refresh(cache_key, text, source_lang, target_lang, context, tenant)
+            return {**remembered, "cached": True, "stale": True}
+        return await self._fetch(cache_key, text, source_lang, target_lang, context, tenant)
+
+    async def _fetch(
+        self,
+        cache_key: str,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]],
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Translate upstream and cache the result."""
+        try:
+            # Route by complexity: short UI strings get a cheaper, tighter profile
+            profile = select_profile(text, context)
+            deadline = earliest(settings.TRANSLATION_DEADLINE_SECONDS)
+            self.upstream_pending += 1
+            try:
+                if self.batcher is not None and profile.name == "short":
+                    # Concurrent short strings share one upstream call
+                    completion = await self.batcher.submit(
+                        profile, text, source_lang, target_lang, context, deadline=deadline
+                    )
+                else:
+                    completion = await self.router.complete(CompletionRequest(
+                        model=profile.model,
+                        messages=build_messages(profile, text, source_lang, target_lang, context),
+                        temperature=profile.temperature,
+                        max_tokens=profile.max_tokens,
+                        deadline=deadline,
+                        hedge=profile.hedge
+                    ))
+            finally:
+                self.upstream_pending -= 1
+            self.profile_stats.record(profile.name, completion.latency_ms)
 
             result = {
-                "translated_text": response.choices[0].message.content,
+                "translated_text": completion.content,
                 "source_lang": source_lang,
                 "target_lang": target_lang,
-                "context_applied": bool(context)
+                "context_applied": bool(context),
+                "model": completion.model,
+                "backend": completion.backend,
+                "profile": profile.name,
+                "latency_ms": round(completion.latency_ms, 2),
+                "namespace": self.namespaces.current(profile)
             }
 
-            # Cache the result
-            await redis.setex(
-                cache_key,
-                self.cache_ttl,
-                json.dumps(result)
-            )
-
+            await self._store(cache_key, result)
+            await self.tenant_memory.store(tenant, text, source_lang, target_lang, context, result)
+            if self._reverse_enabled(tenant):
+                await self._store_reverse(text, context, result)
             return result
 
+        except CustomException:
+            raise
         except Exception as e:
+            if expired():
+                raise DeadlineExceededError()
             raise TranslationError(f"Translation failed: {str(e)}")
 
     async def validate_cultural_compliance(
@@ -148,19 +469,20 @@ class TranslationService:
                 f"Compliance Rules:\n{json.dumps(compliance_rules, indent=2)}"
             )
 
-            response = await self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            completion = await self.router.complete(CompletionRequest(
+                model=settings.OPENAI_MODEL,
                 messages=[
                     {"role": "system", "content": system_message},
                     {"role": "user", "content": user_message}
                 ],
                 temperature=0.3,
-                max_tokens=1000
-            )
+                max_tokens=1000,
+                deadline=earliest(settings.TRANSLATION_DEADLINE_SECONDS)
+            ))
 
             return {
                 "is_compliant": True,  # You might want to parse the response to determine this
-                "validation_result": response.choices[0].message.content,
+                "validation_result": completion.content,
                 "suggestions": []  # Parse suggestions from the response
             }
 
@@ -0,0 +1,125 @@
+"""
+Translation memory: the `translations` table as a durable tier behind Redis.
+
+Every stored translation carries the hash of its canonical request, so once
+a Redis entry has expired an identical request can still be answered from
+history instead of upstream. The translation service promotes what it finds
+here back into Redis.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.deadline import bounded
+from app.db.session import SessionLocal
+from app.models.models import Translation
+
+logger = logging.getLogger(__name__)
+
+def history_result(
+    translated_text: str,
+    source_lang: str,
+    target_lang: str,
+    context: Optional[Dict[str, Any]],
+    meta_data: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """A stored translation in the shape `TranslationService` caches and returns."""
+    meta_data = meta_data or {}
+    return {
+        # Stored rows carry the request's surrounding whitespace and line endings
+        "translated_text": translated_text.strip().replace("\r\n", "\n"),
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+        "context_applied": bool(context),
+        "model": meta_data.get("gpt_model"),
+        "backend": meta_data.get("backend"),
+        "profile": meta_data.get("profile"),
+        "latency_ms": meta_data.get("latency_ms"),
+        # Model and prompt version that produced it; None for rows from before namespaces
+        "namespace": meta_data.get("cache_namespace"),
+    }
+
+class TranslationMemory:
+    """
+    Look up earlier translations by content hash.
+
+    Lookups run in a worker thread under the request deadline. Database
+    errors count as misses, and lookups are skipped for `error_backoff`
+    seconds after one so an unhealthy database does not add latency to
+    every translation.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        enabled: bool = True,
+        error_backoff: float = 5.0
+    ):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.error_backoff = error_backoff
+        self._skip_until = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.skipped = 0
+        self.promoted = 0
+        self._latency_ms_total = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "TranslationMemory":
+        return cls(enabled=settings.TRANSLATION_MEMORY_ENABLED)
+
+    def _query(self, digest: str) -> Optional[Any]:
+        db = self.session_factory()
+        try:
+            return (
+                db.query(Translation.translated_text, Translation.meta_data)
+                .filter(Translation.content_hash == digest)
+                .order_by(Translation.id.desc())
+                .first()
+            )
+        finally:
+            db.close()
+
+    async def lookup(
+        self,
+        digest: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        if time.monotonic() < self._skip_until:
+            self.skipped += 1
+            return None
+        started = time.perf_counter()
+        try:
+            row = await bounded(asyncio.to_thread(self._query, digest))
+        except Exception as e:
+            self.errors += 1
+            self._skip_until = time.monotonic() + self.error_backoff
+            logger.warning("Translation memory lookup failed", extra={"error": repr(e)})
+            return None
+        self._latency_ms_total += (time.perf_counter() - started) * 1000
+        if row is None or not row.translated_text:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return history_result(row.translated_text, source_lang, target_lang, context, row.meta_data)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "promoted": self.promoted,
+            "mean_latency_ms": round(self._latency_ms_total / lookups, 2) if lookups else None,
+        }
@@ -0,0 +1,90 @@
+"""
+Size and speed of cached translation values, per encoding.
+
+Builds the values the translation service would cache for a corpus of
+requests and reports, for each encoding, the total bytes stored and the
+per-value encode/decode time. "json" is the legacy format; the others are
+`app.services.cache_codec.CacheCodec` with each compression setting. zstd
+is skipped when the `zstandard` package is not installed.
+
+Usage:
+    python -m benchmarks.cache_codec
+    python -m benchmarks.cache_codec --size 5000 --min-compress-bytes 128
+"""
+import argparse
+import json
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.services.cache_codec import CacheCodec, zstandard
+from benchmarks.corpus import TRANSLATIONS, build_corpus
+
+
+def build_values(size: int, seed: int) -> List[Dict[str, Any]]:
+    """Cached results for the corpus, shaped like `TranslationService._translate` writes them."""
+    values = []
+    for item in build_corpus(size=size, seed=seed):
+        text = item["source_text"]
+        values.append({
+            "translated_text": TRANSLATIONS[text] if item["target_lang"] == "tr" else text,
+            "source_lang": item["source_lang"],
+            "target_lang": item["target_lang"],
+            "context_applied": bool(item["context"]),
+            "model": "gpt-3.5-turbo",
+            "backend": "openai",
+            "profile": "short" if len(text) <= 40 else "standard",
+            "latency_ms": 412.37,
+        })
+    return values
+
+
+def encodings(min_compress_bytes: int) -> Dict[str, Tuple[Callable[[Any], Any], Callable[[Any], Any]]]:
+    result = {"json": (json.dumps, json.loads)}
+    names = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+    for name in names:
+        codec = CacheCodec(compression=name, min_compress_bytes=min_compress_bytes)
+        result[f"binary+{name}"] = (codec.encode, codec.decode)
+    return result
+
+
+def per_call_us(func: Callable[[], Any], calls: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=3)) / calls * 1e6
+
+
+def measure(values: List[Dict[str, Any]], min_compress_bytes: int) -> Dict[str, Dict[str, float]]:
+    report = {}
+    for name, (encode, decode) in encodings(min_compress_bytes).items():
+        encoded = [encode(value) for value in values]
+        stored = sum(len(e.encode("utf-8") if isinstance(e, str) else e) for e in encoded)
+        report[name] = {
+            "bytes": stored,
+            "bytes_per_value": stored / len(values),
+            "encode_us": per_call_us(lambda: [encode(value) for value in values], len(values)),
+            "decode_us": per_call_us(lambda: [decode(e) for e in encoded], len(values)),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=2000, help="Number of cached values")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--min-compress-bytes", type=int, default=256)
+    args = parser.parse_args()
+
+    values = build_values(args.size, args.seed)
+    report = measure(values, args.min_compress_bytes)
+    baseline = report["json"]["bytes"]
+    print(f"{'encoding':<16}{'bytes/value':>12}{'saved':>9}{'encode us':>12}{'decode us':>12}")
+    for name, row in report.items():
+        saved = 1 - row["bytes"] / baseline
+        print(
+            f"{name:<16}{row['bytes_per_value']:>12.1f}{saved:>9.1%}"
+            f"{row['encode_us']:>12.2f}{row['decode_us']:>12.2f}"
+        )
+    if zstandard is None:
+        print("\nzstandard is not installed; zstd was skipped.")
+
+
+if __name__ == "__main__":
+    main()
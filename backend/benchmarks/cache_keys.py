@@ -0,0 +1,121 @@
+"""
+Replay a traffic sample and compare cache hit ratio with raw and canonical keys.
+
+Every request is keyed the way `TranslationService` keyed it before
+canonicalization (raw text and context) and the way it does now; a key seen
+before counts as a hit. TTLs and eviction are ignored, so the numbers are the
+upper bound each scheme allows.
+
+Without --input, the corpus is replayed with the kinds of noise real clients
+add: trailing whitespace and newlines, CRLF line endings, non-breaking and
+double spaces, decomposed (NFD) Turkish characters and per-request ids in the
+context. --input takes a JSONL file of captured requests with the same fields
+as the corpus (`source_text`, `source_lang`, `target_lang`, `context`).
+
+Usage:
+    python -m benchmarks.cache_keys
+    python -m benchmarks.cache_keys --size 5000 --noise 0.5
+    python -m benchmarks.cache_keys --input captured.jsonl
+"""
+import argparse
+import json
+import random
+import unicodedata
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from app.services.translation import TranslationService
+from benchmarks.corpus import TRANSLATIONS, build_corpus
+
+
+def _trailing_space(text: str, rng: random.Random) -> str:
+    return text + rng.choice([" ", "  ", "\n", " \n"])
+
+
+def _crlf(text: str, rng: random.Random) -> str:
+    return text.replace(". ", ".\r\n") + "\r\n"
+
+
+def _nbsp(text: str, rng: random.Random) -> str:
+    return text.replace(" ", "\u00a0", 1)
+
+
+def _double_space(text: str, rng: random.Random) -> str:
+    return text.replace(" ", "  ", 1)
+
+
+def _nfd(text: str, rng: random.Random) -> str:
+    return unicodedata.normalize("NFD", text)
+
+
+NOISE: List[Callable[[str, random.Random], str]] = [_trailing_space, _crlf, _nbsp, _double_space, _nfd]
+
+
+def noisy_corpus(size: int, seed: int, noise: float) -> List[Dict[str, Any]]:
+    """The corpus with a share of requests altered the way real clients alter them."""
+    rng = random.Random(seed)
+    requests = []
+    for item in build_corpus(size=size, seed=seed):
+        item = dict(item)
+        if item["source_lang"] == "tr":
+            # Turkish sources are where NFD input shows up
+            item["source_text"] = TRANSLATIONS[item["source_text"]]
+        if rng.random() < noise:
+            item["source_text"] = rng.choice(NOISE)(item["source_text"], rng)
+        if rng.random() < noise / 2:
+            item["context"] = {**(item["context"] or {}), "request_id": str(uuid.UUID(int=rng.getrandbits(128)))}
+        requests.append(item)
+    return requests
+
+
+def load_requests(path: Path) -> List[Dict[str, Any]]:
+    with path.open() as lines:
+        return [json.loads(line) for line in lines if line.strip()]
+
+
+def replay(requests: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    service = TranslationService()
+    seen: Dict[str, set] = {"raw": set(), "canonical": set()}
+    hits = {"raw": 0, "canonical": 0}
+    for item in requests:
+        text, context = item["source_text"], item.get("context")
+        canonical_text, canonical_context, _ = service._canonicalize(text, context)
+        keys = {
+            "raw": service._generate_cache_key(text, item["source_lang"], item["target_lang"], context or {}),
+            "canonical": service._generate_cache_key(
+                canonical_text, item["source_lang"], item["target_lang"], canonical_context or {}
+            ),
+        }
+        for scheme, key in keys.items():
+            if key in seen[scheme]:
+                hits[scheme] += 1
+            else:
+                seen[scheme].add(key)
+    return {
+        scheme: {"hit_ratio": hits[scheme] / len(requests), "entries": len(seen[scheme])}
+        for scheme in seen
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, help="JSONL file of captured requests")
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--noise", type=float, default=0.3, help="Share of requests with client noise")
+    args = parser.parse_args()
+
+    requests = load_requests(args.input) if args.input else noisy_corpus(args.size, args.seed, args.noise)
+    report = replay(requests)
+    print(f"{len(requests)} requests")
+    print(f"{'keys':<12}{'hit ratio':>10}{'entries':>10}")
+    for scheme, row in report.items():
+        print(f"{scheme:<12}{row['hit_ratio']:>10.1%}{row['entries']:>10}")
+    upstream_raw = len(requests) * (1 - report["raw"]["hit_ratio"])
+    upstream_canonical = len(requests) * (1 - report["canonical"]["hit_ratio"])
+    print(f"\nupstream calls: {upstream_raw:.0f} -> {upstream_canonical:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Check how the sharded translation cache spreads and moves keys.
+
+Without --nodes, only the ring is exercised: the share of keys each node
+owns (ideal 1/N) and the share that moves when one node is added (ideal
+1/(N+1)), for a range of virtual-node counts.
+
+With --nodes, keys are also written to and read back from real Redis
+processes through `ShardedRedis`, in pipelined batches, and the per-node key
+counts and throughput are reported. Start a few local nodes first, e.g.:
+
+    for port in 6380 6381 6382; do redis-server --port $port --save '' --daemonize yes; done
+
+Usage:
+    python -m benchmarks.cache_shards
+    python -m benchmarks.cache_shards --node-count 5 --vnodes 40 160 640
+    python -m benchmarks.cache_shards --nodes redis://localhost:6380 redis://localhost:6381 redis://localhost:6382
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+from app.core.redis_shards import HashRing, ShardedRedis
+
+
+def ring_report(nodes: List[str], vnodes: int, keys: List[str]) -> Dict[str, float]:
+    ring = HashRing(nodes, vnodes)
+    grown = HashRing(nodes + ["added"], vnodes)
+    counts = {node: 0 for node in nodes}
+    moved = 0
+    for key in keys:
+        owner = ring.node_for(key)
+        counts[owner] += 1
+        moved += grown.node_for(key) != owner
+    shares = [count / len(keys) for count in counts.values()]
+    return {
+        "max_share": max(shares),
+        "min_share": min(shares),
+        "stdev": statistics.pstdev(shares),
+        "moved": moved / len(keys),
+    }
+
+
+async def live_report(urls: List[str], vnodes: int, keys: List[str], batch: int) -> None:
+    cache = ShardedRedis.from_urls(urls, vnodes=vnodes)
+    try:
+        await cache.ping()
+        payload = b"x" * 200
+        started = time.perf_counter()
+        for i in range(0, len(keys), batch):
+            pipe = cache.pipeline()
+            for key in keys[i:i + batch]:
+                pipe.set(key, payload, ex=600)
+            await pipe.execute()
+        write_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for i in range(0, len(keys), batch):
+            pipe = cache.pipeline()
+            for key in keys[i:i + batch]:
+                pipe.get(key)
+            await pipe.execute()
+        read_seconds = time.perf_counter() - started
+
+        print(f"\n{len(keys)} keys over {len(urls)} nodes, pipelines of {batch}")
+        print(f"writes: {len(keys) / write_seconds:,.0f}/s   reads: {len(keys) / read_seconds:,.0f}/s")
+        for url, client in cache.clients.items():
+            print(f"  {url:<32}{await client.dbsize():>10} keys")
+        await cache.delete(*keys)
+    finally:
+        await cache.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=100000)
+    parser.add_argument("--node-count", type=int, default=3, help="Simulated nodes for the ring report")
+    parser.add_argument("--vnodes", type=int, nargs="+", default=[1, 10, 40, 160, 640])
+    parser.add_argument("--nodes", nargs="+", help="redis:// URLs to write through ShardedRedis")
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    keys = [f"translation:bench:{i}" for i in range(args.keys)]
+    nodes = [f"redis://cache-{i}:6379" for i in range(args.node_count)]
+    print(f"{args.keys} keys, {args.node_count} nodes -> {args.node_count + 1}")
+    print(f"{'vnodes':>8}{'min share':>11}{'max share':>11}{'stdev':>9}{'moved':>9}")
+    for vnodes in args.vnodes:
+        row = ring_report(nodes, vnodes, keys)
+        print(
+            f"{vnodes:>8}{row['min_share']:>11.1%}{row['max_share']:>11.1%}"
+            f"{row['stdev']:>9.2%}{row['moved']:>9.1%}"
+        )
+    print(f"ideal: {1 / args.node_count:.1%} per node, {1 / (args.node_count + 1):.1%} moved")
+
+    if args.nodes:
+        asyncio.run(live_report(args.nodes, args.vnodes[-1], keys, args.batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Deterministic translation corpus shared by the load tests and microbenchmarks.
+
+The mix mirrors production traffic: mostly short UI strings, some sentences
+and a tail of long paragraphs, drawn with a Zipf-like skew so popular strings
+repeat the way they do in real traffic.
+"""
+import random
+from typing import Any, Dict, List, Optional
+
+UI_STRINGS = [
+    "Save", "Cancel", "Delete", "Sign in", "Sign out", "Settings",
+    "Your changes have been saved.", "Are you sure?", "Try again",
+    "Download invoice", "Upgrade plan", "Privacy policy", "Terms of use",
+    "Forgot password?", "Welcome back!", "Search translations",
+    "No results found", "Loading...", "Add to cart", "Checkout",
+]
+
+SENTENCES = [
+    "We use cookies to improve your experience on our website.",
+    "Your subscription will renew automatically at the end of the billing period.",
+    "Please confirm your email address to activate your account.",
+    "Personal data is processed only for the purposes described in this notice.",
+    "You can request deletion of your data at any time by contacting support.",
+    "Orders placed before noon are shipped on the same business day.",
+]
+
+PARAGRAPHS = [
+    (
+        "This privacy notice explains how we collect, use and protect personal "
+        "data when you use our services. We process personal data only with "
+        "your explicit consent or where another legal basis applies, and we "
+        "keep it no longer than necessary for the purposes described below. "
+        "You have the right to access, rectify and erase your data, and to "
+        "object to processing at any time."
+    ),
+    (
+        "Our platform helps teams localize product content between Turkish and "
+        "English while keeping every string compliant with GDPR and KVKK. "
+        "Translations are reviewed for cultural nuance, tone and regulatory "
+        "wording before they are published, and every change is recorded in "
+        "the translation history for later audit."
+    ),
+]
+
+# Reference Turkish output, so cached values have realistic size and characters
+TRANSLATIONS = {
+    "Save": "Kaydet",
+    "Cancel": "İptal",
+    "Delete": "Sil",
+    "Sign in": "Giriş yap",
+    "Sign out": "Çıkış yap",
+    "Settings": "Ayarlar",
+    "Your changes have been saved.": "Değişiklikleriniz kaydedildi.",
+    "Are you sure?": "Emin misiniz?",
+    "Try again": "Tekrar deneyin",
+    "Download invoice": "Faturayı indir",
+    "Upgrade plan": "Planı yükselt",
+    "Privacy policy": "Gizlilik politikası",
+    "Terms of use": "Kullanım koşulları",
+    "Forgot password?": "Şifrenizi mi unuttunuz?",
+    "Welcome back!": "Tekrar hoş geldiniz!",
+    "Search translations": "Çevirilerde ara",
+    "No results found": "Sonuç bulunamadı",
+    "Loading...": "Yükleniyor...",
+    "Add to cart": "Sepete ekle",
+    "Checkout": "Ödeme",
+    SENTENCES[0]: "Web sitemizdeki deneyiminizi iyileştirmek için çerez kullanıyoruz.",
+    SENTENCES[1]: "Aboneliğiniz fatura döneminin sonunda otomatik olarak yenilenecektir.",
+    SENTENCES[2]: "Hesabınızı etkinleştirmek için lütfen e-posta adresinizi onaylayın.",
+    SENTENCES[3]: "Kişisel veriler yalnızca bu bildirimde açıklanan amaçlarla işlenir.",
+    SENTENCES[4]: "Destek ekibiyle iletişime geçerek verilerinizin silinmesini istediğiniz zaman talep edebilirsiniz.",
+    SENTENCES[5]: "Öğleden önce verilen siparişler aynı iş günü içinde kargoya verilir.",
+    PARAGRAPHS[0]: (
+        "Bu gizlilik bildirimi, hizmetlerimizi kullandığınızda kişisel verileri "
+        "nasıl topladığımızı, kullandığımızı ve koruduğumuzu açıklar. Kişisel "
+        "verileri yalnızca açık rızanızla veya başka bir hukuki dayanak "
+        "bulunduğunda işler ve aşağıda açıklanan amaçlar için gerekenden daha "
+        "uzun süre saklamayız. Verilerinize erişme, bunları düzeltme ve silme "
+        "ile işlemeye her zaman itiraz etme hakkına sahipsiniz."
+    ),
+    PARAGRAPHS[1]: (
+        "Platformumuz, ekiplerin ürün içeriğini Türkçe ile İngilizce arasında "
+        "yerelleştirmesine yardımcı olurken her metnin GDPR ve KVKK ile uyumlu "
+        "kalmasını sağlar. Çeviriler yayımlanmadan önce kültürel nüans, ton ve "
+        "mevzuat ifadeleri açısından gözden geçirilir ve her değişiklik daha "
+        "sonraki denetimler için çeviri geçmişine kaydedilir."
+    ),
+}
+
+CONTEXTS: List[Optional[Dict[str, Any]]] = [
+    None,
+    None,
+    {"domain": "ecommerce"},
+    {"domain": "legal", "tone": "formal"},
+    {"compliance_rules": {"category": "KVKK"}},
+]
+
+
+def build_corpus(size: int = 500, seed: int = 1234) -> List[Dict[str, Any]]:
+    """
+    Build a list of translation requests with production-like skew.
+
+    Roughly 70% short UI strings, 25% sentences and 5% paragraphs; within each
+    bucket, earlier entries are drawn more often than later ones.
+    """
+    rng = random.Random(seed)
+    buckets = [(UI_STRINGS, 0.70), (SENTENCES, 0.25), (PARAGRAPHS, 0.05)]
+    corpus = []
+    for _ in range(size):
+        pool = rng.choices([b for b, _ in buckets], weights=[w for _, w in buckets])[0]
+        weights = [1.0 / (rank + 1) for rank in range(len(pool))]
+        text = rng.choices(pool, weights=weights)[0]
+        source_lang, target_lang = rng.choice([("en", "tr"), ("en", "tr"), ("tr", "en")])
+        corpus.append({
+            "source_text": text,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "context": rng.choice(CONTEXTS),
+        })
+    return corpus
@@ -0,0 +1,109 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+Behaviour is configured through environment variables (or PATCH /config at
+runtime) so the same server can model a healthy, slow or flaky upstream:
+
+    FAKE_OPENAI_LATENCY_MS       time to first token, in milliseconds (default 200)
+    FAKE_OPENAI_TOKENS_PER_SEC   completion generation rate (default 80)
+    FAKE_OPENAI_ERROR_RATE       fraction of calls answered with 429/503 (default 0)
+    FAKE_OPENAI_SEED             seed for the error RNG (default 1234)
+
+Run with:
+    uvicorn benchmarks.fake_openai:app --port 8100
+"""
+import asyncio
+import os
+import random
+import time
+import uuid
+from typing import Any, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.backends import fake_translation
+
+app = FastAPI(title="Fake OpenAI")
+
+config: Dict[str, float] = {
+    "latency_ms": float(os.getenv("FAKE_OPENAI_LATENCY_MS", "200")),
+    "tokens_per_sec": float(os.getenv("FAKE_OPENAI_TOKENS_PER_SEC", "80")),
+    "error_rate": float(os.getenv("FAKE_OPENAI_ERROR_RATE", "0")),
+}
+stats: Dict[str, int] = {"calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0}
+_rng = random.Random(int(os.getenv("FAKE_OPENAI_SEED", "1234")))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: about four characters per token."""
+    return max(1, len(text) // 4)
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request) -> JSONResponse:
+    payload = await request.json()
+    stats["calls"] += 1
+
+    if config["error_rate"] and _rng.random() < config["error_rate"]:
+        stats["errors"] += 1
+        status_code = _rng.choice([429, 503])
+        return JSONResponse(
+            status_code=status_code,
+            content={"error": {"message": "Simulated upstream error", "type": "server_error", "code": None}},
+            headers={"Retry-After": "1"} if status_code == 429 else None,
+        )
+
+    messages = payload.get("messages", [])
+    prompt = "".join(m.get("content") or "" for m in messages)
+    content = fake_translation(messages[-1].get("content", "") if messages else "")
+    prompt_tokens = estimate_tokens(prompt)
+    completion_tokens = min(estimate_tokens(content), payload.get("max_tokens") or 4096)
+
+    delay = config["latency_ms"] / 1000.0
+    if config["tokens_per_sec"] > 0:
+        delay += completion_tokens / config["tokens_per_sec"]
+    await asyncio.sleep(delay)
+
+    stats["prompt_tokens"] += prompt_tokens
+    stats["completion_tokens"] += completion_tokens
+    return JSONResponse(content={
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "gpt-3.5-turbo"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    })
+
+
+@app.get("/v1/models")
+async def list_models() -> Dict[str, Any]:
+    # Used by the app's connection warm-up; not counted as an upstream call
+    return {"object": "list", "data": [{"id": "gpt-3.5-turbo", "object": "model", "owned_by": "fake"}]}
+
+
+@app.get("/stats")
+async def get_stats() -> Dict[str, Any]:
+    return {**stats, "config": config}
+
+
+@app.post("/stats/reset")
+async def reset_stats() -> Dict[str, Any]:
+    for key in stats:
+        stats[key] = 0
+    return stats
+
+
+@app.patch("/config")
+async def update_config(changes: Dict[str, float]) -> Dict[str, float]:
+    config.update({k: float(v) for k, v in changes.items() if k in config})
+    return config
@@ -0,0 +1,233 @@
+"""
+End-to-end load test for the translation API.
+
+Drives a weighted mix of translation, listing and auth traffic against a
+running app (see benchmarks/README.md for the local stack), then reports
+latency percentiles, throughput and upstream calls per translation. Results
+can be saved as a named baseline and later compared against it.
+
+Usage:
+    python -m benchmarks.loadtest --duration 60 --concurrency 32 --save-baseline main
+    python -m benchmarks.loadtest --duration 60 --concurrency 32 --compare main
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.corpus import build_corpus
+from benchmarks.seed import BENCH_PASSWORD, bench_email
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_MIX = "translate=0.6,list=0.3,auth=0.1"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight)
+    unknown = set(weights) - {"translate", "list", "auth"}
+    if unknown:
+        raise ValueError(f"Unknown operations in mix: {', '.join(sorted(unknown))}")
+    return weights
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.api = args.base_url.rstrip("/") + "/api/v1"
+        self.mix = parse_mix(args.mix)
+        self.corpus = build_corpus(size=args.corpus_size, seed=args.seed)
+        self.rng = random.Random(args.seed)
+        self.tokens: List[str] = []
+        self.latencies: Dict[str, List[float]] = {op: [] for op in self.mix}
+        self.errors: Dict[str, int] = {op: 0 for op in self.mix}
+
+    async def login(self, client: httpx.AsyncClient, index: int) -> str:
+        response = await client.post(
+            f"{self.api}/auth/login",
+            data={"username": bench_email(index), "password": BENCH_PASSWORD},
+        )
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+    async def run_operation(self, client: httpx.AsyncClient, op: str) -> None:
+        user_index = self.rng.randrange(self.args.users)
+        headers = {"Authorization": f"Bearer {self.tokens[user_index]}"}
+        start = time.perf_counter()
+        try:
+            if op == "translate":
+                response = await client.post(
+                    f"{self.api}/translations/",
+                    json=self.rng.choice(self.corpus),
+                    headers=headers,
+                )
+            elif op == "list":
+                response = await client.get(
+                    f"{self.api}/translations/", params={"limit": 20}, headers=headers
+                )
+            else:
+                await self.login(client, user_index)
+                response = None
+            if response is not None and response.status_code >= 400:
+                self.errors[op] += 1
+        except httpx.HTTPError:
+            self.errors[op] += 1
+        self.latencies[op].append((time.perf_counter() - start) * 1000)
+
+    async def worker(self, client: httpx.AsyncClient, deadline: float) -> None:
+        ops = list(self.mix)
+        weights = [self.mix[op] for op in ops]
+        while time.perf_counter() < deadline:
+            op = self.rng.choices(ops, weights=weights)[0]
+            await self.run_operation(client, op)
+
+    async def upstream_calls(self, client: httpx.AsyncClient) -> Optional[int]:
+        if not self.args.fake_url:
+            return None
+        response = await client.get(f"{self.args.fake_url.rstrip('/')}/stats")
+        return response.json()["calls"]
+
+    async def run(self) -> Dict[str, Any]:
+        limits = httpx.Limits(max_connections=self.args.concurrency * 2)
+        async with httpx.AsyncClient(timeout=self.args.timeout, limits=limits) as client:
+            self.tokens = [await self.login(client, i) for i in range(self.args.users)]
+
+            # Warm-up traffic is discarded so connection setup does not skew results
+            warmup_deadline = time.perf_counter() + self.args.warmup
+            await asyncio.gather(*(self.worker(client, warmup_deadline) for _ in range(self.args.concurrency)))
+            self.latencies = {op: [] for op in self.mix}
+            self.errors = {op: 0 for op in self.mix}
+
+            calls_before = await self.upstream_calls(client)
+            started = time.perf_counter()
+            deadline = started + self.args.duration
+            await asyncio.gather(*(self.worker(client, deadline) for _ in range(self.args.concurrency)))
+            elapsed = time.perf_counter() - started
+            calls_after = await self.upstream_calls(client)
+
+        return self.summarize(elapsed, calls_before, calls_after)
+
+    def summarize(self, elapsed: float, calls_before: Optional[int], calls_after: Optional[int]) -> Dict[str, Any]:
+        total = sum(len(samples) for samples in self.latencies.values())
+        translations = len(self.latencies.get("translate", []))
+        upstream = None if calls_before is None else calls_after - calls_before
+        return {
+            "config": {
+                "concurrency": self.args.concurrency,
+                "duration_s": self.args.duration,
+                "mix": self.mix,
+                "users": self.args.users,
+                "seed": self.args.seed,
+            },
+            "requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "upstream_calls": upstream,
+            "upstream_calls_per_request": round(upstream / total, 4) if upstream is not None and total else None,
+            "upstream_calls_per_translation": (
+                round(upstream / translations, 4) if upstream is not None and translations else None
+            ),
+            "operations": {
+                op: {
+                    "count": len(samples),
+                    "errors": self.errors[op],
+                    "p50_ms": round(percentile(samples, 50), 2),
+                    "p95_ms": round(percentile(samples, 95), 2),
+                    "p99_ms": round(percentile(samples, 99), 2),
+                }
+                for op, samples in self.latencies.items()
+            },
+        }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"{'operation':<12}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for op, row in result["operations"].items():
+        print(
+            f"{op:<12}{row['count']:>8}{row['errors']:>8}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+        )
+    print(f"\nthroughput: {result['rps']} req/s over {result['requests']} requests")
+    if result["upstream_calls"] is not None:
+        print(
+            f"upstream calls: {result['upstream_calls']} "
+            f"({result['upstream_calls_per_request']} per request, "
+            f"{result['upstream_calls_per_translation']} per translation)"
+        )
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a description of every metric that regressed by more than `threshold`."""
+    regressions = []
+    if baseline["rps"] and result["rps"] < baseline["rps"] * (1 - threshold):
+        regressions.append(f"rps {baseline['rps']} -> {result['rps']}")
+    for op, base_row in baseline["operations"].items():
+        row = result["operations"].get(op)
+        if not row:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if base_row[metric] and row[metric] > base_row[metric] * (1 + threshold):
+                regressions.append(f"{op} {metric} {base_row[metric]} -> {row[metric]}")
+    base_upstream = baseline.get("upstream_calls_per_translation")
+    upstream = result.get("upstream_calls_per_translation")
+    if base_upstream and upstream and upstream > base_upstream * (1 + threshold):
+        regressions.append(f"upstream calls per translation {base_upstream} -> {upstream}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--fake-url", default="http://localhost:8100", help="Fake OpenAI server; empty to skip")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--corpus-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative regression")
+    parser.add_argument("--output", help="Write the JSON result to this path")
+    args = parser.parse_args()
+
+    result = asyncio.run(LoadTest(args).run())
+    print_report(result)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save_baseline}.json"
+        path.write_text(json.dumps(result, indent=2))
+        print(f"\nSaved baseline to {path}")
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions against '{args.compare}' (threshold {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against '{args.compare}'.")
+
+
+if __name__ == "__main__":
+    main()
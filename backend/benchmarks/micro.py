@@ -0,0 +1,216 @@
+"""
+Microbenchmarks for code that runs on every request.
+
+Each benchmark reports the best per-call time (in microseconds) over several
+repeats. Results can be saved as a baseline, compared against one with a
+regression threshold, and appended to a history file to track drift over time.
+
+Usage:
+    python -m benchmarks.micro
+    python -m benchmarks.micro --save-baseline main
+    python -m benchmarks.micro --compare main --threshold 0.20
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from fastapi import FastAPI
+from jose import jwt
+
+from app.core.config import settings
+from app.core.middleware import setup_middleware
+from app.core.security import create_access_token
+from app.schemas.schemas import TranslationResponse
+from app.services.cache_codec import CacheCodec
+from app.services.translation import TranslationService
+from benchmarks.corpus import build_corpus
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+HISTORY_FILE = BASELINE_DIR / "micro-history.jsonl"
+
+Benchmark = Callable[[], Any]
+
+
+def time_call(func: Benchmark, repeat: int) -> float:
+    """Best per-call time in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def asgi_request_runner(app: FastAPI, path: str = "/ping") -> Benchmark:
+    """Drive one GET request through the ASGI app without a server or socket."""
+    loop = asyncio.new_event_loop()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"accept-encoding", b"gzip")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+
+    async def send(message: Dict[str, Any]) -> None:
+        pass
+
+    async def request() -> None:
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive() -> Dict[str, Any]:
+            if messages:
+                return messages.pop()
+            # Nothing more to read: block like a connection that stays open
+            await asyncio.Event().wait()
+            return {"type": "http.disconnect"}
+
+        await app(scope, receive, send)
+
+    def run() -> None:
+        loop.run_until_complete(request())
+
+    return run
+
+
+def build_app(with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+    if with_middleware:
+        setup_middleware(app)
+
+    @app.get("/ping")
+    async def ping() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+def build_benchmarks() -> Dict[str, Benchmark]:
+    service = TranslationService()
+    sample = build_corpus(size=1, seed=7)[0]
+    context = {"domain": "legal", "tone": "formal"}
+    result = {
+        "translated_text": "Kişisel veriler yalnızca bu bildirimde açıklanan amaçlarla işlenir.",
+        "source_lang": "en",
+        "target_lang": "tr",
+        "context_applied": True,
+    }
+    encoded = json.dumps(result)
+    codec = CacheCodec(compression="zlib")
+    encoded_binary = codec.encode(result)
+    token = create_access_token(subject=42)
+    now = datetime.now(timezone.utc)
+    translation = {
+        "id": 1,
+        "user_id": 42,
+        "source_text": sample["source_text"],
+        "translated_text": result["translated_text"],
+        "source_lang": "en",
+        "target_lang": "tr",
+        "context": context,
+        "created_at": now,
+        "updated_at": now,
+        "metadata": {"gpt_model": "gpt-3.5-turbo"},
+    }
+
+    def cache_key() -> str:
+        # What every request pays: canonical form, profile selection and the namespace lookup
+        text, canonical_context, _ = service._canonicalize(sample["source_text"], context)
+        return service._current_key(text, "en", "tr", canonical_context)
+
+    return {
+        "cache_key": cache_key,
+        "cache_value_encode": lambda: json.dumps(result),
+        "cache_value_decode": lambda: json.loads(encoded),
+        "cache_value_encode_binary": lambda: codec.encode(result),
+        "cache_value_decode_binary": lambda: codec.decode(encoded_binary),
+        "jwt_decode": lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"]),
+        "translation_response_serialize": lambda: TranslationResponse(translation=translation).model_dump_json(),
+        "asgi_bare_request": asgi_request_runner(build_app(with_middleware=False)),
+        "asgi_middleware_request": asgi_request_runner(build_app(with_middleware=True)),
+    }
+
+
+def run_benchmarks(repeat: int, only: List[str]) -> Dict[str, float]:
+    results = {}
+    for name, func in build_benchmarks().items():
+        if only and name not in only:
+            continue
+        results[name] = round(time_call(func, repeat), 3)
+    if "asgi_bare_request" in results and "asgi_middleware_request" in results:
+        results["middleware_overhead"] = round(
+            results["asgi_middleware_request"] - results["asgi_bare_request"], 3
+        )
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None or name == "middleware_overhead" or base <= 0:
+            continue
+        if current > base * (1 + threshold):
+            regressions.append(f"{name}: {base:.3f}us -> {current:.3f}us (+{current / base - 1:.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", default=[], help="Run only these benchmarks")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Allowed relative slowdown")
+    parser.add_argument("--no-history", action="store_true", help="Do not append to the history file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repeat, args.only)
+    for name, micros in results.items():
+        print(f"{name:<34}{micros:>12.3f} us")
+
+    BASELINE_DIR.mkdir(exist_ok=True)
+    if not args.no_history:
+        with HISTORY_FILE.open("a") as history:
+            history.write(json.dumps({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "revision": git_revision(),
+                "python": sys.version.split()[0],
+                "results": results,
+            }) + "\n")
+    if args.save_baseline:
+        path = BASELINE_DIR / f"micro-{args.save_baseline}.json"
+        path.write_text(json.dumps(results, indent=2))
+        print(f"\nSaved baseline to {path}")
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"micro-{args.compare}.json").read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions against '{args.compare}' (threshold {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against '{args.compare}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Create the schema and a pool of benchmark users with effectively unlimited quotas.
+
+Usage:
+    python -m benchmarks.seed --users 20
+"""
+import argparse
+
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal, engine
+from app.models.base import Base
+from app.models.models import Subscription, SubscriptionTier, User
+
+BENCH_PASSWORD = "bench-password"
+
+
+def bench_email(index: int) -> str:
+    return f"bench{index}@example.com"
+
+
+def seed_users(db: Session, count: int) -> None:
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    for index in range(count):
+        user = db.query(User).filter(User.email == bench_email(index)).first()
+        if user is None:
+            user = User(
+                email=bench_email(index),
+                hashed_password=hashed_password,
+                full_name=f"Bench User {index}",
+                company_name=f"Bench Co {index % 4}",
+                is_active=True
+            )
+            db.add(user)
+            db.flush()
+        if user.subscription is None:
+            db.add(Subscription(
+                user_id=user.id,
+                tier=SubscriptionTier.ENTERPRISE,
+                monthly_requests_limit=10**9,
+                current_requests_count=0,
+                is_active=True
+            ))
+        else:
+            user.subscription.monthly_requests_limit = 10**9
+            user.subscription.is_active = True
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        seed_users(db, args.users)
+        print(f"Seeded {args.users} benchmark users.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Cold-start benchmark and import-time report for the API worker.
+
+Each sample runs a fresh interpreter that imports `app.main` and runs the
+application's lifespan startup (including connection warm-up), which is
+what a new uvicorn worker does before it reports ready. The median must
+stay within the budget, and the heavy provider SDKs must not be imported by
+`import app.main` itself; warm-up may load them before the worker is ready.
+
+Run it against the benchmark stack so warm-up reaches real services, or
+pass --no-warmup to time import and lifespan alone.
+
+Usage:
+    python -m benchmarks.startup                       # report + budget check
+    python -m benchmarks.startup --budget-ms 1500 --runs 7
+    python -m benchmarks.startup --importtime --top 25  # slowest imports
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 2000.0
+
+# SDKs that should only load when a request actually needs them
+LAZY_MODULES = ("openai", "stripe", "boto3", "requests")
+
+STARTUP_SCRIPT = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+eager = [m for m in %r if m in sys.modules]
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "ready_ms": (ready - start) * 1000,
+    "eager_modules": eager,
+}))
+""" % (LAZY_MODULES,)
+
+
+def run_python(args: List[str], warmup: bool = True) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    if not warmup:
+        env.update({
+            "WARMUP_DB_CONNECTIONS": "0",
+            "WARMUP_REDIS_CONNECTIONS": "0",
+            "WARMUP_UPSTREAM_CONNECTIONS": "0",
+        })
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def measure_startup(runs: int, warmup: bool) -> Dict[str, object]:
+    samples = []
+    eager: List[str] = []
+    for _ in range(runs):
+        output = run_python(["-c", STARTUP_SCRIPT], warmup=warmup).stdout.strip().splitlines()[-1]
+        sample = json.loads(output)
+        samples.append(sample)
+        eager = sample["eager_modules"]
+    return {
+        "runs": runs,
+        "import_ms_median": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "ready_ms_median": round(statistics.median(s["ready_ms"] for s in samples), 1),
+        "ready_ms_max": round(max(s["ready_ms"] for s in samples), 1),
+        "eager_modules": eager,
+    }
+
+
+def import_time_report(top: int) -> List[Tuple[int, int, str]]:
+    """Parse `python -X importtime` output into (cumulative_us, self_us, module) rows."""
+    stderr = run_python(["-X", "importtime", "-c", "import app.main"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative_us), int(self_us), module))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--no-warmup", action="store_true", help="Disable connection warm-up")
+    parser.add_argument("--importtime", action="store_true", help="Print the slowest imports")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.importtime:
+        print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+        for cumulative_us, self_us, module in import_time_report(args.top):
+            print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {module}")
+        print()
+
+    result = measure_startup(args.runs, warmup=not args.no_warmup)
+    print(f"import app.main (median): {result['import_ms_median']} ms")
+    print(f"ready to serve (median):  {result['ready_ms_median']} ms (max {result['ready_ms_max']} ms)")
+    print(f"budget:                   {args.budget_ms} ms")
+
+    failures = []
+    if result["ready_ms_median"] > args.budget_ms:
+        failures.append(f"startup {result['ready_ms_median']} ms exceeds budget {args.budget_ms} ms")
+    if result["eager_modules"]:
+        failures.append(f"modules imported at startup: {', '.join(result['eager_modules'])}")
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+import pytest
+from app.core.config import settings
+from app.services.backends import BackendRouter, FakeBackend
+from app.services.translation import TranslationService
+from app.services.translation_memory import TranslationMemory
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio commands the app uses."""
+
+    def __init__(self):
+        self.store: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Optional[Any]:
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.store[key]
+            return None
+        return value
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._live(key)
+
+    async def execute_command(self, command: str, key: str, **options: Any) -> Optional[Any]:
+        assert command == "GET"
+        return self._live(key)
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self._live(key) is not None:
+            return None
+        self.store[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    async def setex(self, key: str, ttl: int, value: Any) -> bool:
+        return await self.set(key, value, ex=ttl)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        _, expires_at = self.store.get(key, (None, None))
+        self.store[key] = (str(value), expires_at)
+        return value
+
+    async def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.store.pop(key, None) is not None)
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        value = self._live(key)
+        if value is None:
+            return False
+        self.store[key] = (value, time.monotonic() + ttl)
+        return True
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        fields = self._live(key) or {}
+        fields[field] = str(int(fields.get(field, 0)) + amount)
+        self.store.setdefault(key, (fields, None))
+        return int(fields[field])
+
+    async def hgetall(self, key: str) -> Dict[str, Any]:
+        return dict(self._live(key) or {})
+
+    async def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        members = self._live(key) or {}
+        added = sum(1 for member in mapping if member not in members)
+        members.update(mapping)
+        self.store[key] = (members, self.store.get(key, (None, None))[1])
+        return added
+
+    async def zcard(self, key: str) -> int:
+        return len(self._live(key) or {})
+
+    async def zpopmin(self, key: str, count: int = 1) -> list:
+        members = self._live(key) or {}
+        popped = sorted(members.items(), key=lambda item: item[1])[:count]
+        for member, _ in popped:
+            del members[member]
+        return popped
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis on execute()."""
+
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name: str):
+        def queue(*args: Any, **kwargs: Any) -> "FakePipeline":
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> list:
+        commands, self.commands = self.commands, []
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
+
+@pytest.fixture
+def make_translation_service(fake_redis):
+    """Build a service on a `FakeBackend` and `fake_redis`, without micro-batching or translation memory."""
+    def make() -> TranslationService:
+        service = TranslationService(router=BackendRouter([FakeBackend()]), memory=TranslationMemory(enabled=False))
+        service._redis = fake_redis
+        service.batcher = None
+        return service
+    return make
+
+@pytest.fixture
+def translation_service(make_translation_service) -> TranslationService:
+    return make_translation_service()
+
+@pytest.fixture(autouse=True)
+def no_translation_memory(monkeypatch):
+    """Services built from settings would otherwise query the database configured in .env."""
+    monkeypatch.setattr(settings, "TRANSLATION_MEMORY_ENABLED", False)
@@ -0,0 +1,44 @@
+import asyncio
+import time
+import pytest
+from app.core.admission import AdmissionController, LoopLagMonitor
+
+def make_controller(load: dict) -> AdmissionController:
+    controller = AdmissionController(high_priority_headroom=1.5, retry_after=3.0)
+    controller.register_signal("in_flight_translations", lambda: load["in_flight"], 10)
+    controller.register_signal("upstream_queue", lambda: load["queue"], 4)
+    controller.register_signal("disabled", lambda: 1000, 0)
+    return controller
+
+def test_low_priority_is_shed_first_and_counted_by_reason():
+    load = {"in_flight": 5, "queue": 5}
+    controller = make_controller(load)
+
+    rejected = controller.check(high_priority=False, priority_name="free")
+    assert not rejected.admitted
+    assert rejected.reason == "upstream_queue"
+    assert rejected.retry_after == 3.0
+    assert controller.check(high_priority=True, priority_name="enterprise").admitted
+
+    load["queue"] = 7
+    assert not controller.check(high_priority=True, priority_name="enterprise").admitted
+
+    snapshot = controller.snapshot()
+    assert snapshot["rejected_by_reason"] == {"upstream_queue": 2}
+    assert snapshot["rejected_by_priority"] == {"free": 1, "enterprise": 1}
+    assert "disabled" not in snapshot["signals"]
+
+def test_everything_is_admitted_below_the_limits():
+    controller = make_controller({"in_flight": 9, "queue": 3})
+    assert controller.check(priority_name="free").admitted
+    assert controller.snapshot()["admitted"] == 1
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_sees_a_blocked_loop():
+    monitor = LoopLagMonitor(interval=0.01, alpha=1.0)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # block the loop
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    assert monitor.max_lag_ms >= 50
@@ -0,0 +1,54 @@
+import pytest
+from app.services.backends import BackendRouter, CompletionRequest, FakeBackend
+
+def make_request(text: str = "Save") -> CompletionRequest:
+    return CompletionRequest(
+        model="test-model",
+        messages=[
+            {"role": "system", "content": "translate"},
+            {"role": "user", "content": f"Translate the following text from en to tr:\n\n{text}"},
+        ],
+    )
+
+@pytest.mark.asyncio
+async def test_router_fails_over_and_deprioritizes_failing_backend():
+    broken = FakeBackend("broken", fail=True)
+    healthy = FakeBackend("healthy")
+    router = BackendRouter([broken, healthy])
+
+    result = await router.complete(make_request())
+    assert result.backend == "healthy"
+    assert result.content == "[tr] Save"
+    assert [b.name for b in router.ranked()] == ["healthy", "broken"]
+
+    await router.complete(make_request())
+    assert broken.calls == 1
+
+@pytest.mark.asyncio
+async def test_router_prefers_lower_latency():
+    slow = FakeBackend("slow", latency=0.02)
+    fast = FakeBackend("fast", latency=0.0)
+    router = BackendRouter([slow, fast])
+    await router.complete(make_request())
+    await router.complete(make_request())
+    assert router.ranked()[0].name == "fast"
+
+@pytest.mark.asyncio
+async def test_router_raises_when_every_backend_fails():
+    router = BackendRouter([FakeBackend("a", fail=True), FakeBackend("b", fail=True)])
+    with pytest.raises(RuntimeError):
+        await router.complete(make_request())
+
+def test_error_rate_decays_while_idle():
+    router = BackendRouter([FakeBackend("a")], error_half_life=10.0)
+    stats = router.stats["a"]
+    stats.record_failure(5.0)
+    now = stats._updated_at
+    assert stats.error_rate(now + 10.0) == pytest.approx(stats.error_rate(now) / 2)
+
+@pytest.mark.asyncio
+async def test_translation_records_model_and_backend(translation_service):
+    result = await translation_service.translate("Save", "en", "tr")
+    assert result["translated_text"] == "[tr] Save"
+    assert result["backend"] == "fake"
+    assert result["model"]
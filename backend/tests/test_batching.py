@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from app.services.backends import CompletionResult
+from app.services.batching import MicroBatcher, parse_batch_response
+from app.services.profiles import get_profiles
+
+def test_parse_batch_response_drops_bad_segments():
+    content = "[1] Kaydet\n[2] İptal\n[2] Vazgeç\n[7] Fazla\nnoise\n[3] "
+    assert parse_batch_response(content, 3) == {1: "Kaydet"}
+
+@pytest.mark.asyncio
+async def test_concurrent_short_translations_share_one_upstream_call(translation_service):
+    backend = translation_service.router.backends[0]
+    translation_service.batcher = MicroBatcher(translation_service.router.complete, window_ms=5, max_size=16, max_tokens_cap=1500)
+    texts = ["Save", "Cancel", "Delete", "Sign in"]
+    results = await asyncio.gather(*(translation_service.translate(text, "en", "tr") for text in texts))
+
+    assert [r["translated_text"] for r in results] == [f"[tr] {text}" for text in texts]
+    assert backend.calls == 1
+    stats = translation_service.batcher.stats.snapshot()
+    assert stats["batches"] == 1
+    assert stats["requests_per_upstream_call"] == 4.0
+
+@pytest.mark.asyncio
+async def test_malformed_batch_reply_falls_back_to_individual_calls():
+    calls = []
+
+    async def complete(request):
+        calls.append(request)
+        user_message = request.messages[-1]["content"]
+        content = "[1] Kaydet" if "segments" in user_message else "İptal"
+        return CompletionResult(content=content, model=request.model, backend="test", latency_ms=1.0)
+
+    batcher = MicroBatcher(complete, window_ms=5, max_size=16, max_tokens_cap=1500)
+    short = get_profiles()["short"]
+    first, second = await asyncio.gather(
+        batcher.submit(short, "Save", "en", "tr", None),
+        batcher.submit(short, "Cancel", "en", "tr", None),
+    )
+
+    assert first.content == "Kaydet"
+    assert second.content == "İptal"
+    assert len(calls) == 2
+    assert batcher.stats.snapshot()["fallback_items"] == 1
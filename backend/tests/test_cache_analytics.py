@@ -0,0 +1,77 @@
+import time
+import pytest
+from app.services.cache_analytics import CacheAnalytics, Histogram, TopK
+
+def test_top_k_keeps_the_heavy_hitters():
+    top = TopK(k=3)
+    for i in range(200):
+        top.record("hot", "en->tr")
+        top.record("warm" if i % 2 else f"cold-{i}")
+    ranked = top.top()
+    assert [entry["key"] for entry in ranked[:2]] == ["hot", "warm"]
+    assert ranked[0]["count"] == 200
+    assert ranked[0]["label"] == "en->tr"
+    assert ranked[1]["count"] - ranked[1]["error"] <= 100
+
+def test_histogram_buckets_values():
+    histogram = Histogram((100, 1000))
+    for value in (10, 100, 500, 5000):
+        histogram.record(value)
+    assert histogram.snapshot()["buckets"] == {"<=100": 2, "<=1000": 1, ">1000": 1}
+
+def test_early_miss_counts_as_eviction(monkeypatch):
+    analytics = CacheAnalytics(lifetime_sample=1.0)
+    analytics.record_write("evicted", 300, ttl=3600)
+    analytics.record_write("expired", 300, ttl=60)
+    written_at = analytics._written["expired"][0]
+    monkeypatch.setattr(time, "time", lambda: written_at + 120)
+    analytics.record_lookup("evicted", False, "Acme", "en", "tr")
+    analytics.record_lookup("expired", False, "Acme", "en", "tr")
+
+    lifetimes = analytics.snapshot()["lifetime_seconds"]
+    assert lifetimes["evicted"] == 1
+    assert lifetimes["expired"] == 1
+    assert lifetimes["buckets"]["<=600"] == 2
+
+def test_tenants_beyond_the_limit_are_grouped():
+    analytics = CacheAnalytics(max_tenants=2)
+    for tenant in ("a", "b", "c", "d"):
+        analytics.record_lookup(tenant, True, tenant, "en", "tr")
+    assert set(analytics.snapshot()["hit_ratio_by_tenant"]) == {"a", "b", "other"}
+
+@pytest.mark.asyncio
+async def test_translation_service_reports_by_tenant_and_pair(translation_service):
+    translation_service.tenant_memory.enabled = False
+    for _ in range(3):
+        await translation_service.translate("Save changes", "en", "tr", tenant="Acme")
+    await translation_service.translate("Kaydet", "tr", "en", tenant="Globex")
+
+    snapshot = translation_service.analytics.snapshot()
+    assert snapshot["hit_ratio_by_tenant"]["Acme"] == {"hits": 2, "misses": 1, "hit_ratio": 0.6667}
+    assert snapshot["hit_ratio_by_tenant"]["Globex"]["misses"] == 1
+    assert snapshot["hit_ratio_by_pair"]["en->tr"]["hits"] == 2
+    assert snapshot["hot_keys"][0]["count"] == 3
+    assert snapshot["value_bytes"]["count"] == 2
+
+@pytest.mark.asyncio
+async def test_hit_ratios_are_totalled_across_workers(fake_redis):
+    workers = [CacheAnalytics(flush_seconds=0), CacheAnalytics(flush_seconds=0)]
+    workers[0].record_lookup("k1", True, "Acme", "en", "tr")
+    workers[0].record_lookup("k2", False, "Acme", "en", "tr")
+    workers[1].record_lookup("k1", True, "Acme", "en", "tr")
+    for analytics in workers:
+        await analytics.flush(fake_redis, analytics.take_pending())
+    assert workers[0].take_pending() == {}
+
+    cluster = await workers[0].cluster_snapshot(fake_redis)
+    assert cluster["hit_ratio_by_tenant"]["Acme"] == {"hits": 2, "misses": 1, "hit_ratio": 0.6667}
+    assert cluster["hit_ratio_by_pair"]["en->tr"]["hits"] == 2
+    assert workers[0].snapshot()["scope"] == "worker"
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried_with_the_next_one():
+    analytics = CacheAnalytics(flush_seconds=0)
+    analytics.record_lookup("k1", True, None, "en", "tr")
+    await analytics.flush(None, analytics.take_pending())
+    assert analytics.flush_errors == 1
+    assert analytics.take_pending() == {("tenant", "anonymous:hits"): 1, ("pair", "en->tr:hits"): 1}
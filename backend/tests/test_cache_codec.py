@@ -0,0 +1,89 @@
+import json
+import zlib
+import pytest
+from app.services.cache_codec import COMPRESSION_NONE, COMPRESSION_ZLIB, MAGIC, CacheCodec, JsonCodec
+
+RESULT = {
+    "translated_text": "Kişisel veriler yalnızca bu bildirimde açıklanan amaçlarla işlenir.",
+    "source_lang": "en",
+    "target_lang": "tr",
+    "context_applied": True,
+    "model": "gpt-3.5-turbo",
+    "backend": "openai",
+    "profile": "standard",
+    "latency_ms": 412.37,
+}
+
+def test_binary_round_trip_is_smaller_than_json():
+    codec = CacheCodec(compression="zlib")
+    encoded = codec.encode(RESULT)
+    assert encoded.startswith(MAGIC)
+    assert codec.decode(encoded) == RESULT
+    assert len(encoded) < len(json.dumps(RESULT))
+
+def test_unknown_fields_survive_a_round_trip():
+    codec = CacheCodec()
+    value = {**RESULT, "derived": True}
+    assert codec.decode(codec.encode(value)) == value
+
+def test_legacy_json_entries_are_still_readable():
+    codec = CacheCodec()
+    assert codec.decode(json.dumps(RESULT)) == RESULT
+    assert codec.decode(json.dumps(RESULT).encode("utf-8")) == RESULT
+    assert codec.decode(None) is None
+
+def test_json_encoding_is_readable_without_the_codec():
+    codec = CacheCodec()
+    encoded = codec.encode(RESULT, binary=False)
+    assert json.loads(encoded.decode("utf-8")) == RESULT
+    assert codec.decode(encoded) == RESULT
+
+def test_only_values_above_the_threshold_are_compressed():
+    codec = CacheCodec(compression="zlib", min_compress_bytes=256)
+    assert codec.encode(RESULT)[2] == COMPRESSION_NONE
+
+    long_value = {**RESULT, "translated_text": RESULT["translated_text"] * 10}
+    encoded = codec.encode(long_value)
+    assert encoded[2] == COMPRESSION_ZLIB
+    assert codec.decode(encoded) == long_value
+
+def test_unknown_version_is_treated_as_a_miss():
+    codec = CacheCodec()
+    assert codec.decode(MAGIC + bytes((99, COMPRESSION_ZLIB)) + zlib.compress(b"[]")) is None
+
+def test_corrupt_values_are_treated_as_a_miss():
+    codec = CacheCodec(compression="zlib")
+    long_value = {**RESULT, "translated_text": RESULT["translated_text"] * 10}
+    truncated = codec.encode(long_value)[:-20]
+    assert codec.decode(truncated) is None
+    assert codec.decode(MAGIC + bytes((1, COMPRESSION_NONE)) + b"[1, 2") is None
+    assert codec.decode(b"not json") is None
+    assert codec.decode("[1, 2]") is None
+
+@pytest.mark.asyncio
+async def test_corrupt_entry_falls_through_to_upstream(translation_service, fake_redis):
+    backend = translation_service.router.backends[0]
+    await fake_redis.setex(translation_service._current_key("Save", "en", "tr", {}), 60, MAGIC + b"\x01\x01garbage")
+
+    result = await translation_service.translate("Save", "en", "tr")
+    assert result["translated_text"] == "[tr] Save"
+    assert backend.calls == 1
+
+@pytest.mark.asyncio
+async def test_service_reads_entries_written_as_json(translation_service, fake_redis):
+    backend = translation_service.router.backends[0]
+    key = translation_service._current_key("Save", "en", "tr", {})
+    await fake_redis.setex(key, 60, json.dumps({**RESULT, "translated_text": "Kaydet"}))
+
+    result = await translation_service.translate("Save", "en", "tr")
+    assert result["translated_text"] == "Kaydet"
+    assert result["cached"] is True
+    assert backend.calls == 0
+
+    await translation_service.translate("Cancel", "en", "tr")
+    stored = fake_redis.store[translation_service._current_key("Cancel", "en", "tr", {})][0]
+    assert stored.startswith(MAGIC)
+
+def test_json_codec_accepts_the_binary_flag():
+    value = {**RESULT, "translated_text": "Kaydet"}
+    assert json.loads(JsonCodec(compression="none").encode(value, binary=True)) == value
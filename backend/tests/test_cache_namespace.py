@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from app.core.lifecycle import tasks
+from app.services import cache_namespace as namespace_module
+from app.services.cache_codec import codec
+from app.services.cache_namespace import LEGACY, CacheNamespaces, namespace_for
+from app.services.profiles import get_profiles
+
+OLD = {"translated_text": "Eski", "source_lang": "en", "target_lang": "tr", "context_applied": False}
+
+def with_namespaces(service, **namespaces):
+    service.tenant_memory.enabled = False
+    service.namespaces = CacheNamespaces(service._get_redis, **namespaces)
+    return service
+
+async def seed(fake_redis, service, text, namespace=LEGACY):
+    key = service._generate_cache_key(text, "en", "tr", {}, namespace)
+    await fake_redis.set(key, codec.encode({**OLD, "translated_text": f"{text} (old)"}))
+
+def test_namespace_follows_model_prompt_and_salt(monkeypatch):
+    profile = get_profiles()["short"]
+    original = namespace_for(profile)
+    assert namespace_for(get_profiles()["short"]) == original
+    assert namespace_for(profile, salt="v2") != original
+
+    monkeypatch.setattr(namespace_module.settings, "TRANSLATION_MODEL_SHORT", "another-model")
+    assert namespace_for(get_profiles()["short"]) != original
+
+    monkeypatch.setattr(namespace_module, "build_messages", lambda *args: [{"role": "system", "content": "new"}])
+    assert namespace_for(profile) != original
+
+@pytest.mark.asyncio
+async def test_legacy_entry_is_served_then_retranslated(translation_service, fake_redis):
+    service = with_namespaces(translation_service)
+    await seed(fake_redis, service, "Save")
+    before = set(tasks._tasks)
+
+    served = await service.translate("Save", "en", "tr")
+    assert served["translated_text"] == "Save (old)"
+    assert served["stale"] is True
+    await asyncio.gather(*(tasks._tasks - before))
+
+    fresh = await service.translate("Save", "en", "tr")
+    assert fresh["translated_text"] != "Save (old)"
+    assert fresh["stale"] is False
+    assert service.router.backends[0].calls == 1
+    assert service.namespaces.fallback_hits == 1
+
+@pytest.mark.asyncio
+async def test_revalidation_is_rate_capped(translation_service, fake_redis):
+    service = with_namespaces(translation_service, revalidate_per_second=0.001)
+    for text in ("Save", "Cancel", "Delete"):
+        await seed(fake_redis, service, text)
+    before = set(tasks._tasks)
+
+    for text in ("Save", "Cancel", "Delete"):
+        assert (await service.translate(text, "en", "tr"))["stale"] is True
+    await asyncio.gather(*(tasks._tasks - before))
+
+    assert service.router.backends[0].calls == 1
+    snapshot = service.namespaces.snapshot()
+    assert snapshot["revalidations"] == 1
+    assert snapshot["revalidations_deferred"] == 2
+
+@pytest.mark.asyncio
+async def test_registry_keeps_the_previous_namespace(make_translation_service):
+    first = with_namespaces(make_translation_service())
+    await first.translate("Save", "en", "tr")
+
+    upgraded = with_namespaces(make_translation_service(), salt="v2")
+    served = await upgraded.translate("Save", "en", "tr")
+    short = get_profiles()["short"]
+    assert served["stale"] is True
+    assert upgraded.namespaces.snapshot()["previous"] == {"short": [first.namespaces.current(short)]}
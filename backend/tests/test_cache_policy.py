@@ -0,0 +1,75 @@
+import asyncio
+import time
+import pytest
+from app.core.lifecycle import tasks
+from app.services.cache_codec import codec
+from app.services.cache_policy import FRESH_UNTIL, CachePolicy, FrequencySketch
+
+def test_ttl_grows_with_request_frequency_up_to_the_cap():
+    policy = CachePolicy(min_ttl=3600, base_ttl=86400, max_ttl=604800, stale_ratio=0.5)
+    policy.record_access("key")
+    assert policy.ttl("key") == (3600, 5400)
+    policy.record_access("key")
+    assert policy.ttl("key")[0] == 86400
+    policy.record_access("key")
+    assert policy.ttl("key")[0] == 86400 * 2
+    for _ in range(10):
+        policy.record_access("key")
+    assert policy.ttl("key") == (604800, 907200)
+
+def test_large_entries_are_admitted_from_their_second_request():
+    policy = CachePolicy(admit_min_hits=2, admit_always_bytes=512, max_entry_bytes=4096)
+    policy.record_access("short")
+    assert policy.admit("short", 100)
+
+    policy.record_access("paragraph")
+    assert not policy.admit("paragraph", 2000)
+    policy.record_access("paragraph")
+    assert policy.admit("paragraph", 2000)
+
+    assert not policy.admit("paragraph", 10000)
+    assert policy.rejected == {"one_off": 1, "oversized": 1}
+
+def test_sketch_ages_counts_to_follow_recent_traffic():
+    sketch = FrequencySketch(max_entries=100, sample_size=10)
+    for _ in range(6):
+        sketch.record("hot")
+    for i in range(4):
+        sketch.record(f"cold-{i}")
+    assert sketch.estimate("hot") == 3
+    assert sketch.estimate("cold-0") == 0
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_one_refresh_runs(translation_service, fake_redis):
+    backend = translation_service.router.backends[0]
+    backend.latency = 0.02
+    key = translation_service._current_key("Save", "en", "tr", {})
+    stale = {"translated_text": "Kaydet (old)", "source_lang": "en", "target_lang": "tr", FRESH_UNTIL: int(time.time()) - 1}
+    await fake_redis.setex(key, 60, codec.encode(stale))
+
+    before = set(tasks._tasks)
+    results = await asyncio.gather(*(translation_service.translate("Save", "en", "tr") for _ in range(5)))
+    assert {r["translated_text"] for r in results} == {"Kaydet (old)"}
+    assert all(r["stale"] for r in results)
+
+    await asyncio.gather(*(tasks._tasks - before))
+    assert backend.calls == 1
+    refreshed = await translation_service.translate("Save", "en", "tr")
+    assert refreshed["translated_text"] == "[tr] Save"
+    assert refreshed["stale"] is False
+    assert translation_service.cache_policy.refreshes == 1
+
+@pytest.mark.asyncio
+async def test_large_entries_are_admitted_from_their_second_request_on_any_worker(make_translation_service, fake_redis):
+    workers = [make_translation_service(), make_translation_service()]
+    for service in workers:
+        service.cache_policy.admit_always_bytes = 10
+    text = "Personal data is processed only for the purposes described in this notice."
+    key = workers[0]._current_key(text, "en", "tr", {})
+
+    await workers[0].translate(text, "en", "tr")
+    assert key not in fake_redis.store
+    await workers[1].translate(text, "en", "tr")
+    assert key in fake_redis.store
+    assert workers[0].cache_policy.rejected == {"one_off": 1}
+    assert workers[1].cache_policy.rejected == {}
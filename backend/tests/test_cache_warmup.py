@@ -0,0 +1,82 @@
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.models.base import Base
+from app.models.models import Translation, User
+from app.services.cache_warmup import CacheWarmer, popular_translations
+from app.services.cache_namespace import namespace_for
+from app.services.canonical import content_hash
+from app.services.profiles import select_profile
+
+def produced_now(text, context=None):
+    namespace = namespace_for(select_profile(text, context), settings.CACHE_NAMESPACE_SALT)
+    return {"gpt_model": "gpt-3.5-turbo", "cache_namespace": namespace}
+
+@pytest.fixture
+def db():
+    # The warmer fetches from a worker thread, as it would against Postgres
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="warm@example.com", hashed_password="x")
+    session.add(user)
+    session.flush()
+    history = [("Save", "Kaydet", None)] * 4 + [("Cancel", "İptal", {"domain": "ecommerce"})] * 3
+    for source, translated, context in history:
+        session.add(Translation(
+            user_id=user.id, source_text=source, translated_text=translated,
+            source_lang="en", target_lang="tr", context=context, meta_data=produced_now(source, context)
+        ))
+    # From before cache namespaces were recorded
+    session.add(Translation(
+        user_id=user.id, source_text="  Delete\n", translated_text="  Sil (old)\n",
+        source_lang="en", target_lang="tr", meta_data={"gpt_model": "gpt-3.5-turbo"}
+    ))
+    # Same request as the first "Delete", stored with its hash
+    for source in ("Delete", "Delete  \n"):
+        session.add(Translation(
+            user_id=user.id, source_text=source, translated_text="Sil", source_lang="en", target_lang="tr",
+            content_hash=content_hash(source, "en", "tr", None), meta_data=produced_now("Delete")
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+def test_history_is_streamed_most_requested_first(db):
+    rows = list(popular_translations(db, limit=2, batch_size=1))
+    assert [(row[0], row[-1]) for row in rows] == [("Save", 4), ("Cancel", 3)]
+
+def test_formatting_variants_are_one_warm_up_row(db):
+    rows = list(popular_translations(db, limit=10))
+    assert [(row[0], row[-1]) for row in rows if row[0].strip() == "Delete"] == [("Delete  \n", 2), ("  Delete\n", 1)]
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_the_cache_without_calling_upstream(db, translation_service, fake_redis):
+    backend = translation_service.router.backends[0]
+    existing = translation_service._current_key("Cancel", "en", "tr", {"domain": "ecommerce"})
+    await fake_redis.set(existing, "kept")
+
+    stats = await CacheWarmer(translation_service, batch_size=2, max_per_second=10000).run(db)
+    assert stats["scanned"] == 4
+    assert stats["written"] == 3
+    assert stats["already_cached"] == 1
+    # Output of an earlier version goes under its own namespace, where it is served stale
+    legacy_value = fake_redis.store[translation_service._generate_cache_key("Delete", "en", "tr", {})][0]
+    assert json.loads(legacy_value)["translated_text"] == "Sil (old)"
+    assert fake_redis.store[existing][0] == "kept"
+
+    result = await translation_service.translate("Save", "en", "tr")
+    assert result["translated_text"] == "Kaydet"
+    assert result["cached"] is True
+    assert (await translation_service.translate("Delete\r\n", "en", "tr"))["translated_text"] == "Sil\r\n"
+    assert backend.calls == 0
+
+def test_tenant_scoped_rows_are_not_warmed(translation_service):
+    warmer = CacheWarmer(translation_service)
+    row = ("Save", "Kaydet", "en", "tr", None, produced_now("Save"), 3)
+    assert warmer.entry(row) is not None
+    assert warmer.entry(row[:5] + ({**row[5], "tenant_memory": True}, 3)) is None
+    assert warmer.entry(row[:5] + ({**row[5], "derived": True}, 3)) is None
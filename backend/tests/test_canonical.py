@@ -0,0 +1,38 @@
+import unicodedata
+import pytest
+from app.services.canonical import canonicalize_context, canonicalize_text
+
+def test_trivially_different_texts_share_a_canonical_form():
+    variants = [
+        "Şifrenizi mi unuttunuz?",
+        "Şifrenizi mi unuttunuz?  \n",
+        unicodedata.normalize("NFD", "Şifrenizi mi unuttunuz?"),
+        "Şifrenizi mi  unuttunuz?",
+    ]
+    assert {canonicalize_text(text)[0] for text in variants} == {"Şifrenizi mi unuttunuz?"}
+
+def test_line_breaks_are_kept_and_edges_restored():
+    text = "  First line.\r\nSecond   line.  \r\n\r\n\r\nNew paragraph.\r\n"
+    canonical, layout = canonicalize_text(text)
+    assert canonical == "First line.\nSecond line.\n\n\nNew paragraph."
+    assert layout.restore("Birinci.\nİkinci.\n\nYeni.") == "  Birinci.\r\nİkinci.\r\n\r\nYeni.\r\n"
+
+def test_indentation_is_kept():
+    text = "Steps:\n  1. Open  the file\n     and save it\n\tif (ok) {\n\t\treturn;\n\t}"
+    canonical, _ = canonicalize_text(text)
+    assert canonical == "Steps:\n  1. Open the file\n     and save it\n\tif (ok) {\n\t\treturn;\n\t}"
+
+def test_context_drops_empty_and_ignored_keys():
+    context = {"domain": "legal", "tone": "", "notes": None, "request_id": "abc"}
+    assert canonicalize_context(context, ["request_id"]) == {"domain": "legal"}
+    assert canonicalize_context(None) == {}
+
+@pytest.mark.asyncio
+async def test_variants_hit_one_cache_entry_and_keep_their_whitespace(translation_service):
+    backend = translation_service.router.backends[0]
+
+    first = await translation_service.translate("Save", "en", "tr", {"request_id": "1"})
+    second = await translation_service.translate(" Save\n", "en", "tr", {"request_id": "2"})
+    assert backend.calls == 1
+    assert second["cached"] is True
+    assert second["translated_text"] == " " + first["translated_text"] + "\n"
@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from app.services.backends import BackendRouter, CompletionRequest, FakeBackend
+from app.services.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.services.hedging import Hedger
+
+class UpstreamError(Exception):
+    status_code = 503
+
+def make_request(hedge: bool = False) -> CompletionRequest:
+    return CompletionRequest(
+        model="test-model",
+        messages=[{"role": "user", "content": "Translate the following text from en to tr:\n\nSave"}],
+        hedge=hedge,
+    )
+
+def test_breaker_opens_on_failures_and_closes_after_probes():
+    breaker = CircuitBreaker("openai", window_size=4, min_calls=4, failure_rate=0.5, open_seconds=0.0, half_open_calls=2)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_success(10)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+    # open_seconds elapsed: probes are admitted, one at a time up to the limit
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success(10)
+    breaker.record_success(10)
+    assert breaker.state == CLOSED
+
+def test_breaker_opens_on_slow_calls():
+    breaker = CircuitBreaker("openai", window_size=3, min_calls=3, slow_call_ms=100, slow_call_rate=0.6)
+    for latency in (500, 20, 700):
+        breaker.before_call()
+        breaker.record_success(latency)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+@pytest.mark.asyncio
+async def test_router_skips_backend_with_open_breaker():
+    primary = FakeBackend("primary")
+    fallback = FakeBackend("fallback", latency=0.01)
+    breaker = CircuitBreaker("primary", open_seconds=60)
+    breaker._transition(OPEN)
+    router = BackendRouter([primary, fallback], breakers={"primary": breaker})
+
+    result = await router.complete(make_request())
+    assert result.backend == "fallback"
+    assert primary.calls == 0
+    assert breaker.snapshot()["rejected"] == 1
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_the_breaker():
+    class BadRequest(Exception):
+        status_code = 400
+
+    class Rejecting(FakeBackend):
+        async def complete(self, request):
+            raise BadRequest("invalid prompt")
+
+    breaker = CircuitBreaker("bad", window_size=2, min_calls=2)
+    router = BackendRouter([Rejecting("bad")], breakers={"bad": breaker})
+    for _ in range(3):
+        with pytest.raises(BadRequest):
+            await router.complete(make_request())
+    assert breaker.state == CLOSED
+
+@pytest.mark.asyncio
+async def test_hedge_wins_over_stalled_primary_and_loser_is_cancelled():
+    cancelled = []
+
+    class Stalling(FakeBackend):
+        async def complete(self, request):
+            self.calls += 1
+            if self.calls == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+            return await super().complete(request)
+
+    hedger = Hedger(min_delay_ms=10, min_samples=1)
+    hedger._latencies.append(10.0)
+    backend = Stalling("stalling")
+    router = BackendRouter([backend], hedger=hedger)
+
+    result = await asyncio.wait_for(router.complete(make_request(hedge=True)), timeout=2)
+    await asyncio.sleep(0)
+    assert result.content == "[tr] Save"
+    assert hedger.hedged == 1 and hedger.hedge_wins == 1
+    assert cancelled == [True]
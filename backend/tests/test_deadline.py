@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.deadline import bounded, deadline_scope, remaining
+from app.core.exceptions import DeadlineExceededError
+from app.core.lifecycle import tasks
+from app.core.middleware import setup_middleware
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    setup_middleware(app)
+
+    @app.get("/api/health/budget")
+    async def health_budget():
+        return {"remaining": remaining()}
+
+    @app.get("/slow")
+    async def slow():
+        return await bounded(asyncio.sleep(1, result="done"))
+
+    return app
+
+def test_route_default_and_header_set_the_deadline():
+    client = TestClient(build_app())
+    budget = client.get("/api/health/budget").json()["remaining"]
+    assert 1.5 < budget <= 2.0
+
+    shortened = client.get("/api/health/budget", headers={"X-Request-Timeout": "0.5"}).json()["remaining"]
+    assert 0 < shortened <= 0.5
+    # Clients can shorten the budget but not extend it
+    capped = client.get("/api/health/budget", headers={"X-Request-Timeout": "600"}).json()["remaining"]
+    assert capped <= 2.0
+
+def test_operation_past_the_deadline_returns_504():
+    response = TestClient(build_app()).get("/slow", headers={"X-Request-Timeout": "0.05"})
+    assert response.status_code == 504
+
+@pytest.mark.asyncio
+async def test_translation_fails_fast_when_upstream_outlives_deadline(translation_service):
+    translation_service.router.backends[0].latency = 1
+    with deadline_scope(0.05):
+        with pytest.raises(DeadlineExceededError):
+            await translation_service.translate("Save", "en", "tr")
+
+@pytest.mark.asyncio
+async def test_background_work_does_not_inherit_the_request_deadline():
+    seen = []
+
+    async def background():
+        seen.append(remaining())
+
+    with deadline_scope(0.01):
+        await tasks.wrap(background)()
+        await tasks.spawn(background())
+    assert seen == [None, None]
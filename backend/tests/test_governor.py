@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from app.core.deadline import deadline_scope
+from app.core.exceptions import DeadlineExceededError, UpstreamCapacityError
+from app.services.governor import LocalBuckets, RedisBuckets, TokenGovernor, estimate_prompt_tokens, estimate_text_tokens
+
+MESSAGES = [
+    {"role": "system", "content": "Translate short UI text from English to Turkish."},
+    {"role": "user", "content": "Translate the following text from en to tr:\n\nSave changes"},
+]
+
+def test_estimate_errs_slightly_high():
+    # cl100k_base: "Save changes" is 2 tokens, "Hello, world!" is 4
+    assert 2 <= estimate_text_tokens("Save changes") <= 4
+    assert 4 <= estimate_text_tokens("Hello, world!") <= 6
+    assert estimate_prompt_tokens(MESSAGES) > estimate_text_tokens(MESSAGES[1]["content"])
+
+@pytest.mark.asyncio
+async def test_reconcile_returns_unused_tokens():
+    buckets = LocalBuckets(rpm=100, tpm=1000)
+    governor = TokenGovernor(buckets)
+    reservation = await governor.acquire(MESSAGES, max_tokens=500)
+    reserved_level = buckets._levels[1]
+    await governor.reconcile(reservation, actual_tokens=40)
+    assert buckets._levels[1] == pytest.approx(reserved_level + reservation.estimated_tokens - 40, abs=1)
+    assert governor.stats.snapshot()["actual_tokens"] == 40
+
+@pytest.mark.asyncio
+async def test_requests_are_delayed_then_shed():
+    # 6000 RPM refills one request every 10 ms; TPM is not the constraint here
+    buckets = LocalBuckets(rpm=6000, tpm=10_000_000)
+    buckets._levels[0] = 1
+    governor = TokenGovernor(buckets, max_wait=0.05)
+
+    await governor.acquire(MESSAGES, max_tokens=10)
+    await governor.acquire(MESSAGES, max_tokens=10)
+    assert governor.stats.delayed == 1
+
+    buckets._levels[0] = -100
+    with pytest.raises(UpstreamCapacityError) as exc:
+        await governor.acquire(MESSAGES, max_tokens=10)
+    assert exc.value.status_code == 503
+    assert "Retry-After" in exc.value.headers
+    assert governor.stats.shed == 1
+
+@pytest.mark.asyncio
+async def test_store_errors_fail_open():
+    class BrokenBuckets:
+        capacity = (100, 1000)
+
+        async def take(self, requests, tokens):
+            raise ConnectionError("redis down")
+
+    governor = TokenGovernor(BrokenBuckets())
+    await governor.acquire(MESSAGES, max_tokens=10)
+    assert governor.stats.admitted == 1
+    assert governor.stats.store_errors == 1
+
+@pytest.mark.asyncio
+async def test_slow_store_is_bounded_by_the_request_deadline():
+    class SlowRedis:
+        async def eval(self, *args):
+            await asyncio.sleep(1)
+
+    async def redis():
+        return SlowRedis()
+
+    governor = TokenGovernor(RedisBuckets(redis, "test", 100, 1000))
+    with deadline_scope(0.05):
+        with pytest.raises(DeadlineExceededError):
+            await governor.acquire(MESSAGES, max_tokens=10)
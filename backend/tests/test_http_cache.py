@@ -0,0 +1,32 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.core.http_cache import PreparedResponse
+from app.api.v1.endpoints.compliance import router as compliance_router
+
+def test_preset_returns_etag_and_304_on_match():
+    app = FastAPI()
+    app.include_router(compliance_router, prefix="/compliance")
+    client = TestClient(app)
+
+    first = client.get("/compliance/presets/gdpr")
+    assert first.status_code == 200
+    assert first.json()["category"] == "GDPR"
+    etag = first.headers["etag"]
+
+    second = client.get("/compliance/presets/gdpr", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+def test_weak_and_listed_etags_match():
+    prepared = PreparedResponse({"a": 1})
+    app = FastAPI()
+
+    @app.get("/")
+    async def index(request: Request):
+        return prepared.respond(request)
+
+    client = TestClient(app)
+    etag = prepared.validators.etag
+    assert client.get("/", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get("/", headers={"If-None-Match": '"other"'}).status_code == 200
@@ -0,0 +1,75 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.core.lifecycle import TaskTracker, worker_state
+from app.main import app
+
+def test_readiness_reflects_worker_state():
+    client = TestClient(app)
+    worker_state.ready = False
+    assert client.get("/api/health/ready").status_code == 503
+    assert client.get("/api/health/live").status_code == 200
+
+    worker_state.ready = True
+    try:
+        assert client.get("/api/health/ready").status_code == 200
+        worker_state.draining = True
+        assert client.get("/api/health/ready").json() == {"status": "draining"}
+    finally:
+        worker_state.ready = False
+        worker_state.draining = False
+
+def test_drain_waits_for_tracked_work_and_cancels_stragglers():
+    async def scenario():
+        tracker = TaskTracker()
+        finished = []
+
+        async def work(delay):
+            await asyncio.sleep(delay)
+            finished.append(delay)
+
+        tracker.spawn(work(0.01))
+        straggler = tracker.spawn(work(10))
+        remaining = await tracker.drain(timeout=0.1)
+        await asyncio.sleep(0)
+        return finished, remaining, straggler
+
+    finished, remaining, straggler = asyncio.run(scenario())
+    assert finished == [0.01]
+    assert remaining == 1
+    assert straggler.cancelled()
+
+def test_warm_up_covers_configured_backends_and_cache_shards(monkeypatch):
+    from conftest import FakeRedis
+    from app.core import lifecycle
+    from app.core.redis_shards import ShardedRedis
+
+    warmed = []
+
+    class Client:
+        def __init__(self, name):
+            self.name = name
+            self.models = self
+
+        def with_options(self, **options):
+            return self
+
+        async def list(self):
+            warmed.append(self.name)
+
+    monkeypatch.setattr(lifecycle.settings, "TRANSLATION_BACKENDS", ["openai_compatible", "fake"])
+    monkeypatch.setattr(lifecycle.providers, "get", Client)
+    asyncio.run(lifecycle._warm_upstream(2))
+    assert warmed == ["openai_compatible", "openai_compatible"]
+
+    main, shard = FakeRedis(), FakeRedis()
+    pings = []
+    for name, client in (("main", main), ("shard", shard)):
+        monkeypatch.setattr(client, "ping", lambda name=name: asyncio.sleep(0, pings.append(name)))
+
+    async def get_redis_client():
+        return main
+
+    monkeypatch.setattr(lifecycle, "get_redis_client", get_redis_client)
+    monkeypatch.setattr(lifecycle, "get_sharded_cache", lambda: ShardedRedis({"a": shard}))
+    asyncio.run(lifecycle._warm_redis(2))
+    assert sorted(pings) == ["main", "main", "shard", "shard"]
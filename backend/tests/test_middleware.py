@@ -0,0 +1,42 @@
+import logging
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.middleware import RequestLoggingMiddleware, setup_middleware
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    setup_middleware(app)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(3):
+                yield b"chunk"
+        return StreamingResponse(chunks())
+
+    return app
+
+def test_streaming_response_passes_through_with_cors_headers():
+    client = TestClient(build_app())
+    response = client.get("/stream")
+    assert response.status_code == 200
+    assert response.text == "chunk" * 3
+    assert response.headers["access-control-allow-origin"] == settings.CORS_ORIGINS[0]
+    assert response.headers["access-control-allow-credentials"] == "true"
+
+@pytest.mark.parametrize("path,expected_records", [("/stream", 0), ("/missing", 1)])
+def test_successful_requests_are_sampled_errors_always_logged(caplog, path, expected_records):
+    app = FastAPI()
+
+    @app.get("/stream")
+    async def stream():
+        return {"ok": True}
+
+    app.add_middleware(RequestLoggingMiddleware, success_sample_rate=0.0)
+    with caplog.at_level(logging.INFO, logger="app.core.middleware"):
+        TestClient(app).get(path)
+    records = [r for r in caplog.records if r.getMessage() == "Request processed"]
+    assert len(records) == expected_records
@@ -0,0 +1,32 @@
+import pytest
+from app.services.profiles import build_messages, classify, get_profiles
+
+@pytest.mark.parametrize("text,context,expected", [
+    ("Save", None, "short"),
+    ("Your changes have been saved.", {"domain": "ecommerce"}, "short"),
+    ("Hello <b>{name}</b>", None, "standard"),
+    ("Accept terms", {"compliance_rules": {"category": "KVKK"}}, "standard"),
+    ("We use cookies to improve your experience on our website and analyse traffic.", None, "standard"),
+    ("x" * 5000, None, "long"),
+])
+def test_classify(text, context, expected):
+    assert classify(text, context) == expected
+
+def test_short_profile_uses_tight_budget_and_concise_prompt():
+    profiles = get_profiles()
+    short, standard = profiles["short"], profiles["standard"]
+    assert short.max_tokens < standard.max_tokens
+    short_prompt = build_messages(short, "Save", "en", "tr", None)[0]["content"]
+    full_prompt = build_messages(standard, "Save", "en", "tr", None)[0]["content"]
+    assert len(short_prompt) < len(full_prompt)
+
+@pytest.mark.asyncio
+async def test_translate_records_profile_and_latency(translation_service):
+    result = await translation_service.translate("Save", "en", "tr")
+    assert result["profile"] == "short"
+    assert result["latency_ms"] >= 0
+    assert translation_service.profile_stats.snapshot()["short"]["requests"] == 1
+
+    cached = await translation_service.translate("Save", "en", "tr")
+    assert cached["cached"] is True
+    assert translation_service.profile_stats.snapshot()["short"]["requests"] == 1
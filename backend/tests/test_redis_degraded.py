@@ -0,0 +1,60 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.core import redis as redis_module
+from app.core.redis import local_cache, redis_health
+from app.core.security import RateLimiter
+
+class DownRedis:
+    """A client whose every command fails as if the server were unreachable."""
+
+    def __getattr__(self, name):
+        async def fail(*args, **kwargs):
+            raise RedisConnectionError("Connection refused")
+        return fail
+
+@pytest.fixture(autouse=True)
+async def reset_redis_health():
+    yield
+    await redis_health.stop()
+    redis_health.mark_up()
+    local_cache._store.clear()
+
+@pytest.mark.asyncio
+async def test_translations_survive_a_redis_outage_using_the_local_cache(translation_service):
+    backend = translation_service.router.backends[0]
+    translation_service._redis = DownRedis()
+
+    first = await translation_service.translate("Save", "en", "tr")
+    assert first["translated_text"] == "[tr] Save"
+    assert redis_health.degraded
+
+    second = await translation_service.translate("Save", "en", "tr")
+    assert second["cached"] is True
+    assert backend.calls == 1
+
+@pytest.mark.asyncio
+async def test_rate_limiter_falls_back_to_a_per_worker_share(monkeypatch):
+    monkeypatch.setattr(redis_module.settings, "RATE_LIMIT_DEGRADED_DIVISOR", 4)
+    limiter = RateLimiter()
+    limiter._redis = DownRedis()
+    results = [await limiter.check_rate_limit(user_id=7, limit=8) for _ in range(3)]
+    assert results == [True, True, False]
+
+@pytest.mark.asyncio
+async def test_reconnect_loop_leaves_degraded_mode(monkeypatch, fake_redis):
+    async def reachable():
+        return fake_redis
+
+    monkeypatch.setattr(redis_module, "get_redis_client", reachable)
+    monkeypatch.setattr(redis_health, "base_delay", 0.001)
+    recovered = []
+
+    async def on_recover(client):
+        recovered.append(client)
+
+    monkeypatch.setattr(redis_health, "_recover_callbacks", [on_recover])
+    redis_health.mark_down(RedisConnectionError("Connection refused"))
+    assert redis_health.snapshot()["status"] == "degraded"
+    await redis_health._task
+    assert not redis_health.degraded
+    assert recovered == [fake_redis]
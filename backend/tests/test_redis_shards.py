@@ -0,0 +1,88 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.core.redis import get_bytes, redis_health, with_fallback
+from app.core.redis_shards import HashRing, ShardedRedis, hash_slot_key
+from conftest import FakeRedis
+
+KEYS = [f"translation:{i}" for i in range(20000)]
+
+class DownRedis(FakeRedis):
+    async def _fail(self, *args, **kwargs):
+        raise RedisConnectionError("node down")
+
+    get = set = execute_command = zadd = ping = _fail
+
+    def pipeline(self, transaction: bool = True):
+        pipe = super().pipeline(transaction)
+        pipe.execute = self._fail
+        return pipe
+
+def test_keys_spread_evenly_over_nodes():
+    ring = HashRing(["a", "b", "c"])
+    counts = {node: 0 for node in ring.nodes}
+    for key in KEYS:
+        counts[ring.node_for(key)] += 1
+    for count in counts.values():
+        assert abs(count / len(KEYS) - 1 / 3) < 0.05
+
+def test_adding_a_node_moves_only_its_share():
+    before, after = HashRing(["a", "b", "c"]), HashRing(["a", "b", "c", "d"])
+    moved = [key for key in KEYS if before.node_for(key) != after.node_for(key)]
+    assert all(after.node_for(key) == "d" for key in moved)
+    assert abs(len(moved) / len(KEYS) - 1 / 4) < 0.05
+
+def test_hash_tags_keep_related_keys_together():
+    ring = HashRing(["a", "b", "c"])
+    assert hash_slot_key("tm:{acme}:lru") == "acme"
+    assert hash_slot_key("plain{}key") == "plain{}key"
+    assert len({ring.node_for(f"tm:{{acme}}:{i}") for i in range(100)}) == 1
+
+@pytest.mark.asyncio
+async def test_commands_and_pipelines_go_to_the_owning_node():
+    nodes = {name: FakeRedis() for name in ("a", "b", "c")}
+    cache = ShardedRedis(nodes)
+    pipe = cache.pipeline()
+    for key in KEYS[:300]:
+        pipe.set(key, key.encode(), ex=60)
+    assert await pipe.execute() == [True] * 300
+
+    for key in KEYS[:300]:
+        owner = cache.ring.node_for(key)
+        assert key in nodes[owner].store
+        assert await get_bytes(cache, key) == key.encode()
+    assert all(nodes[name].store for name in nodes)
+    assert await cache.delete(*KEYS[:300]) == 300
+    assert not any(node.store for node in nodes.values())
+
+@pytest.mark.asyncio
+async def test_unreachable_node_fails_over_to_the_next_node():
+    nodes = {"a": FakeRedis(), "b": FakeRedis(), "c": DownRedis()}
+    cache = ShardedRedis(nodes)
+    key = next(key for key in KEYS if cache.ring.node_for(key) == "c")
+
+    assert await cache.set(key, b"value") is True
+    assert await get_bytes(cache, key) == b"value"
+    pipe = cache.pipeline()
+    pipe.set(key, b"again")
+    assert await pipe.execute() == [True]
+    snapshot = cache.snapshot()
+    assert snapshot["nodes"]["c"]["up"] is False
+    assert snapshot["failovers"] == 1
+
+@pytest.mark.asyncio
+async def test_no_reachable_node_is_an_outage_of_the_shards_only():
+    cache = ShardedRedis({"a": DownRedis(), "b": DownRedis()})
+    with pytest.raises(RedisConnectionError):
+        await cache.get("translation:1")
+
+    outages = redis_health.outages
+    assert await with_fallback(cache, lambda shards: shards.get("translation:1")) is None
+    assert cache.health.degraded
+    assert redis_health.outages == outages
+    await cache.health.stop()
+
+    # Recovery is checked against the nodes, not the main Redis
+    with pytest.raises(RedisConnectionError):
+        await cache._reachable()
+    cache.clients["b"] = FakeRedis()
+    assert await cache._reachable() is cache
@@ -0,0 +1,90 @@
+import random
+import time
+import httpx
+import pytest
+from app.services.backends import BackendRouter, CompletionRequest, CompletionResult, TranslationBackend
+from app.services.retry import RetryBudget, RetryPolicy, is_retryable, never_sent, retry_after
+
+class UpstreamError(Exception):
+    def __init__(self, status_code: int, headers=None):
+        super().__init__(f"upstream returned {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+class FlakyBackend(TranslationBackend):
+    def __init__(self, errors):
+        self.name = "flaky"
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def complete(self, request: CompletionRequest) -> CompletionResult:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return CompletionResult(content="ok", model=request.model, backend=self.name, latency_ms=1.0)
+
+def make_policy(**kwargs) -> RetryPolicy:
+    options = {"base_delay": 0.001, "max_delay": 0.002, "rng": random.Random(0)}
+    options.update(kwargs)
+    return RetryPolicy(**options)
+
+def make_request(deadline=None) -> CompletionRequest:
+    return CompletionRequest(model="test-model", messages=[{"role": "user", "content": "hi"}], deadline=deadline)
+
+def test_classification_and_retry_after():
+    assert is_retryable(UpstreamError(429))
+    assert is_retryable(UpstreamError(503))
+    assert not is_retryable(UpstreamError(400))
+    assert not is_retryable(ValueError("bad prompt"))
+    assert retry_after(UpstreamError(429, {"retry-after": "2"})) == 2.0
+    assert retry_after(UpstreamError(429, {"retry-after-ms": "150"})) == 0.15
+    assert retry_after(UpstreamError(503)) is None
+
+def test_only_connect_failures_count_as_never_sent():
+    wrapped = RuntimeError("connection error")
+    wrapped.__cause__ = httpx.ConnectError("refused")
+    assert never_sent(wrapped)
+    assert never_sent(ConnectionRefusedError())
+    assert not never_sent(UpstreamError(429))
+    assert not never_sent(httpx.ReadTimeout("no answer"))
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_on_the_same_backend():
+    backend = FlakyBackend([UpstreamError(429, {"retry-after-ms": "1"}), UpstreamError(503)])
+    router = BackendRouter([backend], retry=make_policy())
+    result = await router.complete(make_request())
+    assert result.content == "ok"
+    assert backend.calls == 3
+    assert router.retry.snapshot()["recovered"] == 1
+    assert router.snapshot()["flaky"]["failures"] == 2
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    backend = FlakyBackend([UpstreamError(400)])
+    router = BackendRouter([backend], retry=make_policy())
+    with pytest.raises(UpstreamError):
+        await router.complete(make_request())
+    assert backend.calls == 1
+
+@pytest.mark.asyncio
+async def test_retry_after_past_the_deadline_is_not_attempted():
+    backend = FlakyBackend([UpstreamError(429, {"retry-after": "30"})])
+    router = BackendRouter([backend], retry=make_policy())
+    with pytest.raises(UpstreamError):
+        await router.complete(make_request(deadline=time.monotonic() + 1))
+    assert backend.calls == 1
+    assert router.retry.snapshot()["skipped"]["deadline"] == 1
+
+@pytest.mark.asyncio
+async def test_budget_limits_retries():
+    budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=1.0)
+    policy = make_policy(budget=budget)
+    backend = FlakyBackend([UpstreamError(503)] * 4)
+    router = BackendRouter([backend], retry=policy)
+    with pytest.raises(UpstreamError):
+        await router.complete(make_request())
+    with pytest.raises(UpstreamError):
+        await router.complete(make_request())
+    # One token: the first call retries once, the second not at all
+    assert backend.calls == 3
+    assert policy.snapshot()["skipped"]["budget"] == 2
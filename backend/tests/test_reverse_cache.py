@@ -0,0 +1,37 @@
+import pytest
+from app.services import translation as translation_module
+
+@pytest.fixture
+def service(translation_service, monkeypatch):
+    monkeypatch.setattr(translation_module.settings, "REVERSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(translation_module.settings, "REVERSE_CACHE_TENANTS", ["Acme"])
+    return translation_service
+
+@pytest.mark.asyncio
+async def test_completed_translation_seeds_the_reverse_pair(service):
+    forward = await service.translate("Save changes", "en", "tr", tenant="Acme")
+    backward = await service.translate(forward["translated_text"], "tr", "en", tenant="Acme")
+
+    assert backward["translated_text"] == "Save changes"
+    assert backward["derived"] is True
+    assert service.router.backends[0].calls == 1
+    snapshot = service.cache_policy.snapshot()
+    assert snapshot["derived_hits"] == 1
+    assert snapshot["derived_written"] == 1
+    assert snapshot["fresh_hits"] == 0
+
+@pytest.mark.asyncio
+async def test_derived_entries_are_not_served_to_other_tenants(service):
+    forward = await service.translate("Save changes", "en", "tr", tenant="Acme")
+    backward = await service.translate(forward["translated_text"], "tr", "en", tenant="Globex")
+
+    assert "derived" not in backward
+    assert service.router.backends[0].calls == 2
+    assert service.cache_policy.derived_ignored == 1
+
+@pytest.mark.asyncio
+async def test_tenants_without_the_setting_do_not_seed(service):
+    forward = await service.translate("Save changes", "en", "tr", tenant="Globex")
+    assert service.cache_policy.derived_written == 0
+    await service.translate(forward["translated_text"], "tr", "en", tenant="Acme")
+    assert service.router.backends[0].calls == 2
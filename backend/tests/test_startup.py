@@ -0,0 +1,31 @@
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def test_importing_app_does_not_load_provider_sdks():
+    script = (
+        "import json, sys\n"
+        "import app.main\n"
+        "print(json.dumps([m for m in ('openai', 'stripe', 'boto3') if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+def test_provider_registry_builds_once_and_closes():
+    from app.core.providers import ProviderRegistry
+
+    closed = []
+    registry = ProviderRegistry()
+    registry.register("fake", lambda: object(), closer=closed.append)
+    first = registry.get("fake")
+    assert registry.get("fake") is first
+
+    asyncio.run(registry.aclose())
+    assert closed == [first]
+    assert not registry.is_initialized("fake")
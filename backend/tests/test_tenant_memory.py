@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from app.core.lifecycle import tasks
+from app.schemas.schemas import UserCreate, UserResponse, UserUpdate
+from app.services.cache_namespace import CacheNamespaces
+from app.services.tenant_memory import TenantMemory
+
+CONTEXT_KEYS = ("domain", "tone")
+
+@pytest.fixture
+def service(translation_service):
+    service = translation_service
+    service.tenant_memory = TenantMemory(service._get_redis, max_entries=100, context_keys=CONTEXT_KEYS)
+    return service
+
+@pytest.mark.asyncio
+async def test_colleagues_share_translations_across_request_context(service):
+    await service.translate("Save changes", "en", "tr", {"screen": "settings"}, tenant="Acme")
+    shared = await service.translate("Save changes", "en", "tr", {"screen": "editor"}, tenant="Acme")
+
+    assert shared["tenant_memory"] is True
+    assert service.router.backends[0].calls == 1
+    assert service.tenant_memory.snapshot()["tenants"]["Acme"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+@pytest.mark.asyncio
+async def test_entries_from_an_earlier_model_are_served_stale(service):
+    await service.translate("Save changes", "en", "tr", {"screen": "settings"}, tenant="Acme")
+    # A new model or prompt version starts a new namespace
+    service.namespaces = CacheNamespaces(service._get_redis, salt="v2")
+    before = set(tasks._tasks)
+
+    shared = await service.translate("Save changes", "en", "tr", {"screen": "editor"}, tenant="Acme")
+    assert shared["tenant_memory"] is True
+    assert shared["stale"] is True
+    await asyncio.gather(*(tasks._tasks - before))
+    assert service.namespaces.revalidations == 1
+    assert service.router.backends[0].calls == 2
+
+@pytest.mark.asyncio
+async def test_translation_relevant_context_still_separates_entries(service):
+    await service.translate("Save changes", "en", "tr", {"tone": "formal"}, tenant="Acme")
+    await service.translate("Save changes", "en", "tr", {"tone": "casual"}, tenant="Acme")
+    assert service.router.backends[0].calls == 2
+
+@pytest.mark.asyncio
+async def test_tenants_are_isolated(service):
+    await service.translate("Save changes", "en", "tr", {"screen": "settings"}, tenant="Acme")
+    other = await service.translate("Save changes", "en", "tr", {"screen": "editor"}, tenant="Globex")
+
+    assert "tenant_memory" not in other
+    assert service.router.backends[0].calls == 2
+
+@pytest.mark.asyncio
+async def test_quota_evicts_least_recently_used(fake_redis):
+    memory = TenantMemory(lambda: _client(fake_redis), max_entries=5, quotas={"Small": 2})
+    for text in ("one", "two"):
+        await memory.store("Small", text, "en", "tr", None, {"translated_text": text.upper()})
+    assert await memory.lookup("Small", "one", "en", "tr", None)  # "two" is now least recent
+    await memory.store("Small", "three", "en", "tr", None, {"translated_text": "THREE"})
+
+    assert await memory.lookup("Small", "two", "en", "tr", None) is None
+    assert await memory.lookup("Small", "one", "en", "tr", None)
+    stats = await memory.tenant_stats("Small")
+    assert stats["entries"] == 2
+    assert stats["quota"] == 2
+    assert stats["evicted"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_zero_quota_disables_the_tenant(fake_redis):
+    memory = TenantMemory(lambda: _client(fake_redis), quotas={"Opted out": 0})
+    await memory.store("Opted out", "one", "en", "tr", None, {"translated_text": "ONE"})
+    assert await memory.lookup("Opted out", "one", "en", "tr", None) is None
+    assert fake_redis.store == {}
+
+async def _client(fake_redis):
+    return fake_redis
+
+def test_users_cannot_choose_their_tenant():
+    # Only admins assign it (PUT /admin/users/{id}/tenant); registration and profile updates ignore it
+    assert "tenant" not in UserCreate.model_fields
+    assert "tenant" not in UserUpdate.model_fields
+    assert "tenant" in UserResponse.model_fields
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.lifecycle import tasks
+from app.models.base import Base
+from app.models.models import Translation, User
+from app.services.profiles import select_profile
+from app.services.translation_memory import TranslationMemory
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+def add_history(session_factory, service, text, translated, namespace=None):
+    db = session_factory()
+    user = User(email="memory@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    meta_data = {"gpt_model": "gpt-3.5-turbo"}
+    if namespace:
+        meta_data["cache_namespace"] = namespace
+    db.add(Translation(
+        user_id=user.id, source_text=text, translated_text=translated, source_lang="en", target_lang="tr",
+        content_hash=service.content_hash(text, "en", "tr"), meta_data=meta_data
+    ))
+    db.commit()
+    db.close()
+
+def with_memory(service, memory):
+    service.memory = memory
+    return service, service.router.backends[0]
+
+@pytest.mark.asyncio
+async def test_history_answers_and_is_promoted_to_redis(session_factory, translation_service, fake_redis):
+    service, backend = with_memory(translation_service, TranslationMemory(session_factory))
+    current = service.namespaces.current(select_profile("Save", None))
+    add_history(session_factory, service, "Save ", "Kaydet ", namespace=current)
+
+    first = await service.translate("Save", "en", "tr")
+    assert first["translated_text"] == "Kaydet"
+    assert first["cached"] is True
+    assert service._current_key("Save", "en", "tr", {}) in fake_redis.store
+
+    await service.translate("Save", "en", "tr")
+    assert service.memory.hits == 1
+    assert service.memory.promoted == 1
+    assert backend.calls == 0
+
+@pytest.mark.asyncio
+async def test_history_from_an_earlier_model_is_served_stale_and_not_promoted(session_factory, translation_service, fake_redis):
+    service, backend = with_memory(translation_service, TranslationMemory(session_factory))
+    # Rows without a recorded namespace predate versioned keys
+    add_history(session_factory, service, "Save", "Kaydet (old)")
+    before = set(tasks._tasks)
+
+    served = await service.translate("Save", "en", "tr")
+    assert served["translated_text"] == "Kaydet (old)"
+    assert served["stale"] is True
+    assert service.memory.promoted == 0
+    # Unversioned keys stay JSON for workers that predate the binary format
+    legacy_value = fake_redis.store[service._generate_cache_key("Save", "en", "tr", {})][0]
+    assert json.loads(legacy_value)["translated_text"] == "Kaydet (old)"
+
+    await asyncio.gather(*(tasks._tasks - before))
+    assert backend.calls == 1
+    assert (await service.translate("Save", "en", "tr"))["translated_text"] == "[tr] Save"
+
+@pytest.mark.asyncio
+async def test_database_errors_fall_through_to_upstream_and_back_off(translation_service):
+    def broken():
+        raise RuntimeError("database is down")
+    service, backend = with_memory(translation_service, TranslationMemory(broken, error_backoff=60))
+
+    await service.translate("Save", "en", "tr")
+    await service.translate("Cancel", "en", "tr")
+    assert backend.calls == 2
+    assert service.memory.errors == 1
+    assert service.memory.skipped == 1
@@ -0,0 +1,68 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api import deps
+from app.api.v1.endpoints import translations
+from app.models.base import Base
+from app.models.models import Subscription, Translation, User
+from app.services.translation_memory import TranslationMemory
+
+class Unlimited:
+    async def check_rate_limit(self, user_id: int, limit: int) -> bool:
+        return True
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+@pytest.fixture
+def app(db, session_factory, translation_service, monkeypatch):
+    translation_service.memory = TranslationMemory(session_factory)
+    monkeypatch.setattr(translations, "translation_service", translation_service)
+    app = FastAPI()
+    app.include_router(translations.router, prefix="/translations")
+    app.dependency_overrides[deps.get_db] = lambda: db
+    app.dependency_overrides[deps.get_rate_limiter] = Unlimited
+    return app
+
+def add_user(db, email, tenant):
+    user = User(email=email, hashed_password="x", tenant=tenant)
+    user.subscription = Subscription(is_active=True, monthly_requests_limit=100)
+    db.add(user)
+    db.commit()
+    return user
+
+def translate(app, user, context):
+    app.dependency_overrides[deps.get_current_user] = lambda: user
+    response = TestClient(app).post("/translations/", json={
+        "source_text": "Save changes", "source_lang": "en", "target_lang": "tr", "context": context
+    })
+    assert response.status_code == 200
+    return response.json()["translation"]
+
+def test_tenant_memory_answers_stay_out_of_the_translation_memory(app, db, translation_service):
+    alice = add_user(db, "alice@acme.example", "Acme")
+    bob = add_user(db, "bob@acme.example", "Acme")
+    eve = add_user(db, "eve@globex.example", "Globex")
+
+    translate(app, alice, {"screen": "settings"})
+    shared = translate(app, bob, {"screen": "editor"})
+    assert shared["metadata"]["tenant_memory"] is True
+    assert db.get(Translation, shared["id"]).content_hash is None
+
+    other = translate(app, eve, {"screen": "editor"})
+    assert other["metadata"]["tenant_memory"] is False
+    assert other["metadata"]["cached"] is False
+    assert translation_service.memory.hits == 0
+    assert translation_service.router.backends[0].calls == 2
@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+import json
+from app.core.redis import close_redis_client
+from app.core.redis_shards import close_sharded_cache
+from app.db.session import SessionLocal
+from app.services.cache_warmup import CacheWarmer
+from app.services.translation import TranslationService
+
+async def warm(limit: int, days: int, max_per_second: float) -> dict:
+    warmer = CacheWarmer.from_settings(TranslationService())
+    if max_per_second:
+        warmer.max_per_second = max_per_second
+    db = SessionLocal()
+    try:
+        return await warmer.run(db, limit=limit, days=days)
+    finally:
+        db.close()
+        await close_redis_client()
+        await close_sharded_cache()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild translation cache entries from translation history.")
+    parser.add_argument("--limit", type=int, default=10000, help="Most requested translations to load")
+    parser.add_argument("--days", type=int, default=None, help="Only count requests from the last N days")
+    parser.add_argument("--max-per-second", type=float, default=None, help="Write rate cap (entries/second)")
+    args = parser.parse_args()
+    stats = asyncio.run(warm(args.limit, args.days, args.max_per_second))
+    print(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    main()